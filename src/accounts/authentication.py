@@ -0,0 +1,47 @@
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from accounts.services.user_cache import (
+    USER_CACHE_FIELDS,
+    cache_user_fields,
+    get_cached_user_fields,
+    get_user_auth_version,
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that keeps fields of authenticated users in a short-lived cache of the process.
+
+    Entries are keyed by the user ID and the auth version of the user, that is bumped on every change of the cached
+    fields, so no process uses fields of a changed user. Users are built from the cached fields without a query, and
+    only `USER_CACHE_FIELDS` are loaded, other fields are loaded on access.
+    """
+
+    def get_user(self, validated_token: Token):
+        if (user_id := validated_token.get(api_settings.USER_ID_CLAIM)) is None:
+            return super().get_user(validated_token)
+
+        version = get_user_auth_version(user_id)
+        if (fields := get_cached_user_fields(user_id, version)) is None:
+            # Inactive and missing users are not cached, the lookup raises for them.
+            user = super().get_user(validated_token)
+            cache_user_fields(user_id, version, {field: getattr(user, field) for field in USER_CACHE_FIELDS})
+            return user
+
+        user = self.build_user(fields)
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+    def build_user(self, fields: dict):
+        # `from_db()` expects the values in the order of the model fields.
+        names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in fields]
+        return self.user_model.from_db(router.db_for_read(self.user_model), names, [fields[name] for name in names])
@@ -0,0 +1,11 @@
+from django.contrib.contenttypes.models import ContentType
+
+from accounts.models import User
+from utils.models import Address
+from utils.services.jobs import job
+
+
+@job('accounts.scrub_user_address')
+def scrub_user_address(user_id: int):
+    content_type = ContentType.objects.get_for_model(User)
+    Address.objects.filter(content_type=content_type, object_id=user_id).update(number='-')
@@ -0,0 +1,86 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.services.tokens import blacklist_user_tokens
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks blacklisting all refresh tokens of a user token by token and by a single set-based query. '
+        'Seeded rows are created in a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=10_000, help='Number of outstanding tokens of the user.')
+        parser.add_argument('--batch-size', type=int, default=1_000, help='Number of tokens inserted per query.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed_tokens(options['tokens'], options['batch_size'])
+            timings = dict(
+                per_token=self.run(self.blacklist_per_token, user.pk),
+                set_based=self.run(blacklist_user_tokens, user.pk),
+            )
+            transaction.set_rollback(True)
+
+        for name, (count, duration) in timings.items():
+            self.stdout.write(f'{connection.vendor}: {name}, blacklisted {count} tokens in {duration:.1f} ms')
+        speedup = timings['per_token'][1] / timings['set_based'][1]
+        self.stdout.write(self.style.SUCCESS(f'set_based is {speedup:.1f}x faster than per_token.'))
+
+    def seed_tokens(self, count: int, batch_size: int) -> User:
+        user = User.objects.create_user(f'bench.{time.time_ns()}@bench.com', 'bench-password')
+        now = timezone.now()
+
+        started = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            tokens = []
+            for _ in range(min(batch_size, count - offset)):
+                # Tokens are signed without `for_user()`, that inserts an outstanding token per call.
+                token = RefreshToken()
+                token['user_id'] = user.pk
+                tokens.append(
+                    OutstandingToken(
+                        user=user,
+                        jti=token['jti'],
+                        token=str(token),
+                        created_at=now,
+                        expires_at=now + timedelta(days=1),
+                    )
+                )
+            OutstandingToken.objects.bulk_create(tokens)
+        self.stdout.write(f'Seeded {count} tokens in {time.perf_counter() - started:.1f} s.')
+        return user
+
+    @staticmethod
+    def blacklist_per_token(user_id: int) -> int:
+        """Blacklists tokens of the user like before, by decoding and blacklisting every token by its own queries."""
+        count = 0
+        for token in OutstandingToken.objects.filter(user_id=user_id):
+            try:
+                RefreshToken(token.token).blacklist()
+                count += 1
+            except TokenError:
+                pass
+        return count
+
+    def run(self, blacklist, user_id: int) -> tuple[int, float]:
+        # Both ways blacklist the same tokens, so the blacklisted rows are rolled back after every run.
+        with transaction.atomic():
+            started = time.perf_counter()
+            count = blacklist(user_id)
+            duration = (time.perf_counter() - started) * 1000
+            if BlacklistedToken.objects.filter(token__user_id=user_id).count() != count:
+                self.stderr.write(f'{blacklist.__name__} returned a wrong number of blacklisted tokens.')
+            transaction.set_rollback(True)
+        return count, duration
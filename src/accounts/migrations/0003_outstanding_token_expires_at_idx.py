@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# The table belongs to `rest_framework_simplejwt.token_blacklist`, so the index is created by SQL. The blacklist check
+# is served by the unique indexes of `jti` and of the blacklisted token, `prune_tokens` needs the expiration index.
+POSTGRESQL_FORWARD = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS outstanding_token_expires_at_idx '
+    'ON token_blacklist_outstandingtoken (expires_at, id)',
+)
+POSTGRESQL_BACKWARD = ('DROP INDEX CONCURRENTLY IF EXISTS outstanding_token_expires_at_idx',)
+SQLITE_FORWARD = (
+    'CREATE INDEX IF NOT EXISTS outstanding_token_expires_at_idx ON token_blacklist_outstandingtoken (expires_at, id)',
+)
+SQLITE_BACKWARD = ('DROP INDEX IF EXISTS outstanding_token_expires_at_idx',)
+
+
+def run_vendor_sql(postgresql_sql, sqlite_sql):
+    def run(apps, schema_editor):
+        match schema_editor.connection.vendor:
+            case 'postgresql':
+                statements = postgresql_sql
+            case 'sqlite':
+                statements = sqlite_sql
+            case _:
+                statements = ()
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run in a transaction, they do not lock the table against writes of logins.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0002_customerproxy_staffproxy'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql(POSTGRESQL_FORWARD, SQLITE_FORWARD),
+            run_vendor_sql(POSTGRESQL_BACKWARD, SQLITE_BACKWARD),
+        ),
+    ]
@@ -6,6 +6,7 @@ from django.utils.translation import gettext as _
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models.managers import UserManager
+from accounts.services.tokens import TokenPair
 
 from django.contrib.contenttypes.fields import GenericRelation
 
@@ -76,10 +77,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return str(self.email)
 
-    @property
-    def refresh_token(self):
-        return RefreshToken.for_user(self)
+    def issue_token_pair(self) -> TokenPair:
+        """
+        Issues a refresh token and the access token derived from it.
 
-    @property
-    def access_token(self):
-        return RefreshToken.for_user(self).access_token  # type: ignore
+        Every call stores a new outstanding token, so callers issue a pair once and keep it.
+        """
+        refresh = RefreshToken.for_user(self)
+        return TokenPair(refresh=refresh, access=refresh.access_token)
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models.models import User
+from accounts.models.proxy import CustomerProxy, StaffProxy
+from accounts.services.user_cache import USER_CACHE_FIELDS, bump_user_auth_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=StaffProxy)
+@receiver(post_save, sender=CustomerProxy)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=StaffProxy)
+@receiver(post_delete, sender=CustomerProxy)
+def bump_auth_version_on_change(sender, instance, update_fields=None, **kwargs):
+    # Saves of other fields, like `last_login` on every login, keep the cached fields valid.
+    if update_fields is None or not update_fields.isdisjoint(USER_CACHE_FIELDS):
+        bump_user_auth_version(instance.pk)
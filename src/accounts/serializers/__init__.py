@@ -4,6 +4,8 @@ from .serializers import (
     UserDisableSerializer,
     UserSetPasswordSerializer,
     UserRetrieveSerializer,
+    UserRetrieveValuesSerializer,
+    UserTokenObtainPairSerializer,
 )
 
 __all__ = [
@@ -12,4 +14,6 @@ __all__ = [
     'UserDisableSerializer',
     'UserSetPasswordSerializer',
     'UserRetrieveSerializer',
+    'UserRetrieveValuesSerializer',
+    'UserTokenObtainPairSerializer',
 ]
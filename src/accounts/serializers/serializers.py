@@ -2,13 +2,14 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from accounts.serializers import mixins
-from utils.serializers import AddressFieldSerializer
+from accounts.services.last_login import last_login_recorder
+from accounts.services.tokens import blacklist_user_tokens
+from utils.serializers import AddressFieldSerializer, Column, ValuesSerializer, address_column
 from utils.serializers.mixins import AddressCreateUpdateMixin
+from utils.services.jobs import enqueue
 
 User = get_user_model()
 
@@ -69,6 +70,16 @@ class UserRetrieveSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class UserRetrieveValuesSerializer(ValuesSerializer):
+    serializer_class = UserRetrieveSerializer
+    columns = dict(
+        email=Column('email'),
+        full_name=Column('full_name'),
+        phone=Column('phone'),
+        address=address_column(),
+    )
+
+
 class UserUpdateSerializer(mixins.PhoneNumberValidationMixin, AddressCreateUpdateMixin, serializers.ModelSerializer):
     """Serializer to update user data."""
 
@@ -84,8 +95,6 @@ class UserUpdateSerializer(mixins.PhoneNumberValidationMixin, AddressCreateUpdat
 class UserDisableSerializer(serializers.ModelSerializer):
     """Serializer to disable user and replace his real data to fake data."""
 
-    token_class = RefreshToken
-
     class Meta:
         model = User
         fields = ('password',)
@@ -118,14 +127,17 @@ class UserDisableSerializer(serializers.ModelSerializer):
         self.instance.save()
 
     def replace_user_address_data_to_fake_data(self):
-        if (address := self.instance.address.first()) is not None:
-            address.number = '-'
-            address.save()
+        enqueue('accounts.scrub_user_address', user_id=self.instance.pk)
 
     def blacklist_tokens(self):
-        tokens = OutstandingToken.objects.filter(user=self.instance)
-        for token in tokens:
-            try:
-                self.token_class(token.token).blacklist()
-            except TokenError:
-                pass
+        # Refreshing a token does not check that its user is active, so tokens are blacklisted before the response.
+        blacklist_user_tokens(self.instance.pk)
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Serializer to log user in, that records the login time to be written in bulk with other logins."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        last_login_recorder.record(self.user)
+        return data
@@ -0,0 +1,99 @@
+import atexit
+import logging
+import time
+from datetime import datetime
+from threading import Lock, Timer
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Case, DateTimeField, F, Q, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def truncate_login_time(value: datetime) -> datetime:
+    """Rounds the login time down to `LAST_LOGIN_PRECISION` seconds."""
+    precision = settings.LAST_LOGIN_PRECISION
+    return datetime.fromtimestamp(value.timestamp() // precision * precision, tz=value.tzinfo)
+
+
+def update_last_logins(logins: dict[int, datetime]) -> int:
+    """Updates `last_login` of the users by a single `UPDATE ... CASE` that never moves it back in time."""
+    if not logins:
+        return 0
+    whens = [
+        When(Q(pk=pk) & (Q(last_login__isnull=True) | Q(last_login__lt=login)), then=Value(login))
+        for pk, login in logins.items()
+    ]
+    last_login = Case(*whens, default=F('last_login'), output_field=DateTimeField())
+    return get_user_model().objects.filter(pk__in=logins).update(last_login=last_login)
+
+
+class LastLoginRecorder:
+    """
+    Buffer of login times of a process that are written to users in bulk.
+
+    The buffer is flushed when it holds `LAST_LOGIN_FLUSH_SIZE` users, and a timer flushes it
+    `LAST_LOGIN_FLUSH_INTERVAL` seconds after the first buffered login, so `last_login` in the database lags behind by
+    that time at most. Login times are truncated to `LAST_LOGIN_PRECISION`, so repeated logins of a user within that
+    time write nothing.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, datetime] = {}
+        self._lock = Lock()
+        self._timer: Timer | None = None
+        self._first_recorded_at = 0.0
+
+    def record(self, user) -> None:
+        login = truncate_login_time(timezone.now())
+        if user.last_login is not None and user.last_login >= login:
+            return
+        user.last_login = login
+
+        with self._lock:
+            if not self._pending:
+                self._first_recorded_at = time.monotonic()
+            self._pending[user.pk] = max(login, self._pending.get(user.pk, login))
+            flush = (
+                len(self._pending) >= settings.LAST_LOGIN_FLUSH_SIZE
+                or time.monotonic() - self._first_recorded_at >= settings.LAST_LOGIN_FLUSH_INTERVAL
+            )
+            if not flush and self._timer is None:
+                self._timer = Timer(settings.LAST_LOGIN_FLUSH_INTERVAL, self.flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush:
+            self.flush()
+
+    def take_pending(self) -> dict[int, datetime]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return pending
+
+    def flush(self) -> int:
+        """Writes the buffered login times and returns the number of updated users."""
+        return update_last_logins(self.take_pending())
+
+    def flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Failed to flush last login times.')
+        finally:
+            # The timer thread opens its own connections, they are not closed by the request cycle.
+            connections.close_all()
+
+    def clear(self) -> None:
+        """Discards the buffered login times."""
+        self.take_pending()
+
+
+last_login_recorder = LastLoginRecorder()
+atexit.register(last_login_recorder.flush_in_background)
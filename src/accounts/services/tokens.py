@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+from django.db import connections, router
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    refresh: RefreshToken
+    access: AccessToken
+
+
+def blacklist_user_tokens(user_id: int) -> int:
+    """
+    Blacklists all outstanding refresh tokens of the user that are not expired or blacklisted yet.
+
+    Tokens are blacklisted by a single `INSERT ... SELECT` without decoding them, and rows inserted by concurrent calls
+    are skipped by the unique token of blacklisted tokens. Returns the number of blacklisted tokens.
+    """
+    connection = connections[router.db_for_write(BlacklistedToken)]
+    quote = connection.ops.quote_name
+    outstanding, blacklisted = OutstandingToken._meta, BlacklistedToken._meta
+
+    outstanding_table, blacklisted_table = quote(outstanding.db_table), quote(blacklisted.db_table)
+    outstanding_id = f'{outstanding_table}.{quote(outstanding.pk.column)}'
+    user_id_column = quote(outstanding.get_field('user').column)
+    expires_at_column = quote(outstanding.get_field('expires_at').column)
+    token_id_column = quote(blacklisted.get_field('token').column)
+    blacklisted_at_column = quote(blacklisted.get_field('blacklisted_at').column)
+
+    sql = (
+        f'INSERT INTO {blacklisted_table} ({token_id_column}, {blacklisted_at_column}) '
+        f'SELECT {outstanding_id}, %s FROM {outstanding_table} '
+        f'WHERE {user_id_column} = %s AND {expires_at_column} > %s '
+        f'AND NOT EXISTS (SELECT 1 FROM {blacklisted_table} WHERE {token_id_column} = {outstanding_id}) '
+        f'ON CONFLICT DO NOTHING'
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [now, user_id, now])
+        return cursor.rowcount
@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from typing import Any
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Fields of users loaded by the authentication, other fields are deferred and loaded on access.
+USER_CACHE_FIELDS = ('id', 'email', 'password', 'is_active', 'is_staff', 'is_superuser')
+# Seconds a process keeps the fields of an authenticated user and the number of users it keeps.
+USER_CACHE_TIMEOUT = 30
+USER_CACHE_SIZE = 1024
+# Seconds the shared cache keeps the auth version of a user, a new version is made when it expires.
+USER_AUTH_VERSION_TIMEOUT = 24 * 60 * 60
+
+
+class LocalUserCache:
+    """Thread-safe least recently used cache of a process with entries that expire after the timeout."""
+
+    def __init__(self, size: int, timeout: float):
+        self.size = size
+        self.timeout = timeout
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_user_cache = LocalUserCache(USER_CACHE_SIZE, USER_CACHE_TIMEOUT)
+
+
+def get_user_auth_version_key(user_id: int) -> str:
+    return f'accounts:auth-version:{user_id}'
+
+
+def get_user_auth_version(user_id: int) -> str:
+    """Returns the current auth version of the user, shared by all processes through the cache."""
+    return cache.get_or_set(get_user_auth_version_key(user_id), lambda: uuid4().hex, USER_AUTH_VERSION_TIMEOUT)
+
+
+def bump_user_auth_version(user_id: int) -> None:
+    """
+    Invalidates the user fields cached by every process.
+
+    The version is bumped once more after the transaction is committed, so fields cached by concurrent requests from
+    the not yet committed state are not used.
+    """
+    key = get_user_auth_version_key(user_id)
+    cache.set(key, uuid4().hex, USER_AUTH_VERSION_TIMEOUT)
+    transaction.on_commit(lambda: cache.set(key, uuid4().hex, USER_AUTH_VERSION_TIMEOUT))
+
+
+def get_cached_user_fields(user_id: int, version: str) -> dict[str, Any] | None:
+    return local_user_cache.get((user_id, version))
+
+
+def cache_user_fields(user_id: int, version: str, fields: dict[str, Any]) -> None:
+    local_user_cache.set((user_id, version), fields)
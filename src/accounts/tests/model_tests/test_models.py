@@ -2,7 +2,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
 from django.core.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 from accounts import models
 from accounts.models.managers import UserManager
@@ -64,17 +65,21 @@ class UserModelTest(BaseTestCase):
         field = self.model.joined_at.field
         self.assertTrue(field.auto_now_add)
 
-    def test_access_token_property_returns_access_token(self):
+    def test_issue_token_pair_returns_refresh_and_access_tokens(self):
         user = self.model.objects.create(**self.data)
-        self.assertIsInstance(user.access_token, Token)
+        pair = user.issue_token_pair()
 
-    def test_refresh_token_returns_refresh_token(self):
-        user = self.model.objects.create(**self.data)
-        self.assertIsInstance(user.refresh_token, Token)
+        self.assertIsInstance(pair.refresh, RefreshToken)
+        self.assertIsInstance(pair.access, AccessToken)
+        self.assertNotEqual(str(pair.access), str(pair.refresh))
+        self.assertEqual(pair.access['user_id'], user.pk)
+        self.assertEqual(pair.access['exp'] - pair.access.lifetime.total_seconds(), pair.refresh['iat'])
 
-    def test_refresh_token_and_access_token_dont_match(self):
+    def test_issue_token_pair_stores_single_outstanding_token(self):
         user = self.model.objects.create(**self.data)
-        self.assertNotEqual(user.access_token, user.refresh_token)
+        pair = user.issue_token_pair()
+
+        self.assertEqual(OutstandingToken.objects.get(user=user).jti, pair.refresh['jti'])
 
     def test_user_is_specified_in_the_auth_user_model_setting(self):
         self.assertIs(self.model, get_user_model())
@@ -7,11 +7,13 @@ from accounts.serializers import (
     UserSetPasswordSerializer,
     UserRegisterSerializer,
     UserRetrieveSerializer,
+    UserRetrieveValuesSerializer,
     UserUpdateSerializer,
     UserDisableSerializer,
 )
 from accounts.serializers.mixins import PasswordValidationMixin, PhoneNumberValidationMixin
 from utils.serializers.mixins import AddressCreateUpdateMixin
+from utils.models import Job
 from utils.tests.cases import BaseTestCase
 
 User = get_user_model()
@@ -130,6 +132,26 @@ class UserRetrieveSerializerTest(BaseTestCase):
         )
 
 
+class UserRetrieveValuesSerializerTest(BaseTestCase):
+    serializer_class = UserRetrieveValuesSerializer
+
+    def setUp(self) -> None:
+        self.user = self.create_test_user(full_name=self.TEST_FULL_NAME, phone=self.TEST_PHONE)
+
+    def get_data(self) -> dict:
+        row = self.serializer_class.get_values(User.objects.filter(pk=self.user.pk)).order_by('address__id').first()
+        return self.serializer_class.to_representation(row)
+
+    def test_serializer_returns_same_data_as_drf_serializer_without_address(self):
+        self.assertEqual(self.get_data(), UserRetrieveSerializer(self.user).data)
+
+    def test_serializer_returns_same_data_as_drf_serializer_with_address(self):
+        self.create_test_address(self.user)
+        self.create_test_address(self.user, city='other city')
+
+        self.assertEqual(self.get_data(), UserRetrieveSerializer(User.objects.get(pk=self.user.pk)).data)
+
+
 class UserUpdateSerializerTest(BaseTestCase):
     serializer_class = UserUpdateSerializer
 
@@ -229,13 +251,14 @@ class UserDisableSerializerTest(BaseTestCase):
             instance=self.user,
             data=self.data,
         )
+        self.run_jobs()
 
         address.refresh_from_db()
 
         self.assert_model_instance(address, dict(number='-'))
 
     def test_serializer_blacklists_refresh_tokens_that_are_associated_with_user(self):
-        tokens: list[RefreshToken] = [self.user.refresh_token, self.user.refresh_token, self.user.refresh_token]
+        tokens: list[RefreshToken] = [self.user.issue_token_pair().refresh for _ in range(3)]
 
         self.create_serializer(
             self.serializer_class,
@@ -247,7 +270,7 @@ class UserDisableSerializerTest(BaseTestCase):
             self.assertRaises(TokenError, token.check_blacklist)
 
     def test_serializer_doesnt_raise_error_for_blacklisted_refresh_token(self):
-        blacklisted_token = self.user.refresh_token
+        blacklisted_token = self.user.issue_token_pair().refresh
         blacklisted_token.blacklist()
 
         self.assertRaises(TokenError, blacklisted_token.check_blacklist)
@@ -256,4 +279,7 @@ class UserDisableSerializerTest(BaseTestCase):
             self.serializer_class,
             instance=self.user,
             data=self.data,
-        )  # not raise error
+        )
+        self.run_jobs()
+
+        self.assertFalse(Job.objects.exclude(status=Job.Status.DONE).exists())
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from accounts.services.last_login import LastLoginRecorder, last_login_recorder, truncate_login_time
+from utils.tests.cases import BaseTestCase
+
+User = get_user_model()
+
+
+@override_settings(LAST_LOGIN_PRECISION=60, LAST_LOGIN_FLUSH_INTERVAL=10, LAST_LOGIN_FLUSH_SIZE=3)
+class LastLoginRecorderTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.recorder = LastLoginRecorder()
+        self.addCleanup(self.recorder.clear)
+        self.users = [self.create_test_user(email=f'user.{i}@test.com') for i in range(3)]
+
+    def test_truncate_login_time_rounds_down_to_precision(self):
+        value = datetime(2024, 1, 2, 3, 4, 59, 999, tzinfo=dt_timezone.utc)
+        self.assertEqual(truncate_login_time(value), datetime(2024, 1, 2, 3, 4, tzinfo=dt_timezone.utc))
+
+    def test_recorder_writes_buffered_logins_by_single_query(self):
+        with self.assertNumQueries(0):
+            self.recorder.record(self.users[0])
+            self.recorder.record(self.users[1])
+        self.assertIsNone(User.objects.get(pk=self.users[0].pk).last_login)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.recorder.flush(), 2)
+
+        for user in self.users[:2]:
+            last_login = User.objects.get(pk=user.pk).last_login
+            self.assertEqual(last_login.second, 0)
+            self.assertAlmostEqual(last_login, timezone.now(), delta=timedelta(seconds=60))
+        self.assertIsNone(User.objects.get(pk=self.users[2].pk).last_login)
+
+    def test_recorder_skips_logins_within_precision(self):
+        self.recorder.record(self.users[0])
+        self.recorder.flush()
+
+        self.recorder.record(self.users[0])
+        self.assertEqual(self.recorder.flush(), 0)
+
+    def test_recorder_flushes_when_buffer_is_full(self):
+        for user in self.users:
+            self.recorder.record(user)
+
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 3)
+
+    def test_recorder_schedules_flush_after_interval(self):
+        with mock.patch('accounts.services.last_login.Timer') as timer:
+            self.recorder.record(self.users[0])
+            self.recorder.record(self.users[1])
+
+        timer.assert_called_once_with(10, self.recorder.flush_in_background)
+        timer.return_value.start.assert_called_once()
+
+    def test_flush_does_not_move_last_login_back(self):
+        later = timezone.now() + timedelta(hours=1)
+        self.recorder.record(self.users[0])
+        User.objects.filter(pk=self.users[0].pk).update(last_login=later)
+
+        self.recorder.flush()
+
+        self.assertEqual(User.objects.get(pk=self.users[0].pk).last_login, later)
+
+
+class LoginLastLoginTest(BaseTestCase):
+    url = reverse('user-login')
+
+    def test_login_records_last_login(self):
+        user = self.create_test_user()
+        response = self.client.post(self.url, dict(email=self.TEST_EMAIL, password=self.TEST_PASSWORD))
+        self.assert_response(response, status.HTTP_200_OK)
+
+        last_login_recorder.flush()
+        user.refresh_from_db()
+        self.assertAlmostEqual(user.last_login, timezone.now(), delta=timedelta(seconds=settings.LAST_LOGIN_PRECISION))
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.services.tokens import blacklist_user_tokens
+from utils.tests.cases import BaseTestCase
+
+
+class BlacklistUserTokensTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.user = self.create_test_user()
+        self.tokens = [RefreshToken.for_user(self.user) for _ in range(3)]
+
+    def test_service_blacklists_all_outstanding_tokens_of_user(self):
+        other_token = RefreshToken.for_user(self.create_test_user(email='other@test.com'))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(blacklist_user_tokens(self.user.pk), 3)
+
+        self.assertEqual(
+            set(BlacklistedToken.objects.values_list('token__jti', flat=True)),
+            {token['jti'] for token in self.tokens},
+        )
+        self.assertFalse(BlacklistedToken.objects.filter(token__jti=other_token['jti']).exists())
+        blacklisted_at = BlacklistedToken.objects.first().blacklisted_at
+        self.assertAlmostEqual(blacklisted_at, timezone.now(), delta=timedelta(minutes=1))
+
+    def test_service_skips_blacklisted_and_expired_tokens(self):
+        self.tokens[0].blacklist()
+        OutstandingToken.objects.filter(jti=self.tokens[1]['jti']).update(expires_at=timezone.now())
+
+        self.assertEqual(blacklist_user_tokens(self.user.pk), 1)
+        self.assertEqual(blacklist_user_tokens(self.user.pk), 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
+
+    def test_blacklisted_tokens_cannot_be_refreshed(self):
+        blacklist_user_tokens(self.user.pk)
+
+        for token in self.tokens:
+            with self.subTest(jti=token['jti']):
+                self.assertRaisesMessage(TokenError, 'Token is blacklisted', RefreshToken, str(token))
@@ -0,0 +1,36 @@
+from unittest import TestCase, mock
+
+from accounts.services.user_cache import LocalUserCache
+
+
+class LocalUserCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.cache = LocalUserCache(size=2, timeout=10)
+
+    def test_cache_returns_set_value(self):
+        self.cache.set((1, 'v1'), dict(id=1))
+        self.assertEqual(self.cache.get((1, 'v1')), dict(id=1))
+        self.assertIsNone(self.cache.get((1, 'v2')))
+
+    def test_cache_evicts_least_recently_used_entry(self):
+        self.cache.set(1, 'first')
+        self.cache.set(2, 'second')
+        self.cache.get(1)
+        self.cache.set(3, 'third')
+
+        self.assertEqual(self.cache.get(1), 'first')
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.get(3), 'third')
+
+    def test_cache_expires_entries_after_timeout(self):
+        with mock.patch('accounts.services.user_cache.time.monotonic', return_value=100):
+            self.cache.set(1, 'first')
+        with mock.patch('accounts.services.user_cache.time.monotonic', return_value=110):
+            self.assertEqual(self.cache.get(1), 'first')
+        with mock.patch('accounts.services.user_cache.time.monotonic', return_value=111):
+            self.assertIsNone(self.cache.get(1))
+
+    def test_cache_clears_entries(self):
+        self.cache.set(1, 'first')
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(1))
@@ -0,0 +1,54 @@
+from django.urls import reverse
+from rest_framework import status
+
+from accounts.models.proxy import CustomerProxy
+from accounts.services.user_cache import get_user_auth_version
+from utils.tests.cases import BaseTestCase
+
+
+class CachedJWTAuthenticationTest(BaseTestCase):
+    url = reverse('user-retrieve-me')
+
+    def setUp(self) -> None:
+        self.user = self.create_test_user()
+        self.login_user_by_token(self.user)
+
+    def test_authentication_loads_user_once(self):
+        with self.assertNumQueries(2):
+            self.assert_response(self.client.get(self.url), status.HTTP_200_OK)
+        # Only the values of the retrieved user are queried.
+        with self.assertNumQueries(1):
+            self.assert_response(self.client.get(self.url), status.HTTP_200_OK)
+
+    def test_authentication_rejects_user_deactivated_after_caching(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assert_response(self.client.get(self.url), status.HTTP_401_UNAUTHORIZED)
+
+    def test_authentication_rejects_user_deactivated_by_admin_after_caching(self):
+        self.client.get(self.url)
+        customer = CustomerProxy.objects.get(pk=self.user.pk)
+        customer.is_active = False
+        customer.save()
+
+        self.assert_response(self.client.get(self.url), status.HTTP_401_UNAUTHORIZED)
+
+    def test_saves_of_other_fields_keep_auth_version(self):
+        version = get_user_auth_version(self.user.pk)
+        self.user.full_name = 'New Name'
+        self.user.save(update_fields=['full_name'])
+        self.assertEqual(get_user_auth_version(self.user.pk), version)
+
+        self.user.save()
+        self.assertNotEqual(get_user_auth_version(self.user.pk), version)
+
+    def test_authentication_returns_user_with_cached_fields(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+
+        user = response.wsgi_request.user
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.email, self.user.email)
+        self.assertIn('full_name', user.get_deferred_fields())
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from utils.tests.cases import BaseTestCase
+
+
+class PruneTokensCommandTest(BaseTestCase):
+    def setUp(self) -> None:
+        self.user = self.create_test_user()
+        self.active_tokens = [RefreshToken.for_user(self.user) for _ in range(2)]
+        expired_tokens = [RefreshToken.for_user(self.user) for _ in range(5)]
+        self.active_tokens[0].blacklist()
+        expired_tokens[0].blacklist()
+        expired_tokens[1].blacklist()
+        OutstandingToken.objects.filter(jti__in=[token['jti'] for token in expired_tokens]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+    def test_command_deletes_expired_tokens_in_batches(self):
+        stdout = StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=stdout)
+
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list('jti', flat=True)),
+            {token['jti'] for token in self.active_tokens},
+        )
+        self.assertEqual(BlacklistedToken.objects.get().token.jti, self.active_tokens[0]['jti'])
+        self.assertIn('Deleted 5 outstanding and 2 blacklisted tokens', stdout.getvalue())
+
+    def test_command_deletes_nothing_without_expired_tokens(self):
+        call_command('prune_tokens', stdout=StringIO())
+        stdout = StringIO()
+        call_command('prune_tokens', stdout=stdout)
+
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertIn('Deleted 0 outstanding and 0 blacklisted tokens', stdout.getvalue())
+
+    def test_expiration_index_exists(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, OutstandingToken._meta.db_table)
+        self.assertEqual(constraints['outstanding_token_expires_at_idx']['columns'], ['expires_at', 'id'])
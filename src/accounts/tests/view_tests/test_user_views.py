@@ -160,6 +160,7 @@ class UserDisableViewTest(BaseTestCase):
         address = self.create_test_address(self.user)
 
         self.client.post(self.url, self.input_data)
+        self.run_jobs()
 
         self.user.refresh_from_db()
         address.refresh_from_db()
@@ -180,6 +181,14 @@ class UserDisableViewTest(BaseTestCase):
         response = self.client.post(self.url, self.input_data)
         self.assert_response(response, status.HTTP_204_NO_CONTENT, expected_data=None)
 
+    def test_refresh_token_is_rejected_right_after_disabling(self):
+        refresh = self.user.issue_token_pair().refresh
+
+        self.client.post(self.url, self.input_data)
+        response = self.client.post(reverse('user-refresh'), dict(refresh=str(refresh)))
+
+        self.assert_response(response, status.HTTP_401_UNAUTHORIZED)
+
 
 class UserUpdateViewTest(BaseTestCase):
     url = reverse('user-update-me')
@@ -388,7 +397,7 @@ class UserLogoutViewTest(BaseTestCase):
 
     def setUp(self) -> None:
         self.user = self.create_test_user()
-        self.input_data = dict(refresh=str(self.user.refresh_token))
+        self.input_data = dict(refresh=str(self.user.issue_token_pair().refresh))
         self.login_user_by_token(self.user)
 
     def test_view_allows_only_post_method(self):
@@ -423,7 +432,7 @@ class UserRefreshViewTest(BaseTestCase):
 
     def setUp(self) -> None:
         self.user = self.create_test_user()
-        self.input_data = dict(refresh=str(self.user.refresh_token))
+        self.input_data = dict(refresh=str(self.user.issue_token_pair().refresh))
 
     def test_view_allows_only_post_method(self):
         self.assert_http_methods_availability(
@@ -449,7 +458,7 @@ class UserVerifyViewTest(BaseTestCase):
 
     def setUp(self) -> None:
         self.user = self.create_test_user()
-        self.input_data = dict(token=str(self.user.access_token))
+        self.input_data = dict(token=str(self.user.issue_token_pair().access))
 
     def test_view_allows_only_post_method(self):
         self.assert_http_methods_availability(
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.module_loading import import_string
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 from drf_standardized_errors import openapi_serializers
@@ -180,7 +181,9 @@ class UserViewSet(viewsets.GenericViewSet):
         return self.serializers_classes[self.action]
 
     def get_current_user(self):
-        return self.request.user
+        # The authenticated user has only the fields cached by the authentication, the actions that change the user
+        # load all of them.
+        return User.objects.get(pk=self.request.user.pk)
 
     def get_permissions(self):
         match self.action:
@@ -199,9 +202,11 @@ class UserViewSet(viewsets.GenericViewSet):
 
     @action(methods=['get'], detail=False)
     def retrieve_me(self, request):
-        user = self.get_current_user()
-        serializer = self.get_serializer(instance=user)
-        return Response(serializer.data, status.HTTP_200_OK)
+        # The user and the address are read by a single query of values, the first address is shown like by
+        # `AddressFieldSerializer`.
+        rows = serializers.UserRetrieveValuesSerializer.get_values(User.objects.filter(pk=request.user.pk))
+        row = rows.order_by('address__id').first()
+        return Response(serializers.UserRetrieveValuesSerializer.to_representation(row), status.HTTP_200_OK)
 
     @action(methods=['patch'], detail=False)
     def update_me(self, request):
@@ -228,7 +233,9 @@ class UserViewSet(viewsets.GenericViewSet):
 
     @action(methods=['post'], detail=False)
     def login(self, request):
-        return jwt_views.token_obtain_pair(request._request)
+        # The outstanding token of the issued refresh token is stored only if the whole login succeeds.
+        with transaction.atomic():
+            return jwt_views.token_obtain_pair(request._request)
 
     @action(methods=['post'], detail=False)
     def logout(self, request):
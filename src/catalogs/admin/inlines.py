@@ -3,6 +3,7 @@ from django.utils.translation import gettext as _
 
 from catalogs.models import Category
 from catalogs.models.proxies import MainImage, ExtraImage
+from catalogs.services.categories import get_descendant_count_subquery
 
 
 class ExtraImageInline(admin.StackedInline):
@@ -30,11 +31,20 @@ class SubCategoryInline(admin.TabularInline):
     model = Category
     extra = 1
     show_change_link = True
-    fields = ('name', 'is_parent', 'is_child')
-    readonly_fields = ('is_parent', 'is_child')
+    fields = ('name', 'is_parent', 'is_child', 'descendant_count')
+    readonly_fields = ('is_parent', 'is_child', 'descendant_count')
     verbose_name = _('sub category')
     verbose_name_plural = _('sub categories')
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(descendant_count=get_descendant_count_subquery())
+
+    @admin.display(description=_('Nested Sub Categories'))
+    def descendant_count(self, instance: Category):
+        # Blank forms of new sub categories have no annotation.
+        return getattr(instance, 'descendant_count', 0)
+
     @admin.display(boolean=True, ordering=('is_parent',), description=_('Is Parent'))
     def is_parent(self, instance: Category):
         return instance.is_parent
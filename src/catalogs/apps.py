@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CatalogsConfig(AppConfig):
@@ -6,4 +7,20 @@ class CatalogsConfig(AppConfig):
     name = 'catalogs'
 
     def ready(self):
-        from catalogs.models.signals import delete_advert_address  # noqa
+        from catalogs.models.signals import (  # noqa
+            delete_advert_address,
+            delete_image_variants_on_delete,
+            delete_upload_session_file,
+            detach_category_descendants_on_delete,
+            fill_metadata_of_new_image_file,
+            generate_image_variants_on_change,
+            invalidate_cached_advert,
+            invalidate_cached_advert_of_address,
+            invalidate_category_tree_cache,
+            reset_variants_of_replaced_image,
+            sync_advert_images_on_change,
+            update_category_path_on_save,
+        )
+        from catalogs.models.signals import install_search_triggers_after_migrate
+
+        post_migrate.connect(install_search_triggers_after_migrate, sender=self)
@@ -0,0 +1,48 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, OuterRef
+from django_filters import rest_framework as filters
+
+from catalogs.models import Advert, Category
+from catalogs.services.search import search_adverts
+from utils.models import Address
+
+
+class AdvertFilter(filters.FilterSet):
+    q = filters.CharFilter(
+        method='filter_search',
+        label='Search words in the advert name and description. Results are ordered by relevance.',
+    )
+    category = filters.ModelChoiceFilter(
+        queryset=Category.objects.all(),
+        method='filter_category',
+        label='Category ID. Adverts of all its sub categories are included.',
+    )
+    owner = filters.NumberFilter(field_name='owner')
+    price_min = filters.NumberFilter(field_name='price', lookup_expr='gte')
+    price_max = filters.NumberFilter(field_name='price', lookup_expr='lte')
+    pickup = filters.BooleanFilter(field_name='pickup')
+    nova_post = filters.BooleanFilter(field_name='nova_post')
+    courier = filters.BooleanFilter(field_name='courier')
+    city = filters.CharFilter(method='filter_city', label='City of the pickup address.')
+
+    class Meta:
+        model = Advert
+        fields = ('q', 'category', 'owner', 'price_min', 'price_max', 'pickup', 'nova_post', 'courier', 'city')
+
+    @staticmethod
+    def filter_search(queryset, name, value):
+        return search_adverts(queryset, value)
+
+    @staticmethod
+    def filter_category(queryset, name, value: Category):
+        return queryset.filter(category__in=value.get_descendants(include_self=True))
+
+    @staticmethod
+    def filter_city(queryset, name, value):
+        # A subquery instead of a join, so adverts with several addresses in the city are returned once.
+        addresses = Address.objects.filter(
+            content_type=ContentType.objects.get_for_model(Advert),
+            object_id=OuterRef('pk'),
+            city__iexact=value,
+        )
+        return queryset.filter(Exists(addresses))
@@ -0,0 +1,13 @@
+from catalogs.services.variants import delete_image_variants, generate_image_variants
+from utils.services.jobs import job
+
+
+@job('catalogs.generate_image_variants', concurrency=2)
+def generate_image_variants_job(image_ids: list[int]):
+    if failed := generate_image_variants(image_ids):
+        raise RuntimeError(f'Failed to generate variants of images {failed}.')
+
+
+@job('catalogs.delete_image_variants')
+def delete_image_variants_job(variants: dict[str, dict[str, str]]):
+    delete_image_variants(variants)
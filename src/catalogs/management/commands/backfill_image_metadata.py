@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from catalogs.models import Image
+from catalogs.services.images import IMAGE_METADATA_FIELDS, sync_advert_images
+from catalogs.services.variant_rendering import describe_image
+
+
+class Command(BaseCommand):
+    help = (
+        'Computes dimensions, byte size, dominant color and blurhash of images stored before they were computed '
+        'on upload. Images are decoded in parallel worker processes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of images read per query and decoded at a time.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes that decode images, 0 decodes them in place.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute the metadata of all images, not only of images that miss it.',
+        )
+
+    def handle(self, *args, **options):
+        self.storage = Image._meta.get_field('file').storage
+        queryset = Image.objects.order_by('pk').only('pk', 'advert_id', 'file')
+        if not options['all']:
+            queryset = queryset.filter(Q(width__isnull=True) | Q(size__isnull=True) | Q(blurhash__isnull=True))
+
+        executor = None
+        if options['workers']:
+            executor = ProcessPoolExecutor(max_workers=options['workers'], mp_context=get_context('spawn'))
+
+        updated, failed, last_pk = 0, 0, 0
+        try:
+            while images := list(queryset.filter(pk__gt=last_pk)[: options['batch_size']]):
+                last_pk = images[-1].pk
+                count = self.store_metadata(images, self.describe_files(self.read_files(images), executor))
+                updated += count
+                failed += len(images) - count
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} images, {failed} failed.'))
+
+    def read_files(self, images: list[Image]) -> dict[str, bytes]:
+        # Images that share a file by its content hash are decoded once.
+        contents = {}
+        for name in {image.file.name for image in images}:
+            try:
+                with self.storage.open(name) as file:
+                    contents[name] = file.read()
+            except FileNotFoundError:
+                self.stderr.write(f'File "{name}" is missing.')
+        return contents
+
+    def describe_files(self, contents: dict[str, bytes], executor: ProcessPoolExecutor | None) -> dict[str, dict]:
+        if executor is not None:
+            results = {name: executor.submit(describe_image, content).result for name, content in contents.items()}
+        else:
+            results = {name: partial(describe_image, content) for name, content in contents.items()}
+
+        metadata = {}
+        for name, result in results.items():
+            try:
+                metadata[name] = dict(result(), size=len(contents[name]))
+            except Exception as error:
+                self.stderr.write(f'File "{name}" is not a valid image: {error}')
+        return metadata
+
+    @staticmethod
+    def store_metadata(images: list[Image], metadata: dict[str, dict]) -> int:
+        images = [image for image in images if image.file.name in metadata]
+        for image in images:
+            for field, value in metadata[image.file.name].items():
+                setattr(image, field, value)
+
+        with transaction.atomic():
+            Image.objects.bulk_update(images, IMAGE_METADATA_FIELDS)
+            sync_advert_images({image.advert_id for image in images})
+        return len(images)
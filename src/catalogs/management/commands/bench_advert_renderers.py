@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from catalogs.management.commands.bench_advert_serializers import Command as SerializersBenchCommand
+from catalogs.models import Advert
+from catalogs.serializers import AdvertListValuesSerializer
+from utils.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks rendering a page of the advert list by the standard library and by the orjson renderer. '
+        'Seeded rows are created in a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adverts', type=int, default=100, help='Number of adverts on the page.')
+        parser.add_argument('--runs', type=int, default=1_000, help='Number of timed renders by every renderer.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            SerializersBenchCommand.seed_adverts(options['adverts'])
+            queryset = Advert.objects.order_by('-created_at', '-id')[: options['adverts']]
+            results = AdvertListValuesSerializer.to_representation_many(AdvertListValuesSerializer.get_values(queryset))
+            transaction.set_rollback(True)
+
+        data = dict(
+            count=len(results),
+            next='http://api.example.org/catalogs/adverts/?limit=100&offset=100',
+            previous=None,
+            results=results,
+        )
+        renderers = dict(json=JSONRenderer(), orjson=ORJSONRenderer())
+        if len({renderer.render(data) for renderer in renderers.values()}) != 1:
+            self.stderr.write('Rendered bytes of the renderers differ.')
+
+        timings = {name: self.run(renderer, data, options['runs']) for name, renderer in renderers.items()}
+        for name, renderer_timings in timings.items():
+            self.stdout.write(
+                f'{name}: {options["adverts"]} adverts, '
+                f'p50 {statistics.median(renderer_timings):.3f} ms, min {min(renderer_timings):.3f} ms'
+            )
+        speedup = statistics.median(timings['json']) / statistics.median(timings['orjson'])
+        self.stdout.write(self.style.SUCCESS(f'orjson is {speedup:.1f}x faster than json.'))
+
+    @staticmethod
+    def run(renderer: JSONRenderer, data: dict, runs: int) -> list[float]:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            renderer.render(data)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
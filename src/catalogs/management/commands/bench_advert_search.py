@@ -0,0 +1,91 @@
+import random
+import statistics
+import time
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from catalogs.models import Advert, Category
+from catalogs.services.search import search_adverts
+
+User = get_user_model()
+
+BASE_WORDS = (
+    'apple banana cherry tomato potato cucumber carrot onion garlic pepper honey milk cheese butter bread '
+    'flour sugar salt oil juice jam nuts berries grapes pear plum peach lemon orange melon cabbage beet '
+    'fresh organic homemade farm green red yellow sweet sour dried frozen smoked pickled local seasonal'
+).split()
+
+
+class Vocabulary:
+    """Word generator with a Zipf-like frequency distribution, like real advert texts."""
+
+    def __init__(self, rnd: random.Random, size: int):
+        self.rnd = rnd
+        # The number goes first so that no generated word is a prefix of another one.
+        self.words = [f'{i // len(BASE_WORDS) or ""}{BASE_WORDS[i % len(BASE_WORDS)]}' for i in range(size)]
+        self.cum_weights = list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+    def sample(self, k: int) -> str:
+        return ' '.join(self.rnd.choices(self.words, cum_weights=self.cum_weights, k=k))
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the advert search against a seeded catalog. '
+        'Seeded rows are created in a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adverts', type=int, default=1_000_000, help='Number of adverts to seed.')
+        parser.add_argument('--queries', type=int, default=200, help='Number of search queries to time.')
+        parser.add_argument('--limit', type=int, default=10, help='Page size of every search query.')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Number of adverts inserted per query.')
+        parser.add_argument('--vocabulary', type=int, default=20_000, help='Number of distinct words.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+
+    def handle(self, *args, **options):
+        vocabulary = Vocabulary(random.Random(options['seed']), options['vocabulary'])
+
+        with transaction.atomic():
+            self.seed_adverts(vocabulary, options['adverts'], options['batch_size'])
+            timings = self.run_queries(vocabulary, options['queries'], options['limit'])
+            transaction.set_rollback(True)
+
+        timings.sort()
+        self.stdout.write(
+            f'{connection.vendor}: {options["adverts"]} adverts, {len(timings)} queries, '
+            f'p50 {statistics.median(timings):.2f} ms, '
+            f'p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms, '
+            f'max {timings[-1]:.2f} ms'
+        )
+
+    def seed_adverts(self, vocabulary: Vocabulary, count: int, batch_size: int):
+        owner = User.objects.create_user(f'bench.{time.time_ns()}@bench.com', 'bench-password')
+        category = Category.objects.create(name=f'bench {time.time_ns()}')
+
+        started = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            Advert.objects.bulk_create(
+                Advert(
+                    owner=owner,
+                    category=category,
+                    name=vocabulary.sample(3),
+                    descr=vocabulary.sample(12),
+                    price='1.00',
+                )
+                for _ in range(min(batch_size, count - offset))
+            )
+        self.stdout.write(f'Seeded {count} adverts in {time.perf_counter() - started:.1f} s.')
+
+    @staticmethod
+    def run_queries(vocabulary: Vocabulary, count: int, limit: int) -> list[float]:
+        timings = []
+        for _ in range(count):
+            query = vocabulary.sample(vocabulary.rnd.randint(1, 2))
+            started = time.perf_counter()
+            list(search_adverts(Advert.objects.all(), query)[:limit])
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from catalogs.models import Advert, Category
+from catalogs.serializers import AdvertListSerializer, AdvertListValuesSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks fetching and serializing adverts of the list endpoint by the DRF serializer and by the values '
+        'serializer. Seeded rows are created in a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adverts', type=int, default=1_000, help='Number of adverts serialized per run.')
+        parser.add_argument('--runs', type=int, default=50, help='Number of timed runs of every path.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed_adverts(options['adverts'])
+            queryset = Advert.objects.order_by('-created_at', '-id')[: options['adverts']]
+            # Every run fetches the adverts again, as a sliced queryset caches its results.
+            paths = dict(
+                drf=lambda: AdvertListSerializer(queryset.all(), many=True).data,
+                values=lambda: AdvertListValuesSerializer.to_representation_many(
+                    AdvertListValuesSerializer.get_values(queryset.all())
+                ),
+            )
+            if paths['drf']() != paths['values']():
+                self.stderr.write('Representations of the serializers differ.')
+            timings = {name: self.run(path, options['runs']) for name, path in paths.items()}
+            transaction.set_rollback(True)
+
+        for name, path_timings in timings.items():
+            self.stdout.write(
+                f'{connection.vendor}: {name}, {options["adverts"]} adverts, '
+                f'p50 {statistics.median(path_timings):.2f} ms, min {min(path_timings):.2f} ms'
+            )
+        speedup = statistics.median(timings['drf']) / statistics.median(timings['values'])
+        self.stdout.write(self.style.SUCCESS(f'values is {speedup:.1f}x faster than drf.'))
+
+    @staticmethod
+    def seed_adverts(count: int):
+        owner = User.objects.create_user(f'bench.{time.time_ns()}@bench.com', 'bench-password')
+        category = Category.objects.create(name=f'bench {time.time_ns()}')
+        variants = dict(card=dict(webp='variants/bench/card.webp', jpeg='variants/bench/card.jpg'))
+        metadata = dict(width=1200, height=800, size=123456, dominant_color='#a0b0c0', blurhash='L00000fQfQfQ')
+        Advert.objects.bulk_create(
+            Advert(
+                owner=owner,
+                category=category,
+                name=f'bench advert {i}',
+                price=f'{i}.50',
+                main_image=f'images/bench/{i}.jpg',
+                main_image_variants=variants,
+                main_image_metadata=metadata,
+            )
+            for i in range(count)
+        )
+
+    @staticmethod
+    def run(path, runs: int) -> list[float]:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            path()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from catalogs.models import UploadSession
+from catalogs.services.uploads import get_abandoned_upload_sessions, get_upload_path, get_upload_root
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes upload sessions that received no bytes for UPLOAD_SESSION_MAX_AGE seconds, '
+        'together with their partially received files.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of sessions deleted per query.',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        queryset = get_abandoned_upload_sessions(now).order_by('pk')
+
+        deleted = 0
+        while session_ids := list(queryset.values_list('pk', flat=True)[: options['batch_size']]):
+            with transaction.atomic():
+                # Files are deleted by a signal once the transaction is committed.
+                deleted += UploadSession.objects.filter(pk__in=session_ids).delete()[0]
+
+        orphaned = self.delete_orphaned_files(now)
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} abandoned upload sessions and {orphaned} orphaned files.')
+        )
+
+    @staticmethod
+    def delete_orphaned_files(now) -> int:
+        """Deletes old files whose sessions were removed without the signal, e.g. by a crash or a raw query."""
+        if not (root := get_upload_root()).is_dir():
+            return 0
+
+        known = {get_upload_path(session).name for session in UploadSession.objects.only('pk')}
+        expiration = now.timestamp() - settings.UPLOAD_SESSION_MAX_AGE
+        orphaned = 0
+        for path in root.glob('*.part'):
+            if path.name not in known and path.stat().st_mtime < expiration:
+                path.unlink(missing_ok=True)
+                orphaned += 1
+        return orphaned
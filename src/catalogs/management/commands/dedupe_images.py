@@ -0,0 +1,78 @@
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalogs.models import Image
+from catalogs.services.images import sync_advert_images
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves image files stored before the content-addressed storage under names of their content hash, '
+        'so files with the same content are stored once.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of images read per query.',
+        )
+        parser.add_argument(
+            '--sweep',
+            action='store_true',
+            help='Also delete stored files that no image refers to.',
+        )
+
+    def handle(self, *args, **options):
+        self.storage = Image._meta.get_field('file').storage
+
+        moved, blobs, missing = 0, set(), 0
+        queryset = Image.objects.order_by('pk')
+        last_pk = 0
+        while rows := list(queryset.filter(pk__gt=last_pk).values_list('pk', 'file')[: options['batch_size']]):
+            last_pk = rows[-1][0]
+            for name in {name for _, name in rows if not self.storage.is_content_name(name)}:
+                if not self.storage.exists(name):
+                    self.stderr.write(f'File "{name}" is missing.')
+                    missing += 1
+                    continue
+                count, blob = self.move_file(name)
+                moved += count
+                blobs.add(blob)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Moved {moved} images into {len(blobs)} files, {missing} files are missing.')
+        )
+        if options['sweep']:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {self.sweep()} unreferenced files.'))
+
+    def move_file(self, name: str) -> tuple[int, str]:
+        with self.storage.open(name) as file:
+            blob = self.storage.save(name, file)
+
+        with transaction.atomic():
+            images = Image.objects.filter(file=name)
+            advert_ids = list(images.values_list('advert_id', flat=True))
+            # A queryset update sends no signals, so the old file is deleted here instead of by django_cleanup.
+            count = images.update(file=blob)
+            sync_advert_images(advert_ids)
+        FileSystemStorage.delete(self.storage, name)
+        return count, blob
+
+    def sweep(self) -> int:
+        deleted = 0
+        for directory, subdirectories, files in os.walk(self.storage.path(self.storage.prefix)):
+            subdirectories[:] = [name for name in subdirectories if name != 'variants']
+            relative = os.path.relpath(directory, self.storage.location).replace(os.sep, '/')
+            names = [f'{relative}/{file}' for file in files]
+            names = [name for name in names if self.storage.is_content_name(name)]
+            referenced = set(Image.objects.filter(file__in=names).values_list('file', flat=True))
+            for name in names:
+                if name not in referenced and not self.storage.is_recently_saved(name):
+                    FileSystemStorage.delete(self.storage, name)
+                    deleted += 1
+        return deleted
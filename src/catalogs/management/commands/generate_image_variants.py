@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from catalogs.models import Image
+from catalogs.services.variants import generate_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Generates resized variants of images that have none, or of all images with --all.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate variants of all images, replacing the existing ones.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of images rendered at once.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Image.objects.order_by('pk')
+        if not options['all']:
+            queryset = queryset.filter(variants={})
+
+        last_pk, generated, failed = 0, 0, 0
+        while image_ids := list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[: options['batch_size']]):
+            failed += len(generate_image_variants(image_ids))
+            generated += len(image_ids)
+            last_pk = image_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Generated variants of {generated - failed} images, {failed} failed.'))
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogs.models import Advert
+from catalogs.services.images import (
+    get_extra_image_count_subquery,
+    get_main_image_metadata_subquery,
+    get_main_image_subquery,
+    sync_advert_images,
+)
+
+
+class Command(BaseCommand):
+    help = 'Backfills and verifies the denormalized image columns of adverts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report adverts whose image columns are out of sync, without fixing them.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of adverts processed per query.',
+        )
+
+    def handle(self, *args, **options):
+        check, batch_size = options['check'], options['batch_size']
+        queryset = Advert.objects.order_by('pk').annotate(
+            expected_main_image=get_main_image_subquery(),
+            expected_main_image_variants=get_main_image_subquery('variants'),
+            expected_main_image_metadata=get_main_image_metadata_subquery(),
+            expected_extra_image_count=get_extra_image_count_subquery(),
+        )
+
+        last_pk, checked, stale = 0, 0, []
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk).values_list(
+                    'pk',
+                    'main_image',
+                    'main_image_variants',
+                    'main_image_metadata',
+                    'extra_image_count',
+                    'expected_main_image',
+                    'expected_main_image_variants',
+                    'expected_main_image_metadata',
+                    'expected_extra_image_count',
+                )[:batch_size]
+            )
+            if not rows:
+                break
+
+            batch_stale = [pk for pk, *columns in rows if columns[:4] != columns[4:]]
+            if batch_stale and not check:
+                sync_advert_images(batch_stale)
+
+            stale += batch_stale
+            checked += len(rows)
+            last_pk = rows[-1][0]
+
+        if check and stale:
+            raise CommandError(f'{len(stale)} of {checked} adverts have out of sync image columns: {stale[:20]}.')
+
+        action = 'Verified' if check else 'Synced'
+        self.stdout.write(self.style.SUCCESS(f'{action} {checked} adverts, {len(stale)} were out of sync.'))
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0004_extraimage_mainimage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advert',
+            name='extra_image_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='extra image count'),
+        ),
+        migrations.AddField(
+            model_name='advert',
+            name='main_image',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True, verbose_name='main image'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0005_advert_main_image_extra_image_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(fields=['-created_at', '-id'], name='advert_created_at_id_idx'),
+        ),
+    ]
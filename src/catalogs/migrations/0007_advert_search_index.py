@@ -0,0 +1,58 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARD = (
+    """
+    ALTER TABLE catalogs_advert ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(descr, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX advert_search_vector_idx ON catalogs_advert USING GIN (search_vector)',
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX IF EXISTS advert_search_vector_idx',
+    'ALTER TABLE catalogs_advert DROP COLUMN IF EXISTS search_vector',
+)
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE catalogs_advert_fts USING fts5(
+        name, descr, content='catalogs_advert', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO catalogs_advert_fts(catalogs_advert_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS catalogs_advert_fts_ai',
+    'DROP TRIGGER IF EXISTS catalogs_advert_fts_ad',
+    'DROP TRIGGER IF EXISTS catalogs_advert_fts_au',
+    'DROP TABLE IF EXISTS catalogs_advert_fts',
+)
+
+
+def run_vendor_sql(postgresql_sql, sqlite_sql):
+    def run(apps, schema_editor):
+        match schema_editor.connection.vendor:
+            case 'postgresql':
+                statements = postgresql_sql
+            case 'sqlite':
+                statements = sqlite_sql
+            case _:
+                statements = ()
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0006_advert_created_at_id_idx'),
+    ]
+
+    # The SQLite sync triggers are installed by `catalogs.services.search.install_search_triggers` after migrate.
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql(POSTGRESQL_FORWARD, SQLITE_FORWARD),
+            run_vendor_sql(POSTGRESQL_BACKWARD, SQLITE_BACKWARD),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0007_advert_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='advert_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='advert_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(fields=['price'], name='advert_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(
+                condition=models.Q(('pickup', True)), fields=['-created_at', '-id'], name='advert_pickup_created_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(
+                condition=models.Q(('nova_post', True)),
+                fields=['-created_at', '-id'],
+                name='advert_nova_post_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='advert',
+            index=models.Index(
+                condition=models.Q(('courier', True)), fields=['-created_at', '-id'], name='advert_courier_created_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:41
+
+from django.db import migrations, models
+
+
+def build_category_paths(apps, schema_editor):
+    Category = apps.get_model('catalogs', 'Category')
+    categories = list(Category.objects.using(schema_editor.connection.alias).only('pk', 'parent_id'))
+    parent_ids = {category.pk: category.parent_id for category in categories}
+
+    for category in categories:
+        ids, pk, visited = [], category.pk, set()
+        while pk is not None and pk not in visited:
+            visited.add(pk)
+            ids.append(pk)
+            pk = parent_ids.get(pk)
+        category.path = '/' + ''.join(f'{pk}/' for pk in reversed(ids))
+
+    Category.objects.using(schema_editor.connection.alias).bulk_update(categories, ['path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0008_advert_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(
+                db_index=True,
+                default='',
+                editable=False,
+                help_text='IDs of the category ancestors and the category itself, like "/1/5/".',
+                max_length=255,
+                verbose_name='path',
+            ),
+        ),
+        migrations.RunPython(build_category_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0009_category_path'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ('id',), 'verbose_name': 'category', 'verbose_name_plural': 'categories'},
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0010_category_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advert',
+            name='main_image_variants',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='main image variants'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='variants',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text='Paths of the resized copies by the variant name and format, like {"card": {"webp": "..."}}.',
+                verbose_name='variants',
+            ),
+        ),
+    ]
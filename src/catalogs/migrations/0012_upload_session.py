@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:21
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0011_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='last update')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='creation')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('type', models.PositiveIntegerField(choices=[(0, 'main'), (1, 'extra')], verbose_name='type')),
+                ('file_name', models.CharField(max_length=255, verbose_name='file name')),
+                ('size', models.PositiveBigIntegerField(verbose_name='size')),
+                (
+                    'offset',
+                    models.PositiveBigIntegerField(
+                        default=0, help_text='Number of bytes received so far.', verbose_name='offset'
+                    ),
+                ),
+                (
+                    'advert',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='upload_sessions',
+                        to='catalogs.advert',
+                        verbose_name='advert',
+                    ),
+                ),
+                (
+                    'owner',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='upload_sessions',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='owner',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'upload session',
+                'verbose_name_plural': 'upload sessions',
+                'indexes': [models.Index(fields=['updated_at'], name='upload_session_updated_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:27
+
+import catalogs.storages
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0012_upload_session'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='image',
+            name='file',
+            field=models.ImageField(storage=catalogs.storages.ImageStorage(), upload_to='images', verbose_name='file'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('catalogs', '0013_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advert',
+            name='main_image_metadata',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='main image metadata'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='blurhash',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text='BlurHash string that clients decode into a blurred placeholder of the image.',
+                max_length=100,
+                null=True,
+                verbose_name='blurhash',
+            ),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='dominant_color',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text='Hex color, like #aabbcc, shown while the image is loading.',
+                max_length=7,
+                null=True,
+                verbose_name='dominant color',
+            ),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='height'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='size',
+            field=models.PositiveBigIntegerField(
+                blank=True, editable=False, help_text='Size of the file in bytes.', null=True, verbose_name='size'
+            ),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='width'),
+        ),
+    ]
@@ -1,3 +1,3 @@
-from .models import Category, Advert, Image
+from .models import Category, Advert, Image, UploadSession
 
-__all__ = ['Category', 'Advert', 'Image']
+__all__ = ['Category', 'Advert', 'Image', 'UploadSession']
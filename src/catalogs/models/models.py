@@ -1,3 +1,5 @@
+import uuid
+from collections.abc import Iterable
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
@@ -5,8 +7,10 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext as _
 
+from catalogs.storages import ImageStorage
 from utils.models.mixins import CreatedUpdatedMixin
 from utils.models import Address
 
@@ -26,12 +30,55 @@ class Image(CreatedUpdatedMixin):
     )
     file = models.ImageField(
         verbose_name=_('file'),
-        upload_to='images/%Y/%m/%d',
+        upload_to='images',
+        storage=ImageStorage(),
     )
     type = models.PositiveIntegerField(
         verbose_name=_('type'),
         choices=Type.choices,
     )
+    variants = models.JSONField(
+        verbose_name=_('variants'),
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_('Paths of the resized copies by the variant name and format, like {"card": {"webp": "..."}}.'),
+    )
+    width = models.PositiveIntegerField(
+        verbose_name=_('width'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    height = models.PositiveIntegerField(
+        verbose_name=_('height'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name=_('size'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Size of the file in bytes.'),
+    )
+    dominant_color = models.CharField(
+        verbose_name=_('dominant color'),
+        max_length=7,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Hex color, like #aabbcc, shown while the image is loading.'),
+    )
+    blurhash = models.CharField(
+        verbose_name=_('blurhash'),
+        max_length=100,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('BlurHash string that clients decode into a blurred placeholder of the image.'),
+    )
 
     class Meta:
         verbose_name = _('image')
@@ -42,11 +89,21 @@ class Image(CreatedUpdatedMixin):
 
     def clean(self):
         if not self.pk:
-            if self.advert.images.filter(type=self.Type.MAIN).exists() and self.type == self.Type.MAIN:
-                raise ValidationError(
-                    'Advert already has main image.',
-                    'image_conflict',
-                )
+            self.check_main_image_conflict(self.advert, [self.type])
+
+    @classmethod
+    def check_main_image_conflict(cls, advert: 'Advert', types: Iterable[int]) -> None:
+        """
+        Checks that the advert keeps a single main image after adding images of the given types.
+
+        The whole batch is checked in memory against one query for an existing main image.
+        """
+        new_main_count = sum(type_ == cls.Type.MAIN for type_ in types)
+        if new_main_count and (new_main_count > 1 or advert.images.filter(type=cls.Type.MAIN).exists()):
+            raise ValidationError(
+                'Advert already has main image.',
+                'image_conflict',
+            )
 
 
 class Advert(CreatedUpdatedMixin):
@@ -99,10 +156,45 @@ class Advert(CreatedUpdatedMixin):
         verbose_name=_('pickup address'),
         to=Address,
     )
+    main_image = models.CharField(
+        verbose_name=_('main image'),
+        max_length=100,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    extra_image_count = models.PositiveIntegerField(
+        verbose_name=_('extra image count'),
+        default=0,
+        editable=False,
+    )
+    main_image_variants = models.JSONField(
+        verbose_name=_('main image variants'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    main_image_metadata = models.JSONField(
+        verbose_name=_('main image metadata'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = _('advert')
         verbose_name_plural = _('adverts')
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='advert_created_at_id_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='advert_category_created_idx'),
+            models.Index(fields=['owner', '-created_at', '-id'], name='advert_owner_created_idx'),
+            models.Index(fields=['price'], name='advert_price_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=Q(pickup=True), name='advert_pickup_created_idx'),
+            models.Index(
+                fields=['-created_at', '-id'], condition=Q(nova_post=True), name='advert_nova_post_created_idx'
+            ),
+            models.Index(fields=['-created_at', '-id'], condition=Q(courier=True), name='advert_courier_created_idx'),
+        ]
 
     def clean_pickup_nova_post_courier(self):
         if not any([self.pickup, self.nova_post, self.courier]):
@@ -140,14 +232,51 @@ class Category(CreatedUpdatedMixin):
         blank=True,
         related_name='children',
     )
+    path = models.CharField(
+        verbose_name=_('path'),
+        max_length=255,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text=_('IDs of the category ancestors and the category itself, like "/1/5/".'),
+    )
+
+    PATH_SEPARATOR = '/'
 
     class Meta:
         verbose_name = _('category')
         verbose_name_plural = _('categories')
+        ordering = ('id',)
 
     def __str__(self):
         return str(self.name)
 
+    def clean(self):
+        if self.pk and self.parent_id and (self.parent_id == self.pk or self.is_ancestor_of(self.parent)):
+            raise ValidationError(
+                {'parent': _('Category cannot be a sub category of itself or of its sub categories.')},
+                'invalid_parent',
+            )
+
+    def get_ancestor_ids(self, include_self=False) -> list[int]:
+        ids = [int(pk) for pk in self.path.strip(self.PATH_SEPARATOR).split(self.PATH_SEPARATOR) if pk]
+        return ids if include_self else ids[:-1]
+
+    def get_ancestors(self, include_self=False) -> models.QuerySet['Category']:
+        """Returns ancestors of the category from the root, found by primary keys stored in the path."""
+        return Category.objects.filter(pk__in=self.get_ancestor_ids(include_self)).order_by('path')
+
+    def get_descendants(self, include_self=False) -> models.QuerySet['Category']:
+        """Returns all nested sub categories, found by the indexed path prefix."""
+        queryset = Category.objects.filter(path__startswith=self.path)
+        return queryset if include_self else queryset.exclude(pk=self.pk)
+
+    def is_ancestor_of(self, category: 'Category') -> bool:
+        return bool(self.path) and category.path.startswith(self.path) and category.path != self.path
+
+    def build_path(self, parent_path: str | None) -> str:
+        return f'{parent_path or self.PATH_SEPARATOR}{self.pk}{self.PATH_SEPARATOR}'
+
     @property
     def is_parent(self):
         if self.children.exists():
@@ -159,3 +288,49 @@ class Category(CreatedUpdatedMixin):
         if self.parent:
             return True
         return False
+
+
+class UploadSession(CreatedUpdatedMixin):
+    """A resumable upload of an advert image, received in byte ranges and finalized into an `Image`."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        verbose_name=_('owner'),
+        to=User,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+    )
+    advert = models.ForeignKey(
+        verbose_name=_('advert'),
+        to=Advert,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+    )
+    type = models.PositiveIntegerField(
+        verbose_name=_('type'),
+        choices=Image.Type.choices,
+    )
+    file_name = models.CharField(
+        verbose_name=_('file name'),
+        max_length=255,
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name=_('size'),
+    )
+    offset = models.PositiveBigIntegerField(
+        verbose_name=_('offset'),
+        default=0,
+        help_text=_('Number of bytes received so far.'),
+    )
+
+    class Meta:
+        verbose_name = _('upload session')
+        verbose_name_plural = _('upload sessions')
+        indexes = [models.Index(fields=['updated_at'], name='upload_session_updated_at_idx')]
+
+    def __str__(self):
+        return f'{self.file_name} ({self.offset}/{self.size})'
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset == self.size
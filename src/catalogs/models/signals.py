@@ -1,10 +1,119 @@
-from django.db.models.signals import post_delete
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from catalogs.models.models import Advert
+from catalogs.models.models import Advert, Category, Image, UploadSession
+from catalogs.models.proxies import ExtraImage, MainImage
+from catalogs.services.advert_cache import invalidate_cached_adverts
+from catalogs.services.categories import (
+    bump_category_tree_version,
+    detach_category_descendants,
+    update_category_path,
+)
+from catalogs.services.images import fill_image_file_metadata, request_advert_images_sync
+from catalogs.services.search import install_search_triggers
+from catalogs.services.uploads import get_upload_path
+from catalogs.services.variants import request_image_variants, request_image_variants_deletion
+from utils.models import Address
 
 
 @receiver(post_delete, sender=Advert)
 def delete_advert_address(sender, instance, **kwargs):
     if (address := instance.address.first()) is not None:
         address.delete()
+
+
+@receiver(post_save, sender=Advert)
+@receiver(post_delete, sender=Advert)
+def invalidate_cached_advert(sender, instance, **kwargs):
+    invalidate_cached_adverts([instance.pk])
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def invalidate_cached_advert_of_address(sender, instance, **kwargs):
+    if instance.content_type_id == ContentType.objects.get_for_model(Advert).pk:
+        invalidate_cached_adverts([instance.object_id])
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_save, sender=MainImage)
+@receiver(post_save, sender=ExtraImage)
+@receiver(post_delete, sender=Image)
+@receiver(post_delete, sender=MainImage)
+@receiver(post_delete, sender=ExtraImage)
+def sync_advert_images_on_change(sender, instance, **kwargs):
+    # The sync also invalidates the cached advert, like for image changes made by queryset updates.
+    request_advert_images_sync(instance.advert_id)
+
+
+@receiver(pre_save, sender=Image)
+@receiver(pre_save, sender=MainImage)
+@receiver(pre_save, sender=ExtraImage)
+def reset_variants_of_replaced_image(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding:
+        return
+
+    previous = Image.objects.filter(pk=instance.pk).values_list('file', 'variants').first()
+    if previous is not None and previous[0] != instance.file.name:
+        instance.variants = {}
+        instance._replaced_variants = previous[1]
+
+
+@receiver(pre_save, sender=Image)
+@receiver(pre_save, sender=MainImage)
+@receiver(pre_save, sender=ExtraImage)
+def fill_metadata_of_new_image_file(sender, instance, raw, **kwargs):
+    # An uncommitted file is assigned but not stored yet, the field stores it right after pre_save signals.
+    if not raw and instance.file and not instance.file._committed:
+        fill_image_file_metadata(instance)
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_save, sender=MainImage)
+@receiver(post_save, sender=ExtraImage)
+def generate_image_variants_on_change(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    replaced = hasattr(instance, '_replaced_variants')
+    if replaced:
+        request_image_variants_deletion(instance.__dict__.pop('_replaced_variants'))
+    if created or replaced:
+        request_image_variants([instance.pk])
+
+
+@receiver(post_delete, sender=Image)
+@receiver(post_delete, sender=MainImage)
+@receiver(post_delete, sender=ExtraImage)
+def delete_image_variants_on_delete(sender, instance, **kwargs):
+    request_image_variants_deletion(instance.variants)
+
+
+@receiver(post_save, sender=Category)
+def update_category_path_on_save(sender, instance, **kwargs):
+    update_category_path(instance)
+
+
+@receiver(post_delete, sender=Category)
+def detach_category_descendants_on_delete(sender, instance, **kwargs):
+    detach_category_descendants(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_cache(sender, instance, **kwargs):
+    bump_category_tree_version()
+
+
+@receiver(post_delete, sender=UploadSession)
+def delete_upload_session_file(sender, instance, **kwargs):
+    # The path is taken now, Django clears the primary key of deleted instances.
+    transaction.on_commit(partial(get_upload_path(instance).unlink, missing_ok=True))
+
+
+def install_search_triggers_after_migrate(sender, using, **kwargs):
+    install_search_triggers(using)
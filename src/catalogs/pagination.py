@@ -0,0 +1,180 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over `(created_at, id)` in descending order.
+
+    Pages are fetched with an indexed range condition instead of an offset, and no total count is calculated.
+    Cursors are opaque strings that encode the key of the page boundary and the direction. Querysets ordered by other
+    fields, like search results ordered by rank, are rejected, as their order would be lost.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    ordering = ('created_at', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_ordering_message = 'Cursor pagination is not available for results in another order, like search results.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.check_ordering(queryset)
+        self.request = request
+        self.limit = self.get_limit(request)
+        position, self.reverse = self.decode_cursor(request)
+
+        order_by = self.ordering if self.reverse else tuple(f'-{field}' for field in self.ordering)
+        queryset = queryset.order_by(*order_by)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        self.page = results[: self.limit]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+    def check_ordering(self, queryset):
+        keyset_orderings = (self.ordering, tuple(f'-{field}' for field in self.ordering))
+        if queryset.query.order_by and tuple(queryset.query.order_by) not in keyset_orderings:
+            raise ValidationError(self.invalid_ordering_message)
+
+    def get_limit(self, request) -> int:
+        try:
+            return _positive_int(request.query_params[self.limit_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_position_filter(self, position: tuple[datetime, int]) -> Q:
+        (first_field, second_field), (first_value, second_value) = self.ordering, position
+        lookup = 'gt' if self.reverse else 'lt'
+        return Q(**{f'{first_field}__{lookup}': first_value}) | Q(
+            **{first_field: first_value, f'{second_field}__{lookup}': second_value}
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.get_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.get_link(self.page[0], reverse=True)
+
+    def get_link(self, obj, reverse: bool) -> str:
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        # Pages are either model instances or rows of values.
+        first_value, second_value = (
+            obj[field] if isinstance(obj, dict) else getattr(obj, field) for field in self.ordering
+        )
+        payload = [first_value.isoformat(), second_value, int(reverse)]
+        return urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request) -> tuple[tuple[datetime, int] | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            first_value, second_value, reverse = payload
+            return (datetime.fromisoformat(first_value), int(second_value)), bool(reverse)
+        except (BinasciiError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class AdvertPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that switches to `KeysetPagination` per request.
+
+    Clients opt in with `?pagination=cursor`; links of keyset pages carry a `cursor` parameter that keeps the mode.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_mode = 'cursor'
+    keyset_class = KeysetPagination
+
+    keyset = None
+
+    def is_keyset_requested(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == self.keyset_mode
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_requested(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" to use keyset pagination without a total count.',
+                'schema': {'type': 'string', 'enum': [self.keyset_mode]},
+            },
+            *self.keyset_class().get_schema_operation_parameters(view),
+        ]
@@ -3,4 +3,4 @@ from rest_framework.permissions import IsAuthenticated
 
 class IsOwner(IsAuthenticated):
     def has_object_permission(self, request, view, obj):
-        return obj.owner.id == request.user.id
+        return obj.owner_id == request.user.id
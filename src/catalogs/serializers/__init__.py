@@ -1,21 +1,29 @@
 from .serializers import (
     CategoryListSerializer,
     AdvertListSerializer,
+    AdvertListValuesSerializer,
     AdvertRetrieveSerializer,
     AdvertCreateSerializer,
     AdvertUpdateSerializer,
     CategorySerializer,
+    CategoryValuesSerializer,
     ImageMultipleDeleteSerializer,
     ImageMultipleCreateSerializer,
+    ImageSerializer,
+    UploadSessionSerializer,
 )
 
 __all__ = [
     'CategoryListSerializer',
     'AdvertListSerializer',
+    'AdvertListValuesSerializer',
     'AdvertRetrieveSerializer',
     'AdvertCreateSerializer',
     'AdvertUpdateSerializer',
     'CategorySerializer',
+    'CategoryValuesSerializer',
     'ImageMultipleDeleteSerializer',
     'ImageMultipleCreateSerializer',
+    'ImageSerializer',
+    'UploadSessionSerializer',
 ]
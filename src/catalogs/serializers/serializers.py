@@ -1,15 +1,33 @@
-from typing import Optional
+from functools import partial
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
 
 from catalogs.models import Category
-from catalogs.models.models import Advert, Image
-from utils.serializers import AddressFieldSerializer
+from catalogs.models.models import Advert, Image, UploadSession
+from catalogs.services.images import (
+    IMAGE_METADATA_FIELDS,
+    batch_advert_images_sync,
+    fill_image_file_metadata,
+    sync_advert_images,
+)
+from catalogs.services.variants import request_image_variants
+from utils.serializers import AddressFieldSerializer, Column, ValuesSerializer, decimal_converter
+from utils.services.media import sign_media_url
 from utils.serializers.mixins import AddressCreateUpdateMixin
 
 
+def get_image_variant(variants: dict | None, name: str) -> dict[str, str] | None:
+    """Returns signed URLs of the image variant by format, or None while the variants are not generated yet."""
+    if not (formats := (variants or {}).get(name)):
+        return None
+    return {fmt: sign_media_url(path) for fmt, path in formats.items()}
+
+
 class ImageMultipleDeleteSerializer(serializers.ModelSerializer):
     files = serializers.ListSerializer(
         child=serializers.CharField(allow_null=False, allow_blank=False, required=False),
@@ -46,7 +64,8 @@ class ImageMultipleDeleteSerializer(serializers.ModelSerializer):
 
         advert = self.validated_data['advert']
         files = self.validated_data['files']
-        advert.images.filter(file__in=files).delete()
+        with batch_advert_images_sync():
+            advert.images.filter(file__in=files).delete()
 
 
 class ImageMultipleCreateSerializer(serializers.ModelSerializer):
@@ -80,37 +99,101 @@ class ImageMultipleCreateSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
-        advert = validated_data.pop('advert')
-        image_data = [dict(advert=advert, file=file, type=type_) for file, type_ in zip(*validated_data.values())]
+        advert = validated_data['advert']
+        images = [
+            Image(advert=advert, file=file, type=type_)
+            for file, type_ in zip(validated_data['files'], validated_data['types'])
+        ]
+
+        Image.check_main_image_conflict(advert, (image.type for image in images))
+        # bulk_create() stores the files on insert but sends no signals, so the file metadata is filled and
+        # the advert images are synced explicitly.
+        for image in images:
+            fill_image_file_metadata(image)
+        images = Image.objects.bulk_create(images)
+        sync_advert_images([advert.pk])
+        request_image_variants(image.pk for image in images)
+        return images
+
+
+class ImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Image
+        fields = ('id', 'advert', 'file', 'type')
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ('id', 'advert', 'type', 'file_name', 'size', 'offset')
+        read_only_fields = ('offset',)
 
-        for data in image_data:
-            img = Image(**data)
-            img.full_clean()
-            img.save()
+    def validate_advert(self, advert: Advert):
+        if advert.owner_id != self.context['request'].user.id:
+            raise ValidationError(
+                'Images can be uploaded only to own adverts.',
+                'not_owner',
+            )
+        return advert
 
-        return Image.objects.filter(advert=advert).first()
+    def validate_size(self, size: int):
+        if not 0 < size <= settings.IMAGE_UPLOAD_MAX_SIZE:
+            raise ValidationError(
+                f'File size should be between 1 and {settings.IMAGE_UPLOAD_MAX_SIZE} bytes.',
+                'invalid_size',
+            )
+        return size
+
+    def validate(self, attrs):
+        # The final check runs on finalize, this one saves uploading a file that would be rejected.
+        try:
+            Image.check_main_image_conflict(attrs['advert'], [attrs['type']])
+        except DjangoValidationError as error:
+            raise ValidationError(as_serializer_error(error))
+        return attrs
+
+    def create(self, validated_data):
+        return super().create({**validated_data, 'owner_id': self.context['request'].user.id})
 
 
 class AdvertListSerializer(serializers.ModelSerializer):
     main_image = serializers.SerializerMethodField('get_main_image')
+    main_image_card = serializers.SerializerMethodField('get_main_image_card')
 
     class Meta:
         model = Advert
-        fields = ('id', 'name', 'category', 'price', 'main_image')
+        fields = ('id', 'name', 'category', 'price', 'main_image', 'main_image_card', 'main_image_metadata')
         read_only_fields = fields
 
     @staticmethod
-    def get_main_image(obj) -> Optional[str]:
-        img = obj.images.filter(type=Image.Type.MAIN).first()
-        if img is None:
-            return None
-        return str(img.file)
+    def get_main_image(obj) -> str | None:
+        return sign_media_url(obj.main_image)
+
+    @staticmethod
+    def get_main_image_card(obj) -> dict[str, str] | None:
+        return get_image_variant(obj.main_image_variants, 'card')
+
+
+class AdvertListValuesSerializer(ValuesSerializer):
+    serializer_class = AdvertListSerializer
+    columns = dict(
+        id=Column('id'),
+        name=Column('name'),
+        category=Column('category_id'),
+        price=Column('price', decimal_converter(Advert._meta.get_field('price').decimal_places)),
+        main_image=Column('main_image', sign_media_url),
+        main_image_card=Column('main_image_variants', partial(get_image_variant, name='card')),
+        main_image_metadata=Column('main_image_metadata'),
+    )
 
 
 class AdvertRetrieveSerializer(serializers.ModelSerializer):
     address = AddressFieldSerializer(read_only=True)
     main_image = serializers.SerializerMethodField('get_main_image')
+    main_image_full = serializers.SerializerMethodField('get_main_image_full')
     extra_images = serializers.SerializerMethodField('get_extra_images')
+    extra_images_full = serializers.SerializerMethodField('get_extra_images_full')
+    extra_images_metadata = serializers.SerializerMethodField('get_extra_images_metadata')
 
     class Meta:
         model = Advert
@@ -127,21 +210,40 @@ class AdvertRetrieveSerializer(serializers.ModelSerializer):
             'courier',
             'address',
             'main_image',
+            'main_image_full',
+            'main_image_metadata',
             'extra_images',
+            'extra_images_full',
+            'extra_images_metadata',
         )
         read_only_fields = fields
 
     @staticmethod
-    def get_main_image(obj) -> Optional[str]:
-        img = obj.images.filter(type=Image.Type.MAIN).first()
-        if img is None:
-            return None
-        return str(img.file)
+    def get_main_image(obj) -> str | None:
+        return sign_media_url(obj.main_image)
 
     @staticmethod
-    def get_extra_images(obj) -> list[str]:
-        imgs = obj.images.filter(type=Image.Type.EXTRA)
-        return [str(img.file) for img in imgs]
+    def get_main_image_full(obj) -> dict[str, str] | None:
+        return get_image_variant(obj.main_image_variants, 'full')
+
+    def get_extra_images(self, obj) -> list[str]:
+        return [sign_media_url(file) for file, *_ in self.get_extra_image_rows(obj)]
+
+    def get_extra_images_full(self, obj) -> list[dict[str, str] | None]:
+        return [get_image_variant(variants, 'full') for _, variants, *_ in self.get_extra_image_rows(obj)]
+
+    def get_extra_images_metadata(self, obj) -> list[dict]:
+        return [dict(zip(IMAGE_METADATA_FIELDS, metadata)) for _, _, *metadata in self.get_extra_image_rows(obj)]
+
+    @staticmethod
+    def get_extra_image_rows(obj) -> list[tuple]:
+        # All extra image fields are built from a single query.
+        if not obj.extra_image_count:
+            return []
+        if not hasattr(obj, '_extra_image_rows'):
+            images = obj.images.filter(type=Image.Type.EXTRA).order_by('pk')
+            obj._extra_image_rows = list(images.values_list('file', 'variants', *IMAGE_METADATA_FIELDS))
+        return obj._extra_image_rows
 
 
 class AdvertCreateSerializer(AddressCreateUpdateMixin, serializers.ModelSerializer):
@@ -188,6 +290,14 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('id', 'name')
 
 
+class CategoryValuesSerializer(ValuesSerializer):
+    serializer_class = CategorySerializer
+    columns = dict(
+        id=Column('id'),
+        name=Column('name'),
+    )
+
+
 class CategoryListSerializer(serializers.ModelSerializer):
     sub_categories = serializers.SerializerMethodField('get_children')
 
@@ -196,6 +306,10 @@ class CategoryListSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'sub_categories')
 
     def get_children(self, obj):
-        if obj.children.exists():
-            return self.__class__(obj.children.all(), many=True).data
-        return []
+        # The view passes the whole tree grouped by parent id to avoid querying children of every category.
+        children_index = self.context.get('category_children')
+        if children_index is not None:
+            children = children_index.get(obj.pk, [])
+        else:
+            children = obj.children.all()
+        return self.__class__(children, many=True, context=self.context).data
@@ -0,0 +1,88 @@
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.services.media import get_media_window_start
+
+T = TypeVar('T')
+
+# Seconds a rebuild of a cold entry may take before another worker may rebuild it too.
+ADVERT_CACHE_LOCK_TIMEOUT = 10
+# Seconds between checks and the number of checks for an entry that another worker is rebuilding.
+ADVERT_CACHE_WAIT_INTERVAL = 0.05
+ADVERT_CACHE_WAIT_ATTEMPTS = 20
+# Seconds the shared cache keeps the version of an advert, a new version is made when it expires.
+ADVERT_VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def get_advert_version_key(pk: int) -> str:
+    return f'catalogs:advert-version:{pk}'
+
+
+def get_advert_version(pk: int) -> str:
+    """
+    Returns the current version of the advert entries, shared by all processes through the cache.
+
+    The version must be read before the advert is loaded. An entry built from a state that a concurrent change
+    replaced is then cached under the version that the change bumped, and is never served.
+    """
+    return cache.get_or_set(get_advert_version_key(pk), lambda: uuid4().hex, ADVERT_VERSION_TIMEOUT)
+
+
+def get_advert_cache_key(pk: int, version: str, window_start: int | None = None) -> str:
+    # Cached representations have signed media URLs, so entries are kept per media URL window.
+    if window_start is None:
+        window_start = get_media_window_start()
+    return f'catalogs:advert:{pk}:{version}:{window_start}'
+
+
+def get_cached_advert(pk: int, version: str) -> Any:
+    return cache.get(get_advert_cache_key(pk, version))
+
+
+def cache_advert(pk: int, version: str, build: Callable[[], T]) -> T:
+    """
+    Builds the entry of the advert and caches it under the version until the end of the media URL window.
+
+    Only the worker that takes a short lock builds and caches a cold entry. Others wait for the entry for a while, and
+    then build it themselves without caching it.
+    """
+    window_start = get_media_window_start()
+    key = get_advert_cache_key(pk, version, window_start)
+    lock_key, token = f'{key}:lock', uuid4().hex
+    if cache.add(lock_key, token, ADVERT_CACHE_LOCK_TIMEOUT):
+        try:
+            entry = build()
+            cache.set(key, entry, max(window_start + settings.MEDIA_URL_MAX_AGE - time.time(), 1))
+            return entry
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    for _ in range(ADVERT_CACHE_WAIT_ATTEMPTS):
+        time.sleep(ADVERT_CACHE_WAIT_INTERVAL)
+        if (entry := cache.get(key)) is not None:
+            return entry
+    return build()
+
+
+def invalidate_cached_adverts(pks: Iterable[int]) -> None:
+    """
+    Invalidates cached entries of the adverts by bumping their versions, entries of old versions expire unused.
+
+    The versions are bumped once more after the transaction is committed, so entries cached by concurrent requests
+    from the not yet committed state are not served.
+    """
+    if not (keys := [get_advert_version_key(pk) for pk in set(pks)]):
+        return
+
+    def bump():
+        cache.set_many({key: uuid4().hex for key in keys}, ADVERT_VERSION_TIMEOUT)
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,97 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Func, IntegerField, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Concat, Substr
+
+from catalogs.models.models import Category
+
+CATEGORY_TREE_VERSION_KEY = 'catalogs:category-tree:version'
+CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_category_children_index(queryset: QuerySet[Category] | None = None) -> dict[int | None, list[Category]]:
+    """
+    Loads categories in one query and groups them by parent id.
+
+    Root categories are stored under the `None` key. Categories keep the order of the queryset, by id by default.
+    """
+    if queryset is None:
+        queryset = Category.objects.order_by('pk')
+
+    children: dict[int | None, list[Category]] = {}
+    for category in queryset:
+        children.setdefault(category.parent_id, []).append(category)
+    return children
+
+
+def get_descendant_count_subquery() -> Subquery:
+    """Returns a subquery counting the nested sub categories of the outer category by the path prefix."""
+    descendants = (
+        Category.objects.filter(path__startswith=OuterRef('path'))
+        .exclude(pk=OuterRef('pk'))
+        .order_by()
+        .annotate(count=Func('pk', function='COUNT'))
+        .values('count')
+    )
+    return Subquery(descendants, output_field=IntegerField())
+
+
+def update_category_path(category: Category) -> None:
+    """
+    Stores the materialized path of a saved category.
+
+    When the category is moved to another parent, paths of all its descendants are rebased in one UPDATE.
+    """
+    paths = dict(Category.objects.filter(pk__in=[category.pk, category.parent_id]).values_list('pk', 'path'))
+    old_path, new_path = paths.get(category.pk, ''), category.build_path(paths.get(category.parent_id))
+
+    if old_path != new_path:
+        with transaction.atomic():
+            Category.objects.filter(pk=category.pk).update(path=new_path)
+            if old_path:
+                Category.objects.filter(path__startswith=old_path).exclude(pk=category.pk).update(
+                    path=Concat(Value(new_path), Substr('path', len(old_path) + 1))
+                )
+    category.path = new_path
+
+
+def detach_category_descendants(category: Category) -> None:
+    """
+    Rebases paths of descendants of a deleted category, whose children become root categories.
+
+    Descendants are found by the id segment rather than by the path prefix, so deleting several nested categories at
+    once leaves correct paths regardless of the deletion order.
+    """
+    segment = f'{Category.PATH_SEPARATOR}{category.pk}{Category.PATH_SEPARATOR}'
+    descendants = list(Category.objects.filter(path__contains=segment).only('pk', 'path'))
+    for descendant in descendants:
+        descendant.path = Category.PATH_SEPARATOR + descendant.path.split(segment, 1)[1]
+    Category.objects.bulk_update(descendants, ['path'])
+
+
+def get_category_tree_version() -> str:
+    """Returns the current version of the category tree, shared by all processes through the cache."""
+    version = cache.get(CATEGORY_TREE_VERSION_KEY)
+    if version is None:
+        cache.add(CATEGORY_TREE_VERSION_KEY, uuid4().hex, timeout=None)
+        version = cache.get(CATEGORY_TREE_VERSION_KEY)
+    return version
+
+
+def bump_category_tree_version() -> None:
+    """
+    Invalidates every cached response built from the category tree.
+
+    The version is bumped once more after the transaction is committed, so responses cached by concurrent requests
+    from the not yet committed state are not served.
+    """
+    cache.set(CATEGORY_TREE_VERSION_KEY, uuid4().hex, timeout=None)
+    transaction.on_commit(lambda: cache.set(CATEGORY_TREE_VERSION_KEY, uuid4().hex, timeout=None))
+
+
+def get_category_tree_cache_key(version: str, *parts: str) -> str:
+    digest = md5(':'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'catalogs:category-tree:{version}:{digest}'
@@ -0,0 +1,118 @@
+from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from PIL import Image as PILImage
+from django.db.models import Count, F, IntegerField, JSONField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, JSONObject
+from django.utils import timezone
+
+from catalogs.models.models import Advert, Image
+from catalogs.services.advert_cache import invalidate_cached_adverts
+from catalogs.services.variant_rendering import get_oriented_size
+
+IMAGE_METADATA_FIELDS = ('width', 'height', 'size', 'dominant_color', 'blurhash')
+
+_pending_advert_ids: ContextVar[set[int] | None] = ContextVar('pending_advert_ids', default=None)
+
+
+def get_main_image_subquery(field: str = 'file') -> Subquery:
+    """Returns a subquery selecting the field of the main image of the outer advert, the file by default."""
+    images = Image.objects.filter(advert=OuterRef('pk'), type=Image.Type.MAIN).order_by('pk')
+    return Subquery(images.values(field)[:1])
+
+
+def get_image_metadata_expression() -> JSONObject:
+    """Returns an expression that builds the metadata object of the image, like `{"width": 800, ...}`."""
+    return JSONObject(**{field: F(field) for field in IMAGE_METADATA_FIELDS})
+
+
+def get_main_image_metadata_subquery() -> Subquery:
+    """Returns a subquery selecting the metadata object of the main image of the outer advert."""
+    images = Image.objects.filter(advert=OuterRef('pk'), type=Image.Type.MAIN).order_by('pk')
+    return Subquery(images.values(metadata=get_image_metadata_expression())[:1], output_field=JSONField())
+
+
+def fill_image_file_metadata(image: Image) -> None:
+    """
+    Sets the dimensions and the byte size of the newly assigned file of the image.
+
+    Uploads checked by `ImageUploadHandler` already know their dimensions, other files are parsed only until the
+    image header is read. Like in variants, the dimensions follow the EXIF orientation. The dominant color and the
+    blurhash need the decoded image, so they are computed later together with the variants.
+    """
+    file = image.file.file
+    image.width, image.height = getattr(file, 'image_size', None) or read_image_size(file)
+    image.size = image.file.size
+    image.dominant_color = image.blurhash = None
+
+
+def read_image_size(file) -> tuple[int | None, int | None]:
+    """Reads the oriented dimensions from the image header, or returns `(None, None)` if the file isn't an image."""
+    position = file.tell()
+    try:
+        file.seek(0)
+        with PILImage.open(file) as source:
+            return get_oriented_size(source)
+    except Exception:
+        return None, None
+    finally:
+        file.seek(position)
+
+
+def get_extra_image_count_subquery() -> Coalesce:
+    """Returns a subquery counting the extra images of the outer advert."""
+    images = (
+        Image.objects.filter(advert=OuterRef('pk'), type=Image.Type.EXTRA)
+        .order_by()
+        .values('advert')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(images, output_field=IntegerField()), Value(0))
+
+
+def sync_advert_images(advert_ids: Iterable[int]) -> int:
+    """
+    Refreshes the denormalized `main_image`, `main_image_variants`, `main_image_metadata` and `extra_image_count`
+    columns of the adverts in one UPDATE.
+
+    `updated_at` is bumped too, as it validates conditional requests of adverts whose images are changed, and cached
+    adverts are invalidated.
+
+    Returns the number of updated adverts.
+    """
+    advert_ids = list(advert_ids)
+    invalidate_cached_adverts(advert_ids)
+    return Advert.objects.filter(pk__in=advert_ids).update(
+        main_image=get_main_image_subquery(),
+        main_image_variants=get_main_image_subquery('variants'),
+        main_image_metadata=get_main_image_metadata_subquery(),
+        extra_image_count=get_extra_image_count_subquery(),
+        updated_at=timezone.now(),
+    )
+
+
+def request_advert_images_sync(advert_id: int) -> None:
+    """Syncs the advert image columns now or at the end of the surrounding `batch_advert_images_sync` block."""
+    if (pending := _pending_advert_ids.get()) is not None:
+        pending.add(advert_id)
+    else:
+        sync_advert_images([advert_id])
+
+
+@contextmanager
+def batch_advert_images_sync():
+    """Collects image sync requests inside the block and runs them as a single UPDATE at the end."""
+    if _pending_advert_ids.get() is not None:
+        yield
+        return
+
+    pending: set[int] = set()
+    token = _pending_advert_ids.set(pending)
+    try:
+        yield
+    finally:
+        _pending_advert_ids.reset(token)
+    if pending:
+        sync_advert_images(pending)
@@ -0,0 +1,97 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from catalogs.models.models import Advert
+
+SEARCH_CONFIG = 'simple'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+ADVERT_TABLE = Advert._meta.db_table
+SEARCH_FTS_TABLE = f'{ADVERT_TABLE}_fts'
+
+_word_pattern = re.compile(r'\w+')
+
+# SQLite drops triggers together with the table whenever a migration remakes `catalogs_advert`,
+# so they are (re)installed idempotently after every migrate run.
+SQLITE_SEARCH_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_ai AFTER INSERT ON {ADVERT_TABLE} BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, name, descr) VALUES (new.id, new.name, new.descr);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_ad AFTER DELETE ON {ADVERT_TABLE} BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, name, descr)
+        VALUES ('delete', old.id, old.name, old.descr);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_FTS_TABLE}_au AFTER UPDATE OF name, descr ON {ADVERT_TABLE} BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, name, descr)
+        VALUES ('delete', old.id, old.name, old.descr);
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, name, descr) VALUES (new.id, new.name, new.descr);
+    END
+    """,
+)
+
+
+def install_search_triggers(using: str = 'default') -> None:
+    """Installs the triggers that keep the SQLite FTS5 table in sync with adverts."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or SEARCH_FTS_TABLE not in connection.introspection.table_names():
+        return
+
+    with connection.cursor() as cursor:
+        for sql in SQLITE_SEARCH_TRIGGERS:
+            cursor.execute(sql)
+
+
+def get_search_terms(query: str) -> list[str]:
+    return _word_pattern.findall(query.lower())
+
+
+def search_adverts(queryset: QuerySet[Advert], query: str) -> QuerySet[Advert]:
+    """
+    Filters adverts by the words of the query over `name` and `descr` and orders them by relevance.
+
+    Every word is matched as a prefix. Postgres uses the stored `tsvector` column with its GIN index,
+    SQLite uses the FTS5 table, and other databases fall back to `icontains` lookups.
+    """
+    if not (terms := get_search_terms(query)):
+        return queryset.none()
+
+    match connections[queryset.db].vendor:
+        case 'postgresql':
+            return _search_postgresql(queryset, terms)
+        case 'sqlite':
+            return _search_sqlite(queryset, terms)
+        case _:
+            return _search_fallback(queryset, terms)
+
+
+def _search_postgresql(queryset: QuerySet[Advert], terms: list[str]) -> QuerySet[Advert]:
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    column = f'{ADVERT_TABLE}.{SEARCH_VECTOR_COLUMN}'
+    match = RawSQL(f'{column} @@ to_tsquery(%s, %s)', (SEARCH_CONFIG, tsquery), output_field=BooleanField())
+    rank = RawSQL(f'ts_rank({column}, to_tsquery(%s, %s))', (SEARCH_CONFIG, tsquery), output_field=FloatField())
+    return queryset.filter(match).annotate(rank=rank).order_by('-rank', '-created_at', '-id')
+
+
+def _search_sqlite(queryset: QuerySet[Advert], terms: list[str]) -> QuerySet[Advert]:
+    fts_query = ' '.join(f'"{term}"*' for term in terms)
+    # Joining the FTS5 table scans the index once; bm25() is lower for better matches and the name
+    # column weighs twice as much as the description.
+    return queryset.extra(
+        select={'rank': f'-bm25({SEARCH_FTS_TABLE}, 2.0, 1.0)'},
+        tables=[SEARCH_FTS_TABLE],
+        where=[f'{SEARCH_FTS_TABLE}.rowid = {ADVERT_TABLE}.id', f'{SEARCH_FTS_TABLE} MATCH %s'],
+        params=[fts_query],
+    ).order_by('-rank', '-created_at', '-id')
+
+
+def _search_fallback(queryset: QuerySet[Advert], terms: list[str]) -> QuerySet[Advert]:
+    for term in terms:
+        queryset = queryset.filter(Q(name__icontains=term) | Q(descr__icontains=term))
+    return queryset
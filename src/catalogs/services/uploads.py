@@ -0,0 +1,95 @@
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from PIL import Image as PILImage
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.db.models import QuerySet
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+
+from catalogs.models.models import Image, UploadSession
+
+UPLOAD_CHUNK_SIZE = 64 * 2**10
+
+
+def get_upload_root() -> Path:
+    return Path(settings.UPLOAD_SESSION_ROOT)
+
+
+def get_upload_path(session: UploadSession) -> Path:
+    return get_upload_root() / f'{session.pk}.part'
+
+
+def write_upload_range(session: UploadSession, start: int, stream, length: int) -> int | None:
+    """
+    Writes `length` bytes of the stream into the session file at `start` and returns the new offset.
+
+    The stream is copied in chunks, and bytes received before the client disconnects are kept, so the upload is
+    resumed from them. None is returned when another request moved the offset in the meantime.
+    """
+    path = get_upload_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600), 'wb') as file:
+        file.seek(start)
+        while written < length and (chunk := stream.read(min(UPLOAD_CHUNK_SIZE, length - written))):
+            file.write(chunk)
+            written += len(chunk)
+
+    offset = start + written
+    updated = UploadSession.objects.filter(pk=session.pk, offset=start).update(offset=offset, updated_at=timezone.now())
+    if not updated:
+        return None
+
+    session.offset = offset
+    return offset
+
+
+def finalize_upload(session: UploadSession) -> Image:
+    """
+    Creates an image of the advert from the completely received file and deletes the session.
+
+    The image is checked by the same rules as other images of the advert, and by the size and pixel limits of
+    `ImageUploadHandler`, which are checked before the image data is read.
+    """
+    path = get_upload_path(session)
+    if path.stat().st_size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        raise ValidationError(
+            f'Uploaded file is larger than {filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}.',
+            'file_too_large',
+        )
+
+    try:
+        with PILImage.open(path) as image:
+            width, height = image.size
+            if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+                raise ValidationError(
+                    f'Uploaded image has {width}x{height} pixels, '
+                    f'more than {settings.IMAGE_UPLOAD_MAX_PIXELS} pixels are not allowed.',
+                    'too_many_pixels',
+                )
+            image.verify()
+    except ValidationError:
+        raise
+    except Exception:
+        raise ValidationError('Uploaded file is not a valid image.', 'invalid_image')
+
+    with transaction.atomic():
+        image = Image(advert=session.advert, type=session.type)
+        image.full_clean(exclude=['file'])
+        with path.open('rb') as file:
+            # The assigned file is stored on save(), after its metadata is read by the pre_save signal.
+            image.file = File(file, name=session.file_name)
+            image.save()
+        session.delete()
+    return image
+
+
+def get_abandoned_upload_sessions(now=None) -> QuerySet[UploadSession]:
+    now = now or timezone.now()
+    return UploadSession.objects.filter(updated_at__lt=now - timedelta(seconds=settings.UPLOAD_SESSION_MAX_AGE))
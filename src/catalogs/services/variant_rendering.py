@@ -0,0 +1,182 @@
+"""
+Rendering of image variants.
+
+The module is imported by worker processes of the variant pool, so it depends on Pillow only and must not import
+Django or the project code.
+"""
+
+import math
+from io import BytesIO
+
+from PIL import ExifTags, Image as PILImage, ImageOps
+
+# Variant name to the maximal width and height. Smaller originals are never upscaled.
+VARIANT_SIZES = {
+    'thumbnail': 160,
+    'card': 480,
+    'full': 1280,
+}
+
+# Variant format to the file extension and the Pillow save options.
+VARIANT_FORMATS = {
+    'webp': ('webp', dict(format='WEBP', quality=80, method=4)),
+    'jpeg': ('jpg', dict(format='JPEG', quality=85, optimize=True, progressive=True)),
+}
+
+BACKGROUND_COLOR = (255, 255, 255)
+
+# Number of horizontal and vertical blurhash components and the size of the image they are computed from.
+BLURHASH_COMPONENTS = (4, 3)
+BLURHASH_IMAGE_SIZE = 32
+BASE83_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+DOMINANT_COLOR_IMAGE_SIZE = 64
+DOMINANT_COLOR_PALETTE_SIZE = 8
+# EXIF orientations that rotate the image by 90 or 270 degrees, so its width and height are swapped when displayed.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def render_image(content: bytes) -> tuple[dict[str, dict[str, bytes]], dict[str, int | str]]:
+    """
+    Renders every variant of the image in every format and describes the image.
+
+    Returns the encoded images keyed by the variant name and then by the format, like `{'card': {'webp': b'...'}}`,
+    and the metadata returned by `describe_image()`.
+    """
+    image = open_image(content)
+
+    rendered: dict[str, dict[str, bytes]] = {}
+    for name, size in VARIANT_SIZES.items():
+        variant = image.copy()
+        variant.thumbnail((size, size), PILImage.Resampling.LANCZOS)
+        rendered[name] = {fmt: encode(variant, options) for fmt, (_, options) in VARIANT_FORMATS.items()}
+    return rendered, get_metadata(image)
+
+
+def render_variants(content: bytes) -> dict[str, dict[str, bytes]]:
+    return render_image(content)[0]
+
+
+def describe_image(content: bytes) -> dict[str, int | str]:
+    """
+    Returns the metadata of the image without rendering variants.
+
+    The dimensions are taken after the EXIF orientation is applied, like `{'width': 800, 'height': 600,
+    'dominant_color': '#aabbcc', 'blurhash': '...'}`.
+    """
+    return get_metadata(open_image(content))
+
+
+def get_oriented_size(image: PILImage.Image) -> tuple[int, int]:
+    """
+    Returns the dimensions of the opened image after its EXIF orientation is applied.
+
+    Only the header is read, so the dimensions match `describe_image()` without decoding the image.
+    """
+    width, height = image.size
+    if image.getexif().get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def open_image(content: bytes) -> PILImage.Image:
+    with PILImage.open(BytesIO(content)) as source:
+        return flatten(ImageOps.exif_transpose(source))
+
+
+def get_metadata(image: PILImage.Image) -> dict[str, int | str]:
+    return dict(
+        width=image.width,
+        height=image.height,
+        dominant_color=get_dominant_color(image),
+        blurhash=get_blurhash(image),
+    )
+
+
+def get_dominant_color(image: PILImage.Image) -> str:
+    """Returns the most common color of the reduced image palette as a hex string, like `#aabbcc`."""
+    small = image.copy()
+    small.thumbnail((DOMINANT_COLOR_IMAGE_SIZE, DOMINANT_COLOR_IMAGE_SIZE))
+    palette_image = small.quantize(DOMINANT_COLOR_PALETTE_SIZE, method=PILImage.Quantize.MEDIANCUT)
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette_image.getpalette()[index * 3 : index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def get_blurhash(image: PILImage.Image) -> str:
+    """
+    Encodes the image into a BlurHash string, a compact placeholder that clients decode into a blurred image.
+
+    The image is scaled down first, as the hash keeps only a few low frequency components anyway.
+    See https://github.com/woltapp/blurhash for the algorithm.
+    """
+    small = image.resize((BLURHASH_IMAGE_SIZE, BLURHASH_IMAGE_SIZE), PILImage.Resampling.BILINEAR)
+    width, height = small.size
+    pixels = [tuple(srgb_to_linear(value) for value in pixel) for pixel in small.getdata()]
+    x_components, y_components = BLURHASH_COMPONENTS
+
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / width) for x in range(width)]
+            normalisation = 1 if i == j == 0 else 2
+            red = green = blue = 0.0
+            for index, (pixel_red, pixel_green, pixel_blue) in enumerate(pixels):
+                basis = cos_x[index % width] * cos_y[index // width]
+                red += basis * pixel_red
+                green += basis * pixel_green
+                blue += basis * pixel_blue
+            scale = normalisation / (width * height)
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+    blurhash = encode_base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_maximum = max(
+            0, min(82, math.floor(max(abs(value) for factor in ac for value in factor) * 166 - 0.5))
+        )
+        maximum = (quantised_maximum + 1) / 166
+    else:
+        quantised_maximum, maximum = 0, 1
+    blurhash += encode_base83(quantised_maximum, 1)
+    blurhash += encode_base83(sum(linear_to_srgb(value) << shift for value, shift in zip(dc, (16, 8, 0))), 4)
+    for factor in ac:
+        red, green, blue = (max(0, min(18, math.floor(sign_pow(value / maximum, 0.5) * 9 + 9.5))) for value in factor)
+        blurhash += encode_base83(red * 19 * 19 + green * 19 + blue, 2)
+    return blurhash
+
+
+def srgb_to_linear(value: int) -> float:
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(value: float) -> int:
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def encode_base83(value: int, length: int) -> str:
+    return ''.join(BASE83_ALPHABET[value // 83 ** (length - position - 1) % 83] for position in range(length))
+
+
+def flatten(image: PILImage.Image) -> PILImage.Image:
+    """Converts the image to RGB, placing transparent images on a white background as JPEG has no alpha channel."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = PILImage.new('RGB', image.size, BACKGROUND_COLOR)
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def encode(image: PILImage.Image, options: dict) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
@@ -0,0 +1,115 @@
+import logging
+import posixpath
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from threading import Lock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from catalogs.models.models import Image
+from catalogs.services.images import sync_advert_images
+from catalogs.services.variant_rendering import VARIANT_FORMATS, render_image
+from utils.services.jobs import enqueue
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def get_variant_executor() -> ProcessPoolExecutor:
+    """Returns the pool of spawned processes that render variants, creating it on the first use in the process."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS, mp_context=get_context('spawn'))
+        return _executor
+
+
+def request_image_variants(image_ids: Iterable[int]) -> None:
+    """Enqueues a job that generates variants of the images once the current transaction is committed."""
+    if image_ids := list(image_ids):
+        enqueue('catalogs.generate_image_variants', image_ids=image_ids)
+
+
+def request_image_variants_deletion(variants: dict[str, dict[str, str]] | None) -> None:
+    """Enqueues a job that deletes files of the image variants once the current transaction is committed."""
+    if variants:
+        enqueue('catalogs.delete_image_variants', variants=variants)
+
+
+def generate_image_variants(image_ids: Iterable[int]) -> list[int]:
+    """
+    Renders and stores variants and metadata of the images and returns IDs of images that failed.
+
+    Pillow work runs in a pool of `IMAGE_VARIANT_WORKERS` spawned processes, or in place when it is set to 0.
+    """
+    images = list(Image.objects.filter(pk__in=list(image_ids)).only('pk', 'advert_id', 'file').order_by('pk'))
+    contents = []
+    for image in images:
+        with image.file.open('rb') as file:
+            contents.append(file.read())
+
+    if settings.IMAGE_VARIANT_WORKERS:
+        executor = get_variant_executor()
+        renders = [executor.submit(render_image, content).result for content in contents]
+    else:
+        renders = [partial(render_image, content) for content in contents]
+
+    failed = []
+    for image, content, render in zip(images, contents, renders):
+        try:
+            rendered, metadata = render()
+            store_image_variants(image, rendered, dict(metadata, size=len(content)))
+        except Exception:
+            logger.exception('Failed to generate variants of image %s.', image.pk)
+            failed.append(image.pk)
+    return failed
+
+
+def store_image_variants(
+    image: Image, rendered: dict[str, dict[str, bytes]], metadata: dict | None = None
+) -> dict[str, dict[str, str]]:
+    """
+    Saves rendered variants next to the original and stores their paths, and the image metadata if given, on the image.
+
+    Variants are discarded when the image was deleted or its file was replaced while they were rendered.
+    """
+    # Variants belong to a single image, so they are kept in the default storage even when images share a file.
+    storage = default_storage
+    directory, filename = posixpath.split(image.file.name)
+    stem = posixpath.splitext(filename)[0]
+
+    variants = {
+        name: {
+            fmt: storage.save(
+                posixpath.join(directory, 'variants', f'{stem}_{name}.{VARIANT_FORMATS[fmt][0]}'),
+                ContentFile(content),
+            )
+            for fmt, content in formats.items()
+        }
+        for name, formats in rendered.items()
+    }
+
+    images = Image.objects.filter(pk=image.pk, file=image.file.name)
+    previous = images.values_list('variants', flat=True).first()
+    updated = images.update(variants=variants, **(metadata or {}))
+
+    if not updated:
+        delete_image_variants(variants)
+        return {}
+
+    delete_image_variants(previous)
+    sync_advert_images([image.advert_id])
+    return variants
+
+
+def delete_image_variants(variants: dict[str, dict[str, str]] | None) -> None:
+    """Deletes files of the image variants from the storage."""
+    for formats in (variants or {}).values():
+        for path in formats.values():
+            default_storage.delete(path)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import time
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from utils.services.media import sign_media_url
+
+
+class ImageStorage(FileSystemStorage):
+    """
+    Storage of original advert images that names files by the SHA-256 hash of their content.
+
+    Files are stored as `images/ab/cd/<hash>.<ext>`, so the same bytes are stored once however many images have them.
+    A file is deleted only when no image refers to it anymore.
+    """
+
+    prefix = 'images'
+    # Seconds after a file was saved, during which it isn't deleted. The image that refers to it may be not committed
+    # yet, so the file could look unreferenced.
+    delete_grace_period = 10 * 60
+    hash_chunk_size = 64 * 2**10
+
+    def is_content_name(self, name: str) -> bool:
+        """Checks whether the file is named by its content hash, unlike files stored before this storage was used."""
+        return re.fullmatch(rf'{self.prefix}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.\w+)?', name) is not None
+
+    def get_content_name(self, name: str, content: File) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks(self.hash_chunk_size):
+            digest.update(chunk)
+        content.seek(0)
+
+        digest = digest.hexdigest()
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(self.prefix, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            # The file may be deleted by the last image that refers to it before a new reference is committed.
+            os.utime(self.path(name))
+            return name
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        # The content is written to a temporary file that atomically replaces the target, so concurrent saves of the
+        # same bytes never see a partial file and don't conflict.
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        return name
+
+    def delete(self, name):
+        if self.count_references(name) or self.is_recently_saved(name):
+            return
+        super().delete(name)
+
+    def is_recently_saved(self, name: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(self.path(name)) < self.delete_grace_period
+        except FileNotFoundError:
+            return False
+
+    def url(self, name):
+        return sign_media_url(name)
+
+    def count_references(self, name: str) -> int:
+        from catalogs.models.models import Image
+
+        return Image.objects.filter(file=name).count()
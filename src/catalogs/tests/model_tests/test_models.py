@@ -1,12 +1,14 @@
-from datetime import datetime
+import hashlib
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 from catalogs.models import Category
 from catalogs.models.models import Advert, Image
 from utils.models.mixins import CreatedUpdatedMixin
+from utils.services.media import sign_media_url
 from utils.tests.cases import BaseTestCase, MediaTestCase
 
 User = get_user_model()
@@ -29,11 +31,22 @@ class ImageModelTest(MediaTestCase):
         self.assertEqual(str(image), f'{self.advert.name} {image.type} image')
 
     def test_model_save_file_by_expected_path(self):
+        content = self.file.read()
         image = Image.objects.create(**self.data)
-        date = datetime.now()
-        month = f'0{date.month}' if date.month < 10 else str(date.month)
-        day = f'0{date.day}' if date.day < 10 else str(date.day)
-        self.assertEqual(image.file.url, f'/media/images/{date.year}/{month}/{day}/{self.file.name}')
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(image.file.name, f'images/{digest[:2]}/{digest[2:4]}/{digest}.png')
+        self.assertEqual(image.file.url, sign_media_url(image.file.name))
+
+    def test_model_stores_same_content_once(self):
+        content = self.file.read()
+        image = Image.objects.create(**self.data)
+        other_advert = self.create_test_advert(owner=self.owner, category=self.category)
+
+        other_image = Image.objects.create(
+            advert=other_advert, file=SimpleUploadedFile('copy.png', content), type=Image.Type.MAIN
+        )
+
+        self.assertEqual(other_image.file.name, image.file.name)
 
     def test_model_doesnt_save_main_image_if_advert_already_has_main_image(self):
         Image.objects.create(**self.data)
@@ -115,3 +128,68 @@ class CategoryModelTest(BaseTestCase):
 
         self.assertFalse(parent.is_child)
         self.assertTrue(child.is_child)
+
+    def test_path_is_built_on_create(self):
+        parent = self.model.objects.create(name='parent')
+        child = self.model.objects.create(name='child', parent=parent)
+
+        self.assertEqual(parent.path, f'/{parent.pk}/')
+        self.assertEqual(child.path, f'/{parent.pk}/{child.pk}/')
+        self.assertEqual(self.model.objects.get(pk=child.pk).path, child.path)
+
+    def test_path_of_descendants_is_rebased_on_reparent(self):
+        food = self.model.objects.create(name='food')
+        vegetables = self.model.objects.create(name='vegetables', parent=food)
+        tomato = self.model.objects.create(name='tomato', parent=vegetables)
+        home = self.model.objects.create(name='home')
+
+        vegetables.parent = home
+        vegetables.save()
+
+        tomato.refresh_from_db()
+        self.assertEqual(vegetables.path, f'/{home.pk}/{vegetables.pk}/')
+        self.assertEqual(tomato.path, f'/{home.pk}/{vegetables.pk}/{tomato.pk}/')
+
+    def test_path_of_descendants_is_rebased_on_delete(self):
+        food = self.model.objects.create(name='food')
+        vegetables = self.model.objects.create(name='vegetables', parent=food)
+        tomato = self.model.objects.create(name='tomato', parent=vegetables)
+        cherry = self.model.objects.create(name='cherry tomato', parent=tomato)
+
+        self.model.objects.filter(pk__in=[food.pk, tomato.pk]).delete()
+
+        vegetables.refresh_from_db()
+        cherry.refresh_from_db()
+        self.assertIsNone(vegetables.parent)
+        self.assertEqual(vegetables.path, f'/{vegetables.pk}/')
+        self.assertIsNone(cherry.parent)
+        self.assertEqual(cherry.path, f'/{cherry.pk}/')
+
+    def test_get_descendants(self):
+        food = self.model.objects.create(name='food')
+        vegetables = self.model.objects.create(name='vegetables', parent=food)
+        tomato = self.model.objects.create(name='tomato', parent=vegetables)
+        self.model.objects.create(name='home')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(set(food.get_descendants()), {vegetables, tomato})
+        self.assertEqual(set(food.get_descendants(include_self=True)), {food, vegetables, tomato})
+        self.assertEqual(list(tomato.get_descendants()), [])
+
+    def test_get_ancestors(self):
+        food = self.model.objects.create(name='food')
+        vegetables = self.model.objects.create(name='vegetables', parent=food)
+        tomato = self.model.objects.create(name='tomato', parent=vegetables)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(list(tomato.get_ancestors()), [food, vegetables])
+        self.assertEqual(list(tomato.get_ancestors(include_self=True)), [food, vegetables, tomato])
+        self.assertEqual(list(food.get_ancestors()), [])
+
+    def test_category_cannot_be_moved_into_its_descendant(self):
+        food = self.model.objects.create(name='food')
+        vegetables = self.model.objects.create(name='vegetables', parent=food)
+
+        food.parent = vegetables
+        with self.assertRaisesRegex(ValidationError, r'Category cannot be a sub category of itself'):
+            food.full_clean()
@@ -1,4 +1,6 @@
-from catalogs.models import Advert
+from catalogs.models import Advert, Image
+from catalogs.models.proxies import ExtraImage, MainImage
+from catalogs.services.images import batch_advert_images_sync
 from utils.models import Address
 from utils.tests.cases import BaseTestCase
 
@@ -32,3 +34,53 @@ class DeleteAdvertAddressSignalTest(BaseTestCase):
 
         self.assertEqual(self.advert_model.objects.count(), 0)
         self.assertEqual(self.address_model.objects.count(), 0)
+
+
+class SyncAdvertImagesSignalTest(BaseTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+
+    def assert_advert_images(self, main_image, extra_image_count):
+        self.advert.refresh_from_db()
+        self.assertEqual(self.advert.main_image, main_image)
+        self.assertEqual(self.advert.extra_image_count, extra_image_count)
+
+    def test_signal_syncs_advert_on_image_creation(self):
+        Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+        Image.objects.create(advert=self.advert, file='images/extra.png', type=Image.Type.EXTRA)
+
+        self.assert_advert_images('images/main.png', 1)
+
+    def test_signal_syncs_advert_on_proxy_image_creation(self):
+        MainImage.objects.create(advert=self.advert, file='images/main.png')
+        ExtraImage.objects.create(advert=self.advert, file='images/extra_1.png')
+        ExtraImage.objects.create(advert=self.advert, file='images/extra_2.png')
+
+        self.assert_advert_images('images/main.png', 2)
+
+    def test_signal_syncs_advert_on_image_deletion(self):
+        main_image = Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+        extra_image = ExtraImage.objects.create(advert=self.advert, file='images/extra.png')
+
+        main_image.delete()
+        extra_image.delete()
+
+        self.assert_advert_images(None, 0)
+
+    def test_signal_syncs_advert_on_image_retyping(self):
+        image = Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+
+        image.type = Image.Type.EXTRA
+        image.save()
+
+        self.assert_advert_images(None, 1)
+
+    def test_signal_syncs_advert_once_in_batch(self):
+        # Three image inserts with their variant jobs, and a single advert sync.
+        with self.assertNumQueries(7), batch_advert_images_sync():
+            for i in range(3):
+                Image.objects.create(advert=self.advert, file=f'images/extra_{i}.png', type=Image.Type.EXTRA)
+
+        self.assert_advert_images(None, 3)
@@ -7,7 +7,9 @@ from catalogs.models import Category, Advert, Image
 from catalogs.serializers import (
     CategoryListSerializer,
     CategorySerializer,
+    CategoryValuesSerializer,
     AdvertListSerializer,
+    AdvertListValuesSerializer,
     AdvertRetrieveSerializer,
     AdvertCreateSerializer,
     AdvertUpdateSerializer,
@@ -15,6 +17,7 @@ from catalogs.serializers import (
     ImageMultipleDeleteSerializer,
 )
 from utils.models import Address
+from utils.services.media import sign_media_url
 from utils.tests.cases import BaseTestCase, MediaTestCase
 from utils.serializers.mixins import AddressCreateUpdateMixin
 
@@ -27,7 +30,9 @@ class ImageMultipleDeleteSerializerTest(MediaTestCase):
         self.category = self.create_test_category()
         self.advert = self.create_test_advert(self.owner, self.category)
         self.main_image = self.create_test_image(self.advert)
-        self.extra_image = self.create_test_image(self.advert, type=Image.Type.EXTRA)
+        self.extra_image = self.create_test_image(
+            self.advert, self.get_image_simple_uploaded_file('extra_image.png'), Image.Type.EXTRA
+        )
 
         self.data = dict(
             advert=self.advert.id,
@@ -91,8 +96,10 @@ class ImageMultipleCreateSerializerTest(MediaTestCase):
         main_image = Image.objects.get(advert=self.advert, type=Image.Type.MAIN)
         extra_image = Image.objects.get(advert=self.advert, type=Image.Type.EXTRA)
 
-        self.assertIn(self.main_file.name, main_image.file.name)
-        self.assertIn(self.extra_file.name, extra_image.file.name)
+        self.main_file.seek(0)
+        self.extra_file.seek(0)
+        self.assertEqual(main_image.file.read(), self.main_file.read())
+        self.assertEqual(extra_image.file.read(), self.extra_file.read())
 
     def test_serializer_cancels_all_created_images_and_doesnt_create_other_images_if_error_is_raised(self):
         self.data['files'].append(self.main_file)
@@ -109,6 +116,18 @@ class ImageMultipleCreateSerializerTest(MediaTestCase):
 
         self.assertEqual(Image.objects.count(), 0)
 
+    def test_serializer_doesnt_create_main_image_if_advert_already_has_main_image(self):
+        self.create_test_image(self.advert, self.get_image_simple_uploaded_file('main.png'))
+
+        with self.assertRaisesRegex(DjangoValidationError, 'Advert already has main image.'):
+            self.create_serializer(
+                self.serializer_class,
+                data=self.data,
+                save=True,
+            )
+
+        self.assertEqual(Image.objects.count(), 1)
+
     def test_serializer_raises_error_if_files_and_types_count_mismatch(self):
         self.data['types'] = [self.data['types'][0]]
         with self.assertRaisesRegex(DRFValidationError, 'File quantity should match type quantity.'):
@@ -356,9 +375,17 @@ class AdvertRetrieveSerializerTest(MediaTestCase, BaseTestCase):
             courier=True,
             address={},
             main_image=None,
+            main_image_full=None,
+            main_image_metadata=None,
             extra_images=[],
+            extra_images_full=[],
+            extra_images_metadata=[],
         )
 
+    @staticmethod
+    def get_expected_metadata(image: Image) -> dict:
+        return dict(width=100, height=100, size=image.file.size, dominant_color=None, blurhash=None)
+
     def test_serializer_returns_expected_data(self):
         self.assert_serializer_output_data(
             self.serializer_class,
@@ -385,7 +412,8 @@ class AdvertRetrieveSerializerTest(MediaTestCase, BaseTestCase):
     def test_serializer_returns_expected_data_with_main_image(self):
         main_image = self.create_test_image(self.advert)
         self.advert.refresh_from_db()
-        self.output_data['main_image'] = str(main_image.file)
+        self.output_data['main_image'] = sign_media_url(main_image.file.name)
+        self.output_data['main_image_metadata'] = self.get_expected_metadata(main_image)
         self.assert_serializer_output_data(
             self.serializer_class,
             instance=self.advert,
@@ -395,7 +423,9 @@ class AdvertRetrieveSerializerTest(MediaTestCase, BaseTestCase):
     def test_serializer_returns_expected_data_with_extra_images(self):
         extra_image = self.create_test_image(self.advert, type=Image.Type.EXTRA)
         self.advert.refresh_from_db()
-        self.output_data['extra_images'] = [str(extra_image.file)]
+        self.output_data['extra_images'] = [sign_media_url(extra_image.file.name)]
+        self.output_data['extra_images_full'] = [None]
+        self.output_data['extra_images_metadata'] = [self.get_expected_metadata(extra_image)]
         self.assert_serializer_output_data(
             self.serializer_class,
             instance=self.advert,
@@ -422,6 +452,8 @@ class AdvertListSerializerTest(MediaTestCase, BaseTestCase):
                 category=self.advert.category.id,
                 price=str(self.advert.price),
                 main_image=None,
+                main_image_card=None,
+                main_image_metadata=None,
             ),
         )
 
@@ -436,11 +468,58 @@ class AdvertListSerializerTest(MediaTestCase, BaseTestCase):
                 name=self.advert.name,
                 category=self.advert.category.id,
                 price=str(self.advert.price),
-                main_image=str(main_image.file),
+                main_image=sign_media_url(main_image.file.name),
+                main_image_card=None,
+                main_image_metadata=dict(
+                    width=100, height=100, size=main_image.file.size, dominant_color=None, blurhash=None
+                ),
             ),
         )
 
 
+class AdvertListValuesSerializerTest(MediaTestCase, BaseTestCase):
+    serializer_class = AdvertListValuesSerializer
+    model = Advert
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.create_test_advert(self.owner, self.category, price='0.50')
+        advert = self.create_test_advert(self.owner, self.category, price='1234567890.00')
+        self.create_test_image(advert)
+        self.model.objects.filter(pk=advert.pk).update(
+            main_image_variants=dict(card=dict(webp='variants/card.webp', jpeg='variants/card.jpg'))
+        )
+
+    def test_serializer_returns_same_data_as_drf_serializer(self):
+        queryset = self.model.objects.order_by('pk')
+        rows = self.serializer_class.get_values(queryset)
+
+        data = self.serializer_class.to_representation_many(rows)
+
+        self.assertEqual(data, AdvertListSerializer(queryset, many=True).data)
+        self.assertEqual(data[1]['main_image_card']['webp'], sign_media_url('variants/card.webp'))
+
+    def test_serializer_fetches_rows_by_single_query(self):
+        with self.assertNumQueries(1):
+            self.serializer_class.to_representation_many(self.serializer_class.get_values(self.model.objects.all()))
+
+
+class CategoryValuesSerializerTest(BaseTestCase):
+    serializer_class = CategoryValuesSerializer
+    model = Category
+
+    def test_serializer_returns_same_data_as_drf_serializer(self):
+        self.create_test_category(name='Category 1')
+        self.create_test_category(name='Category 2')
+        queryset = self.model.objects.filter(children=None)
+
+        self.assertEqual(
+            self.serializer_class.to_representation_many(self.serializer_class.get_values(queryset)),
+            CategorySerializer(queryset, many=True).data,
+        )
+
+
 class CategorySerializerTest(BaseTestCase):
     serializer_class = CategorySerializer
     model = Category
@@ -0,0 +1,100 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from catalogs.services.advert_cache import (
+    cache_advert,
+    get_advert_cache_key,
+    get_advert_version,
+    get_cached_advert,
+    invalidate_cached_adverts,
+)
+from utils.services.media import get_media_window_start
+from utils.tests.cases import BaseTestCase
+
+
+class AdvertCacheTest(BaseTestCase):
+    def test_cache_advert_stores_built_entry(self):
+        entry = cache_advert(1, get_advert_version(1), lambda: 'entry')
+
+        self.assertEqual(entry, 'entry')
+        self.assertEqual(get_cached_advert(1, get_advert_version(1)), 'entry')
+
+    def test_entries_are_kept_per_media_url_window(self):
+        cache_advert(1, get_advert_version(1), lambda: 'entry')
+
+        window_start = get_media_window_start() + 300
+        with mock.patch('catalogs.services.advert_cache.get_media_window_start', return_value=window_start):
+            self.assertIsNone(get_cached_advert(1, get_advert_version(1)))
+
+    @override_settings(MEDIA_URL_MAX_AGE=300)
+    def test_entry_expires_with_media_url_window(self):
+        with mock.patch.object(cache, 'set') as set_:
+            cache_advert(1, get_advert_version(1), lambda: 'entry')
+
+        timeout = set_.call_args.args[2]
+        self.assertTrue(0 < timeout <= 300)
+
+    def test_invalidate_invalidates_entries(self):
+        cache_advert(1, get_advert_version(1), lambda: 'first')
+        cache_advert(2, get_advert_version(2), lambda: 'second')
+
+        invalidate_cached_adverts([1])
+
+        self.assertIsNone(get_cached_advert(1, get_advert_version(1)))
+        self.assertEqual(get_cached_advert(2, get_advert_version(2)), 'second')
+
+    def test_invalidate_invalidates_entries_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_cached_adverts([1])
+            cache_advert(1, get_advert_version(1), lambda: 'cached from not committed state')
+
+        self.assertIsNone(get_cached_advert(1, get_advert_version(1)))
+
+    def test_entry_built_before_committed_change_isnt_served(self):
+        version = get_advert_version(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_cached_adverts([1])
+
+        # A request that loaded the advert before the change was committed caches its entry after the commit.
+        cache_advert(1, version, lambda: 'stale')
+
+        self.assertIsNone(get_cached_advert(1, get_advert_version(1)))
+
+    def test_lock_is_released_after_build(self):
+        cache_advert(1, get_advert_version(1), lambda: 'entry')
+
+        self.assertIsNone(cache.get(f'{get_advert_cache_key(1, get_advert_version(1))}:lock'))
+
+    def test_lock_is_released_after_failed_build(self):
+        def build():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            cache_advert(1, get_advert_version(1), build)
+
+        self.assertIsNone(cache.get(f'{get_advert_cache_key(1, get_advert_version(1))}:lock'))
+
+    def test_cold_entry_is_built_once_by_concurrent_workers(self):
+        builds = []
+
+        def build():
+            builds.append(threading.get_ident())
+            time.sleep(0.1)
+            return 'entry'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache_advert(1, get_advert_version(1), build)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(results, ['entry'] * 5)
@@ -0,0 +1,46 @@
+from catalogs.models import Advert
+from catalogs.services.search import search_adverts
+from utils.tests.cases import BaseTestCase
+
+
+class SearchAdvertsServiceTest(BaseTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.apples = self.create_test_advert(self.owner, self.category, name='Green apples', descr='Sweet and fresh')
+        self.juice = self.create_test_advert(self.owner, self.category, name='Juice', descr='Made of green apples')
+        self.tomatoes = self.create_test_advert(self.owner, self.category, name='Tomatoes', descr='Red tomatoes')
+
+    def search(self, query):
+        return list(search_adverts(Advert.objects.all(), query))
+
+    def test_service_finds_adverts_by_name_and_description(self):
+        self.assertEqual(self.search('apples'), [self.apples, self.juice])
+
+    def test_service_ranks_name_matches_above_description_matches(self):
+        self.assertEqual(self.search('green apples')[0], self.apples)
+
+    def test_service_matches_word_prefixes(self):
+        self.assertEqual(self.search('tomat'), [self.tomatoes])
+
+    def test_service_requires_all_words_to_match(self):
+        self.assertEqual(self.search('red apples'), [])
+
+    def test_service_returns_nothing_for_query_without_words(self):
+        self.assertEqual(self.search('!?'), [])
+
+    def test_service_finds_unicode_words(self):
+        advert = self.create_test_advert(self.owner, self.category, name='Свіжі яблука')
+        self.assertEqual(self.search('ЯБЛУК'), [advert])
+
+    def test_service_follows_advert_updates(self):
+        self.tomatoes.name = 'Cucumbers'
+        self.tomatoes.descr = None
+        self.tomatoes.save()
+
+        self.assertEqual(self.search('tomatoes'), [])
+        self.assertEqual(self.search('cucumbers'), [self.tomatoes])
+
+    def test_service_follows_advert_deletion(self):
+        self.apples.delete()
+        self.assertEqual(self.search('apples'), [self.juice])
@@ -0,0 +1,183 @@
+import io
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from PIL import Image as PILImage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from catalogs.models import Image
+from catalogs.services.variant_rendering import (
+    VARIANT_FORMATS,
+    VARIANT_SIZES,
+    describe_image,
+    get_blurhash,
+    render_variants,
+)
+from catalogs.services.variants import store_image_variants
+from utils.models import Job
+from utils.tests.cases import MediaTestCase
+
+
+def get_image_content(size=(2000, 1000), mode='RGB', format='PNG') -> bytes:
+    image_io = io.BytesIO()
+    PILImage.new(mode, size, color=(0, 128, 255, 128)[: len(mode)]).save(image_io, format=format)
+    return image_io.getvalue()
+
+
+class RenderVariantsTest(MediaTestCase):
+    def test_renders_every_variant_in_every_format(self):
+        rendered = render_variants(get_image_content())
+
+        self.assertEqual(set(rendered), set(VARIANT_SIZES))
+        for name, size in VARIANT_SIZES.items():
+            for fmt, (_, options) in VARIANT_FORMATS.items():
+                with self.subTest(name=name, fmt=fmt), PILImage.open(io.BytesIO(rendered[name][fmt])) as variant:
+                    self.assertEqual(variant.format, options['format'])
+                    self.assertEqual(variant.size, (size, size // 2))
+
+    def test_doesnt_upscale_small_images(self):
+        rendered = render_variants(get_image_content(size=(100, 50)))
+
+        with PILImage.open(io.BytesIO(rendered['full']['jpeg'])) as variant:
+            self.assertEqual(variant.size, (100, 50))
+
+    def test_renders_transparent_images(self):
+        rendered = render_variants(get_image_content(mode='RGBA'))
+
+        with PILImage.open(io.BytesIO(rendered['card']['jpeg'])) as variant:
+            self.assertEqual(variant.mode, 'RGB')
+
+    def test_renders_in_spawned_process(self):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            rendered = executor.submit(render_variants, get_image_content()).result()
+
+        self.assertEqual(set(rendered), set(VARIANT_SIZES))
+
+
+class DescribeImageTest(MediaTestCase):
+    def test_describes_image(self):
+        metadata = describe_image(get_image_content(size=(200, 100)))
+
+        self.assertEqual(metadata['width'], 200)
+        self.assertEqual(metadata['height'], 100)
+        self.assertEqual(metadata['dominant_color'], '#0080ff')
+        self.assertRegex(metadata['blurhash'], r'^[0-9A-Za-z#$%*+,\-.:;=?@\[\]^_{|}~]{28}$')
+
+    def test_dimensions_follow_exif_orientation(self):
+        image_io = io.BytesIO()
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # Rotated by 90 degrees.
+        PILImage.new('RGB', (200, 100)).save(image_io, format='JPEG', exif=exif)
+
+        metadata = describe_image(image_io.getvalue())
+
+        self.assertEqual((metadata['width'], metadata['height']), (100, 200))
+
+    def test_blurhash_matches_reference_encoder(self):
+        self.assertEqual(get_blurhash(PILImage.new('RGB', (100, 100))), 'L00000fQfQfQfQfQfQfQfQfQfQfQ')
+
+    def test_blurhash_differs_by_image(self):
+        gradient = PILImage.linear_gradient('L').convert('RGB')
+
+        self.assertNotEqual(get_blurhash(gradient), get_blurhash(gradient.rotate(90)))
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0)
+class ImageVariantsPipelineTest(MediaTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+
+    def create_image(self, name='image.png', type=Image.Type.MAIN) -> Image:
+        file = SimpleUploadedFile(name, get_image_content(), 'image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            image = self.create_test_image(self.advert, file, type)
+        self.run_jobs()
+        image.refresh_from_db()
+        return image
+
+    def get_variant_paths(self, image: Image) -> list[str]:
+        return [path for formats in image.variants.values() for path in formats.values()]
+
+    def test_variants_are_left_to_a_job_on_create(self):
+        image = self.create_test_image(self.advert, SimpleUploadedFile('image.png', get_image_content()))
+
+        self.assertEqual(image.variants, {})
+        self.assertTrue(Job.objects.filter(type='catalogs.generate_image_variants', payload__image_ids=[image.pk]))
+
+    def test_variants_are_generated_on_create(self):
+        image = self.create_image()
+
+        self.assertEqual(set(image.variants), set(VARIANT_SIZES))
+        for path in self.get_variant_paths(image):
+            self.assertTrue(image.file.storage.exists(path))
+            self.assertTrue(path.startswith(image.file.name.rsplit('/', 1)[0] + '/variants/'))
+
+    def test_main_image_variants_are_denormalized_on_advert(self):
+        image = self.create_image()
+
+        self.advert.refresh_from_db()
+        self.assertEqual(self.advert.main_image_variants, image.variants)
+
+    def test_file_metadata_is_filled_on_create(self):
+        content = get_image_content()
+        image = self.create_test_image(self.advert, SimpleUploadedFile('image.png', content))
+
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height, image.size), (2000, 1000, len(content)))
+        self.assertIsNone(image.blurhash)
+
+    def test_file_metadata_follows_exif_orientation(self):
+        image_io = io.BytesIO()
+        exif = PILImage.Exif()
+        exif[0x0112] = 8  # Rotated by 270 degrees.
+        PILImage.new('RGB', (200, 100)).save(image_io, format='JPEG', exif=exif)
+        image = self.create_test_image(self.advert, SimpleUploadedFile('image.jpg', image_io.getvalue()))
+
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (100, 200))
+
+    def test_placeholder_metadata_is_filled_with_variants(self):
+        image = self.create_image()
+
+        self.assertEqual(image.dominant_color, '#0080ff')
+        self.assertEqual(len(image.blurhash), 28)
+        self.advert.refresh_from_db()
+        self.assertEqual(
+            self.advert.main_image_metadata,
+            dict(width=2000, height=1000, size=image.size, dominant_color='#0080ff', blurhash=image.blurhash),
+        )
+
+    def test_variants_are_deleted_with_image(self):
+        image = self.create_image()
+        paths = self.get_variant_paths(image)
+
+        image.delete()
+        self.run_jobs()
+
+        self.assertFalse(any(image.file.storage.exists(path) for path in paths))
+
+    def test_variants_are_regenerated_on_file_replace(self):
+        image = self.create_image()
+        paths = self.get_variant_paths(image)
+
+        image.file = SimpleUploadedFile('replaced.png', get_image_content(size=(1000, 500)), 'image/png')
+        image.save()
+        self.run_jobs()
+
+        image.refresh_from_db()
+        self.assertFalse(any(image.file.storage.exists(path) for path in paths))
+        self.assertTrue(all(image.file.storage.exists(path) for path in self.get_variant_paths(image)))
+        stem = posixpath.splitext(posixpath.basename(image.file.name))[0]
+        self.assertTrue(all(stem in path for path in self.get_variant_paths(image)))
+
+    def test_variants_of_image_deleted_while_rendering_are_discarded(self):
+        image = self.create_test_image(self.advert, SimpleUploadedFile('image.png', get_image_content()))
+        rendered = render_variants(image.file.read())
+        Image.objects.filter(pk=image.pk).delete()
+
+        self.assertEqual(store_image_variants(image, rendered), {})
+        self.assertEqual(image.file.storage.listdir(image.file.name.rsplit('/', 1)[0] + '/variants'), ([], []))
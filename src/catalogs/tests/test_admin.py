@@ -0,0 +1,30 @@
+from django.contrib.admin.sites import site
+from django.test import RequestFactory
+
+from catalogs.admin.inlines import SubCategoryInline
+from catalogs.models import Category
+from utils.tests.cases import BaseTestCase
+
+
+class SubCategoryInlineTest(BaseTestCase):
+    def setUp(self):
+        self.inline = SubCategoryInline(Category, site)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.create_test_user(is_staff=True, is_superuser=True)
+        self.root = self.create_test_category(name='root')
+        self.fruits = self.create_test_category(name='fruits', parent=self.root)
+        self.apples = self.create_test_category(name='apples', parent=self.fruits)
+        self.create_test_category(name='green apples', parent=self.apples)
+        self.vegetables = self.create_test_category(name='vegetables', parent=self.root)
+
+    def test_descendant_counts_are_loaded_in_single_query(self):
+        with self.assertNumQueries(1):
+            counts = {
+                category.pk: self.inline.descendant_count(category)
+                for category in self.inline.get_queryset(self.request).filter(parent=self.root)
+            }
+
+        self.assertEqual(counts, {self.fruits.pk: 2, self.vegetables.pk: 0})
+
+    def test_descendant_count_of_new_category_is_zero(self):
+        self.assertEqual(self.inline.descendant_count(Category()), 0)
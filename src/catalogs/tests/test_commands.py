@@ -0,0 +1,238 @@
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from catalogs.models import Advert, Image, UploadSession
+from catalogs.services.images import sync_advert_images
+from catalogs.services.uploads import get_upload_path, get_upload_root
+from utils.tests.cases import BaseTestCase, MediaTestCase
+from utils.tests.cases.media_case import TEMP_MEDIA_ROOT
+
+
+class SyncAdvertImagesCommandTest(BaseTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        Image.objects.bulk_create(
+            [
+                Image(advert=self.advert, file='images/main.png', type=Image.Type.MAIN),
+                Image(advert=self.advert, file='images/extra.png', type=Image.Type.EXTRA),
+            ]
+        )
+
+    def test_command_backfills_advert_image_columns(self):
+        call_command('sync_advert_images', stdout=StringIO())
+
+        self.advert.refresh_from_db()
+        self.assertEqual(self.advert.main_image, 'images/main.png')
+        self.assertEqual(self.advert.extra_image_count, 1)
+
+    def test_command_reports_out_of_sync_adverts_in_check_mode(self):
+        with self.assertRaisesRegex(CommandError, r'1 of 1 adverts have out of sync image columns'):
+            call_command('sync_advert_images', check=True, stdout=StringIO())
+
+        self.assertEqual(Advert.objects.get().main_image, None)
+
+    def test_command_passes_check_after_backfill(self):
+        call_command('sync_advert_images', stdout=StringIO())
+
+        stdout = StringIO()
+        call_command('sync_advert_images', check=True, stdout=stdout)
+        self.assertIn('Verified 1 adverts, 0 were out of sync.', stdout.getvalue())
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0)
+class GenerateImageVariantsCommandTest(MediaTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.image = self.create_test_image(self.advert, self.get_image_simple_uploaded_file('main.png'))
+
+    def test_command_generates_missing_variants(self):
+        stdout = StringIO()
+        call_command('generate_image_variants', stdout=stdout)
+
+        self.image.refresh_from_db()
+        self.advert.refresh_from_db()
+        self.assertIn('card', self.image.variants)
+        self.assertEqual(self.advert.main_image_variants, self.image.variants)
+        self.assertIn('Generated variants of 1 images, 0 failed.', stdout.getvalue())
+
+    def test_command_skips_images_with_variants(self):
+        call_command('generate_image_variants', stdout=StringIO())
+
+        stdout = StringIO()
+        call_command('generate_image_variants', stdout=stdout)
+        self.assertIn('Generated variants of 0 images', stdout.getvalue())
+
+    def test_command_regenerates_all_variants(self):
+        call_command('generate_image_variants', stdout=StringIO())
+        self.image.refresh_from_db()
+        previous = self.image.variants
+
+        call_command('generate_image_variants', all=True, stdout=StringIO())
+
+        self.image.refresh_from_db()
+        self.assertNotEqual(self.image.variants, previous)
+        self.assertFalse(self.image.file.storage.exists(previous['card']['webp']))
+
+
+class BackfillImageMetadataCommandTest(MediaTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.image = self.create_test_image(self.advert, self.get_image_simple_uploaded_file('main.png'))
+        Image.objects.update(width=None, height=None, size=None, dominant_color=None, blurhash=None)
+        sync_advert_images([self.advert.pk])
+
+    def test_command_backfills_image_metadata(self):
+        stdout = StringIO()
+        call_command('backfill_image_metadata', workers=0, stdout=stdout)
+
+        self.image.refresh_from_db()
+        self.advert.refresh_from_db()
+        self.assertEqual((self.image.width, self.image.height), (100, 100))
+        self.assertEqual(self.image.size, self.image.file.size)
+        self.assertEqual(self.image.dominant_color, '#ffffff')
+        self.assertEqual(self.advert.main_image_metadata['blurhash'], self.image.blurhash)
+        self.assertIn('Updated 1 images, 0 failed.', stdout.getvalue())
+
+    def test_command_decodes_images_in_worker_processes(self):
+        call_command('backfill_image_metadata', workers=1, stdout=StringIO())
+
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.dominant_color, '#ffffff')
+
+    def test_command_skips_images_with_metadata(self):
+        call_command('backfill_image_metadata', workers=0, stdout=StringIO())
+
+        stdout = StringIO()
+        call_command('backfill_image_metadata', workers=0, stdout=stdout)
+        self.assertIn('Updated 0 images', stdout.getvalue())
+
+    def test_command_reports_missing_files(self):
+        Image.objects.bulk_create([Image(advert=self.advert, file='images/missing.png', type=Image.Type.EXTRA)])
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command('backfill_image_metadata', workers=0, stdout=stdout, stderr=stderr)
+
+        self.assertIn('File "images/missing.png" is missing.', stderr.getvalue())
+        self.assertIn('Updated 1 images, 1 failed.', stdout.getvalue())
+
+
+@override_settings(UPLOAD_SESSION_ROOT=os.path.join(TEMP_MEDIA_ROOT.name, 'uploads'), UPLOAD_SESSION_MAX_AGE=60)
+class CleanupUploadSessionsCommandTest(MediaTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+
+    def create_session(self, age: timedelta) -> UploadSession:
+        session = UploadSession.objects.create(
+            owner=self.owner, advert=self.advert, type=Image.Type.MAIN, file_name='main.png', size=10
+        )
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now() - age)
+        get_upload_path(session).parent.mkdir(parents=True, exist_ok=True)
+        get_upload_path(session).write_bytes(b'12345')
+        return session
+
+    def test_command_deletes_abandoned_sessions_with_files(self):
+        abandoned = self.create_session(timedelta(minutes=2))
+        active = self.create_session(timedelta(seconds=10))
+        stdout = StringIO()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('cleanup_upload_sessions', stdout=stdout)
+
+        self.assertEqual(list(UploadSession.objects.values_list('pk', flat=True)), [active.pk])
+        self.assertFalse(get_upload_path(abandoned).exists())
+        self.assertTrue(get_upload_path(active).exists())
+        self.assertIn('Deleted 1 abandoned upload sessions and 0 orphaned files.', stdout.getvalue())
+
+    def test_command_deletes_old_orphaned_files(self):
+        orphaned = get_upload_root() / 'orphaned.part'
+        orphaned.parent.mkdir(parents=True, exist_ok=True)
+        orphaned.write_bytes(b'12345')
+        expired = (timezone.now() - timedelta(minutes=2)).timestamp()
+        os.utime(orphaned, (expired, expired))
+        stdout = StringIO()
+
+        call_command('cleanup_upload_sessions', stdout=stdout)
+
+        self.assertFalse(orphaned.exists())
+        self.assertIn('0 abandoned upload sessions and 1 orphaned files.', stdout.getvalue())
+
+
+class DedupeImagesCommandTest(MediaTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.other_advert = self.create_test_advert(self.owner, self.category)
+        self.storage = Image._meta.get_field('file').storage
+
+    def create_legacy_image(self, advert: Advert, name: str, content: bytes, type=Image.Type.MAIN) -> Image:
+        name = default_storage.save(name, ContentFile(content))
+        Image.objects.bulk_create([Image(advert=advert, file=name, type=type)])
+        sync_advert_images([advert.pk])
+        return Image.objects.get(file=name)
+
+    def test_command_moves_legacy_files_into_one_blob(self):
+        first = self.create_legacy_image(self.advert, 'images/2024/01/01/photo.png', b'content')
+        second = self.create_legacy_image(self.other_advert, 'images/2024/01/02/photo.png', b'content')
+        stdout = StringIO()
+
+        call_command('dedupe_images', stdout=stdout)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.advert.refresh_from_db()
+        self.assertTrue(self.storage.is_content_name(first.file.name))
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.file.read(), b'content')
+        self.assertEqual(self.advert.main_image, first.file.name)
+        self.assertFalse(default_storage.exists('images/2024/01/01/photo.png'))
+        self.assertFalse(default_storage.exists('images/2024/01/02/photo.png'))
+        self.assertIn('Moved 2 images into 1 files, 0 files are missing.', stdout.getvalue())
+
+    def test_command_skips_images_in_content_addressed_storage(self):
+        image = self.create_test_image(self.advert, self.get_image_simple_uploaded_file('main.png'))
+        stdout = StringIO()
+
+        call_command('dedupe_images', stdout=stdout)
+
+        self.assertEqual(Image.objects.get(pk=image.pk).file.name, image.file.name)
+        self.assertIn('Moved 0 images into 0 files', stdout.getvalue())
+
+    def test_command_sweeps_unreferenced_files(self):
+        image = self.create_test_image(self.advert, self.get_image_simple_uploaded_file('main.png'))
+        orphaned = self.storage.save('orphaned.png', ContentFile(b'orphaned'))
+        expired = time.time() - self.storage.delete_grace_period
+        os.utime(self.storage.path(orphaned), (expired, expired))
+        stdout = StringIO()
+
+        call_command('dedupe_images', sweep=True, stdout=stdout)
+
+        self.assertTrue(self.storage.exists(image.file.name))
+        self.assertFalse(self.storage.exists(orphaned))
+        self.assertIn('Deleted 1 unreferenced files.', stdout.getvalue())
+
+    def test_command_keeps_file_saved_before_its_image_is_committed(self):
+        # The file is saved before the image row, a sweep in between must not see it as unreferenced.
+        name = self.storage.save('main.png', self.get_image_simple_uploaded_file('main.png'))
+
+        call_command('dedupe_images', sweep=True, stdout=StringIO())
+        image = Image.objects.create(advert=self.advert, file=name, type=Image.Type.MAIN)
+
+        self.assertTrue(self.storage.exists(name))
+        self.assertTrue(image.file.read())
@@ -0,0 +1,74 @@
+import os
+import time
+
+from django.core.files.base import ContentFile
+
+from catalogs.models import Image
+from catalogs.storages import ImageStorage
+from utils.tests.cases import MediaTestCase
+
+
+class ImageStorageTest(MediaTestCase):
+    def setUp(self):
+        self.storage = ImageStorage()
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+
+    def create_image(self, name='image.png', type=Image.Type.EXTRA) -> Image:
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create_test_image(self.advert, self.get_image_simple_uploaded_file(name), type)
+
+    def delete_image(self, image: Image):
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+
+    def expire_grace_period(self, name: str):
+        os.utime(self.storage.path(name), (time.time(), time.time() - self.storage.delete_grace_period))
+
+    def test_storage_names_file_by_content_hash(self):
+        name = self.storage.save('photo.JPG', ContentFile(b'content'))
+
+        self.assertEqual(name, 'images/ed/70/ed7002b439e9ac845f22357d822bac1444730fbdb6016d3ec9432297b9ec9f73.jpg')
+        self.assertEqual(self.storage.open(name).read(), b'content')
+
+    def test_storage_stores_same_content_once(self):
+        name = self.storage.save('first.png', ContentFile(b'content'))
+
+        self.assertEqual(self.storage.save('second.png', ContentFile(b'content')), name)
+        self.assertEqual(len(os.listdir(os.path.dirname(self.storage.path(name)))), 1)
+
+    def test_blob_is_kept_while_other_images_refer_to_it(self):
+        image = self.create_image()
+        copy = self.create_image()
+        self.assertEqual(copy.file.name, image.file.name)
+        self.expire_grace_period(image.file.name)
+
+        self.delete_image(image)
+        self.assertTrue(self.storage.exists(copy.file.name))
+
+        self.delete_image(copy)
+        self.assertFalse(self.storage.exists(copy.file.name))
+
+    def test_blob_saved_again_recently_is_kept(self):
+        image = self.create_image()
+        self.storage.save('copy.png', image.file.open())
+
+        self.delete_image(image)
+
+        self.assertTrue(self.storage.exists(image.file.name))
+
+    def test_new_blob_is_kept_within_grace_period(self):
+        image = self.create_image()
+
+        self.delete_image(image)
+
+        self.assertTrue(self.storage.exists(image.file.name))
+
+    def test_blob_of_deleted_image_is_deleted(self):
+        image = self.create_image()
+        self.expire_grace_period(image.file.name)
+
+        self.delete_image(image)
+
+        self.assertFalse(self.storage.exists(image.file.name))
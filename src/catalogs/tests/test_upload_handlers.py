@@ -0,0 +1,91 @@
+import io
+import os
+
+from PIL import Image as PILImage
+from django.http.multipartparser import MultiPartParserError
+from django.test import RequestFactory, override_settings
+
+from catalogs.upload_handlers import ImageUploadHandler
+from utils.tests.cases import BaseTestCase
+
+
+def get_image_content(size=(300, 200), format='JPEG') -> bytes:
+    image_io = io.BytesIO()
+    # Noise keeps the file larger than a single chunk.
+    PILImage.effect_noise(size, 64).convert('RGB').save(image_io, format=format)
+    return image_io.getvalue()
+
+
+class ImageUploadHandlerTest(BaseTestCase):
+    def setUp(self):
+        self.handler = ImageUploadHandler(RequestFactory().post('/'))
+        self.handler.chunk_size = 1024
+
+    def upload(self, content: bytes, name='image.jpg'):
+        self.handler.new_file('files', name, 'application/octet-stream', len(content))
+        for start in range(0, len(content), self.handler.chunk_size):
+            self.handler.receive_data_chunk(content[start : start + self.handler.chunk_size], start)
+        return self.handler.file_complete(len(content))
+
+    def test_handler_streams_file_to_temporary_file(self):
+        content = get_image_content()
+
+        file = self.upload(content)
+
+        self.assertTrue(os.path.exists(file.temporary_file_path()))
+        self.assertEqual(file.read(), content)
+        self.assertEqual(file.size, len(content))
+
+    def test_handler_stores_image_format_and_size(self):
+        file = self.upload(get_image_content())
+
+        self.assertEqual(file.content_type, 'image/jpeg')
+        self.assertEqual(file.image_format, 'JPEG')
+        self.assertEqual(file.image_size, (300, 200))
+
+    def test_handler_stores_size_after_exif_orientation(self):
+        image_io = io.BytesIO()
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # Rotated by 90 degrees.
+        PILImage.new('RGB', (300, 200)).save(image_io, format='JPEG', exif=exif)
+
+        file = self.upload(image_io.getvalue())
+
+        self.assertEqual(file.image_size, (200, 300))
+
+    def test_handler_checks_header_before_whole_file_is_received(self):
+        content = get_image_content()
+        self.handler.new_file('files', 'image.jpg', 'image/jpeg', len(content))
+
+        self.handler.receive_data_chunk(content[:1024], 0)
+
+        self.assertEqual(self.handler.image_size, (300, 200))
+        self.assertLess(len(self.handler.header), len(content))
+
+    def test_handler_rejects_non_image_file(self):
+        self.handler.new_file('files', 'image.jpg', 'image/jpeg', 2048)
+
+        with self.assertRaisesRegex(MultiPartParserError, r'not a valid image'):
+            self.handler.receive_data_chunk(b'x' * ImageUploadHandler.max_header_size, 0)
+
+    def test_handler_rejects_small_non_image_file_on_complete(self):
+        with self.assertRaisesRegex(MultiPartParserError, r'not a valid image'):
+            self.upload(b'not an image')
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=4096)
+    def test_handler_rejects_oversized_file_and_removes_temporary_file(self):
+        content = get_image_content()
+        self.handler.new_file('files', 'image.jpg', 'image/jpeg', len(content))
+        self.handler.receive_data_chunk(content[:1024], 0)
+        path = self.handler.file.temporary_file_path()
+
+        with self.assertRaisesRegex(MultiPartParserError, r'larger than'):
+            for start in range(1024, len(content), 1024):
+                self.handler.receive_data_chunk(content[start : start + 1024], start)
+
+        self.assertFalse(os.path.exists(path))
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=300 * 200 - 1)
+    def test_handler_rejects_image_with_too_many_pixels(self):
+        with self.assertRaisesRegex(MultiPartParserError, r'300x200'):
+            self.upload(get_image_content())
@@ -1,9 +1,17 @@
 from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import tag
 
 from rest_framework import status
 from rest_framework.reverse import reverse
 
-from catalogs.models import Advert
+from catalogs.filters import AdvertFilter
+from catalogs.services.advert_cache import get_advert_cache_key, get_advert_version
+from catalogs.models import Advert, Image
+from catalogs.services.images import sync_advert_images
 from catalogs.serializers import (
     AdvertListSerializer,
     AdvertCreateSerializer,
@@ -11,6 +19,7 @@ from catalogs.serializers import (
     AdvertRetrieveSerializer,
 )
 from utils.models import Address
+from utils.services.media import get_media_window_start, sign_media_url
 from utils.tests.cases import BaseTestCase
 
 LIST_URL = 'advert-list'
@@ -40,6 +49,220 @@ class AdvertListViewTest(BaseTestCase):
             is_paginated=True,
         )
 
+    def test_view_returns_main_images(self):
+        main_image = Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+        Image.objects.create(advert=self.advert, file='images/extra.png', type=Image.Type.EXTRA)
+
+        response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['main_image'], sign_media_url(main_image.file.name))
+
+    def test_view_returns_card_variant_of_main_image(self):
+        variants = dict(card=dict(webp='images/variants/main_card.webp', jpeg='images/variants/main_card.jpg'))
+        Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN, variants=variants)
+
+        response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0]['main_image_card'],
+            dict(webp=sign_media_url(variants['card']['webp']), jpeg=sign_media_url(variants['card']['jpeg'])),
+        )
+
+    def test_view_gets_main_images_in_constant_query_count(self):
+        adverts = Advert.objects.bulk_create(
+            Advert(owner=self.owner, category=self.category, name=f'name {i}', price='100.00') for i in range(100)
+        )
+        Image.objects.bulk_create(
+            Image(advert=advert, file=f'images/{advert.pk}.png', type=Image.Type.MAIN) for advert in adverts
+        )
+        sync_advert_images(advert.pk for advert in adverts)
+
+        for limit in (10, 50, 100):
+            with self.subTest(limit=limit), self.assertNumQueries(2):
+                response = self.client.get(self.url, dict(limit=limit))
+                self.assert_response(response, status.HTTP_200_OK)
+                self.assertEqual(len(response.data['results']), limit)
+                self.assertTrue(all(advert['main_image'] for advert in response.data['results']))
+
+
+class AdvertListSearchViewTest(BaseTestCase):
+    url = reverse(LIST_URL)
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.apples = self.create_test_advert(self.owner, self.category, name='Apples')
+        self.juice = self.create_test_advert(self.owner, self.category, name='Juice', descr='Made of apples')
+        self.create_test_advert(self.owner, self.category, name='Tomatoes')
+
+    def test_view_returns_matched_adverts_by_relevance(self):
+        response = self.client.get(self.url, dict(q='apples'))
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([advert['id'] for advert in response.data['results']], [self.apples.id, self.juice.id])
+
+
+class AdvertListFilterViewTest(BaseTestCase):
+    url = reverse(LIST_URL)
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.other_owner = self.create_test_user(email='other@test.com')
+        self.category = self.create_test_category()
+        self.sub_category = self.create_test_category(name='sub category', parent=self.category)
+        self.other_category = self.create_test_category(name='other category')
+
+        self.cheap = self.create_test_advert(self.owner, self.category, price='10.00', pickup=True, courier=False)
+        self.sub = self.create_test_advert(self.owner, self.sub_category, price='50.00', nova_post=True, courier=False)
+        self.other = self.create_test_advert(self.other_owner, self.other_category, price='90.00')
+        self.create_test_address(self.cheap, city='Kyiv')
+        self.create_test_address(self.other, city='Lviv')
+
+    def get_ids(self, **params) -> set[int]:
+        response = self.client.get(self.url, params)
+        self.assert_response(response, status.HTTP_200_OK)
+        return {advert['id'] for advert in response.data['results']}
+
+    def test_view_filters_by_category_with_descendants(self):
+        self.assertEqual(self.get_ids(category=self.category.id), {self.cheap.id, self.sub.id})
+        self.assertEqual(self.get_ids(category=self.sub_category.id), {self.sub.id})
+
+    def test_view_filters_by_price_range(self):
+        self.assertEqual(self.get_ids(price_min='20', price_max='90'), {self.sub.id, self.other.id})
+        self.assertEqual(self.get_ids(price_max='50'), {self.cheap.id, self.sub.id})
+
+    def test_view_filters_by_delivery_flags(self):
+        self.assertEqual(self.get_ids(pickup='true'), {self.cheap.id})
+        self.assertEqual(self.get_ids(nova_post='true'), {self.sub.id})
+        self.assertEqual(self.get_ids(courier='true'), {self.other.id})
+
+    def test_view_filters_by_owner(self):
+        self.assertEqual(self.get_ids(owner=self.other_owner.id), {self.other.id})
+
+    def test_view_filters_by_city_case_insensitively(self):
+        self.assertEqual(self.get_ids(city='kyiv'), {self.cheap.id})
+
+    def test_view_returns_advert_with_several_addresses_in_city_once(self):
+        self.create_test_address(self.cheap, city='KYIV')
+
+        response = self.client.get(self.url, dict(city='kyiv'))
+
+        self.assertEqual([advert['id'] for advert in response.data['results']], [self.cheap.id])
+
+    def test_view_combines_filters(self):
+        self.assertEqual(self.get_ids(category=self.category.id, price_min='20'), {self.sub.id})
+
+    def test_view_returns_bad_request_for_invalid_filter_value(self):
+        response = self.client.get(self.url, dict(price_min='cheap'))
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_returns_bad_request_for_invalid_category(self):
+        for category in (f'{self.category.id}.5', 'food', self.other_category.id + 100):
+            with self.subTest(category=category):
+                response = self.client.get(self.url, dict(category=category))
+                self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+
+@tag('postgresql')
+@skipUnless(connection.vendor == 'postgresql', 'Checks query plans of Postgres.')
+class AdvertFilterIndexTest(BaseTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.create_test_address(self.create_test_advert(self.owner, self.category), city='Kyiv')
+
+    def get_plan(self, **params) -> str:
+        queryset = AdvertFilter(params, queryset=Advert.objects.order_by('-created_at', '-id')).qs
+        with connection.cursor() as cursor:
+            # The test tables are tiny, so sequential scans are disabled to see whether an index can serve the query.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset[:10].explain()
+
+    def test_each_filter_uses_its_index(self):
+        # Every filter is checked for its own index, as the ordering index alone would avoid sequential scans too.
+        filters = [
+            ({}, 'advert_created_at_id_idx'),
+            (dict(category=self.category.id), 'advert_category_created_idx'),
+            (dict(owner=self.owner.id), 'advert_owner_created_idx'),
+            (dict(price_min='10', price_max='100'), 'advert_price_idx'),
+            (dict(pickup='true'), 'advert_pickup_created_idx'),
+            (dict(nova_post='true'), 'advert_nova_post_created_idx'),
+            (dict(courier='true'), 'advert_courier_created_idx'),
+            (dict(city='kyiv'), 'address_city_content_obj_idx'),
+        ]
+        for params, index in filters:
+            with self.subTest(index):
+                plan = self.get_plan(**params)
+                self.assertIn(index, plan)
+                self.assertNotIn('Seq Scan', plan)
+
+
+class AdvertListCursorPaginationViewTest(BaseTestCase):
+    url = reverse(LIST_URL)
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        adverts = Advert.objects.bulk_create(
+            Advert(owner=self.owner, category=self.category, name=f'name {i}', price='100.00') for i in range(25)
+        )
+        # Share a creation date between adverts to check the tie-break by id.
+        Advert.objects.filter(pk__in=[advert.pk for advert in adverts[5:15]]).update(created_at=adverts[5].created_at)
+        self.expected_ids = list(Advert.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def get_pages(self, url, link='next'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assert_response(response, status.HTTP_200_OK)
+            pages.append(response.data)
+            url = response.data[link]
+        return pages
+
+    def test_view_paginates_by_cursor_on_request(self):
+        pages = self.get_pages(f'{self.url}?pagination=cursor&limit=10')
+
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertEqual([advert['id'] for page in pages for advert in page['results']], self.expected_ids)
+
+    def test_view_doesnt_return_count_in_cursor_mode(self):
+        response = self.client.get(self.url, dict(pagination='cursor'))
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_view_paginates_backwards_by_previous_links(self):
+        last_page = self.get_pages(f'{self.url}?pagination=cursor&limit=10')[-1]
+
+        pages = self.get_pages(last_page['previous'], link='previous')
+
+        self.assertEqual([len(page['results']) for page in pages], [10, 10])
+        ids = [advert['id'] for page in reversed(pages) for advert in page['results']]
+        self.assertEqual(ids, self.expected_ids[:20])
+
+    def test_view_returns_not_found_for_invalid_cursor(self):
+        response = self.client.get(self.url, dict(cursor='invalid'))
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    def test_view_rejects_cursor_pagination_of_search_ranked_by_relevance(self):
+        response = self.client.get(self.url, dict(pagination='cursor', q='name'))
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, dict(q='name'))
+        self.assert_response(response, status.HTTP_200_OK)
+
+    def test_view_keeps_limit_offset_pagination_by_default(self):
+        response = self.client.get(self.url, dict(limit=10, offset=10))
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual([advert['id'] for advert in response.data['results']], self.expected_ids[10:20])
+
 
 class AdvertRetrieveViewTest(BaseTestCase):
     serializer_class = AdvertRetrieveSerializer
@@ -65,6 +288,240 @@ class AdvertRetrieveViewTest(BaseTestCase):
             expected_data=serializer.data,
         )
 
+    def test_view_returns_full_variants_of_images(self):
+        main_variants = dict(full=dict(webp='images/variants/main_full.webp', jpeg='images/variants/main_full.jpg'))
+        extra_variants = dict(full=dict(webp='images/variants/extra_full.webp', jpeg='images/variants/extra_full.jpg'))
+        Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN, variants=main_variants)
+        Image.objects.create(
+            advert=self.advert, file='images/extra.png', type=Image.Type.EXTRA, variants=extra_variants
+        )
+        Image.objects.create(advert=self.advert, file='images/pending.png', type=Image.Type.EXTRA)
+
+        # Advert, address and a single query for both extra image fields.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['main_image_full'],
+            {fmt: sign_media_url(path) for fmt, path in main_variants['full'].items()},
+        )
+        self.assertEqual(
+            response.data['extra_images'], [sign_media_url('images/extra.png'), sign_media_url('images/pending.png')]
+        )
+        self.assertEqual(
+            response.data['extra_images_full'],
+            [{fmt: sign_media_url(path) for fmt, path in extra_variants['full'].items()}, None],
+        )
+
+
+class AdvertConditionalRequestViewTest(BaseTestCase):
+    list_url = reverse(LIST_URL)
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.url = reverse(DETAIL_URL, [self.advert.pk])
+
+    def test_retrieve_returns_validators(self):
+        response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_retrieve_returns_not_modified_after_single_query(self):
+        etag = self.client.get(self.url)['ETag']
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_retrieve_returns_not_modified_since_last_modified(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_is_modified_by_advert_update(self):
+        etag = self.client.get(self.url)['ETag']
+        self.advert.name = 'new name'
+        self.advert.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'new name')
+
+    def test_retrieve_is_modified_by_image_change(self):
+        etag = self.client.get(self.url)['ETag']
+        Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['main_image'])
+
+    def test_retrieve_is_modified_when_media_urls_change(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with mock.patch('catalogs.views.get_media_window_start', return_value=get_media_window_start() + 300):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assert_response(response, status.HTTP_200_OK)
+
+    def test_retrieve_of_missing_advert_returns_not_found(self):
+        response = self.client.get(reverse(DETAIL_URL, [self.advert.pk + 1]), HTTP_IF_NONE_MATCH='"etag"')
+
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_of_non_numeric_pk_returns_not_found(self):
+        response = self.client.get(reverse(DETAIL_URL, ['abc']))
+
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    def test_list_returns_weak_etag(self):
+        response = self.client.get(self.list_url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+    def test_list_returns_not_modified(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_is_modified_by_advert_update(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.advert.price = Decimal('1.00')
+        self.advert.save()
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assert_response(response, status.HTTP_200_OK)
+
+    def test_list_is_modified_by_page_window_change(self):
+        newer = self.create_test_advert(self.owner, self.category)
+        etag = self.client.get(self.list_url, dict(limit=1))['ETag']
+        newer.delete()
+
+        response = self.client.get(self.list_url, dict(limit=1), HTTP_IF_NONE_MATCH=etag)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['id'], self.advert.pk)
+
+    def test_list_etag_depends_on_page(self):
+        self.create_test_advert(self.owner, self.category)
+
+        first = self.client.get(self.list_url, dict(limit=1))['ETag']
+        second = self.client.get(self.list_url, dict(limit=1, offset=1))['ETag']
+
+        self.assertNotEqual(first, second)
+
+
+class AdvertRetrieveCacheViewTest(BaseTestCase):
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.url = reverse(DETAIL_URL, [self.advert.pk])
+
+    def test_view_serves_repeated_requests_from_cache(self):
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.url)
+
+        self.assert_response(cached_response, status.HTTP_200_OK, expected_data=response.data)
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+
+    def test_cached_advert_returns_not_modified_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_advert_update_invalidates_cache(self):
+        self.client.get(self.url)
+        self.advert.name = 'new name'
+        self.advert.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['name'], 'new name')
+
+    def test_advert_delete_invalidates_cache(self):
+        self.client.get(self.url)
+        self.advert.delete()
+
+        response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    def test_image_changes_invalidate_cache(self):
+        self.client.get(self.url)
+        image = Image.objects.create(advert=self.advert, file='images/main.png', type=Image.Type.MAIN)
+
+        self.assertEqual(self.client.get(self.url).data['main_image'], sign_media_url('images/main.png'))
+
+        variants = dict(full=dict(webp='images/variants/main_full.webp'))
+        Image.objects.filter(pk=image.pk).update(variants=variants)
+        sync_advert_images([self.advert.pk])
+
+        self.assertEqual(
+            self.client.get(self.url).data['main_image_full'], dict(webp=sign_media_url(variants['full']['webp']))
+        )
+
+        image.delete()
+
+        self.assertIsNone(self.client.get(self.url).data['main_image'])
+
+    def test_address_changes_invalidate_cache(self):
+        self.client.get(self.url)
+        address = self.create_test_address(self.advert)
+
+        self.assertEqual(self.client.get(self.url).data['address']['city'], address.city)
+
+        address.city = 'New city'
+        address.save()
+
+        self.assertEqual(self.client.get(self.url).data['address']['city'], 'New city')
+
+        address.delete()
+
+        self.assertEqual(self.client.get(self.url).data['address'], {})
+
+    def test_filtered_request_bypasses_cache(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, dict(owner=self.owner.pk + 1))
+
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    @mock.patch('catalogs.services.advert_cache.ADVERT_CACHE_WAIT_ATTEMPTS', 1)
+    @mock.patch('catalogs.services.advert_cache.ADVERT_CACHE_WAIT_INTERVAL', 0)
+    def test_view_builds_uncached_advert_while_other_worker_rebuilds_it(self):
+        key = get_advert_cache_key(self.advert.pk, get_advert_version(self.advert.pk))
+        cache.add(f'{key}:lock', 'other worker')
+
+        response = self.client.get(self.url)
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.advert.pk)
+        self.assertIsNone(cache.get(key))
+
 
 class AdvertCreateViewTest(BaseTestCase):
     url = reverse(LIST_URL)
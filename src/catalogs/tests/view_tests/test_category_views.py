@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import status
 from rest_framework.reverse import reverse
 
@@ -78,3 +79,106 @@ class CategoryListViewTest(BaseTestCase):
             ).data,
             is_paginated=True,
         )
+
+
+class CategoryListQueryCountViewTest(BaseTestCase):
+    url = reverse('category-list')
+    serializer_class = CategoryListSerializer
+    model = Category
+    fixtures = [settings.BASE_DIR / 'dumps/category_dump.json']
+
+    def test_view_gets_category_tree_in_single_query(self):
+        expected_data = self.create_serializer_deprecated(
+            self.serializer_class,
+            instance=self.model.objects.filter(parent=None).order_by('pk'),
+            many=True,
+        ).data
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, dict(limit=100))
+
+        self.assert_response(response, status.HTTP_200_OK, expected_data=expected_data, is_paginated=True)
+        self.assertEqual(response.json()['count'], self.model.objects.filter(parent=None).count())
+
+    def test_view_paginates_root_categories(self):
+        root_ids = list(self.model.objects.filter(parent=None).order_by('pk').values_list('pk', flat=True))
+
+        response = self.client.get(self.url, dict(limit=2, offset=1))
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual([category['id'] for category in response.json()['results']], root_ids[1:3])
+
+
+class CategoryListCacheViewTest(BaseTestCase):
+    model = Category
+
+    def setUp(self) -> None:
+        food = self.create_test_category(name='Food')
+        self.create_test_category(name='Fruits', parent=food)
+
+    def test_views_return_etag(self):
+        for url in (reverse('category-list'), reverse('category-select-list')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assert_response(response, status.HTTP_200_OK)
+                self.assertTrue(response.has_header('ETag'))
+
+    def test_views_serve_repeated_requests_from_cache(self):
+        for url in (reverse('category-list'), reverse('category-select-list')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                with self.assertNumQueries(0):
+                    cached_response = self.client.get(url)
+
+                self.assert_response(cached_response, status.HTTP_200_OK)
+                self.assertEqual(cached_response.content, response.content)
+
+    def test_views_return_not_modified_for_matching_etag_without_queries(self):
+        for url in (reverse('category-list'), reverse('category-select-list')):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, headers={'If-None-Match': etag})
+
+                self.assert_response(response, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+                self.assertEqual(response['ETag'], etag)
+
+    def test_category_changes_invalidate_cache(self):
+        url = reverse('category-list')
+        etag = self.client.get(url)['ETag']
+
+        vegetables = self.create_test_category(name='Vegetables')
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn(vegetables.id, [category['id'] for category in response.json()['results']])
+
+        etag = response['ETag']
+        vegetables.delete()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertNotIn(vegetables.id, [category['id'] for category in response.json()['results']])
+
+    def test_views_share_cache_entry_for_unused_query_params(self):
+        url = reverse('category-list')
+        response = self.client.get(url, dict(limit=1, x=1))
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url, dict(x=2, limit=1))
+
+        self.assert_response(cached_response, status.HTTP_200_OK)
+        self.assertEqual(cached_response.json()['results'], response.json()['results'])
+
+    def test_views_return_fresh_data_for_different_query_params(self):
+        url = reverse('category-list')
+        self.client.get(url, dict(limit=1))
+
+        response = self.client.get(url, dict(limit=1, offset=1))
+
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], [])
@@ -1,3 +1,5 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.reverse import reverse
 
@@ -13,7 +15,9 @@ class ImageMultipleDeleteViewTest(MediaTestCase, BaseTestCase):
         self.category = self.create_test_category()
         self.advert = self.create_test_advert(self.owner, self.category)
         self.main_image = self.create_test_image(self.advert)
-        self.extra_image = self.create_test_image(self.advert, type=Image.Type.EXTRA)
+        self.extra_image = self.create_test_image(
+            self.advert, self.get_image_simple_uploaded_file('extra_image.png'), Image.Type.EXTRA
+        )
 
         self.data = dict(
             advert=self.advert.id,
@@ -45,6 +49,17 @@ class ImageMultipleDeleteViewTest(MediaTestCase, BaseTestCase):
 
         self.assertEqual(Image.objects.count(), 1)
 
+    def test_view_keeps_file_shared_with_image_of_other_advert(self):
+        other_advert = self.create_test_advert(self.owner, self.category)
+        self.extra_image.file.open()
+        copy = self.create_test_image(other_advert, self.extra_image.file, Image.Type.EXTRA)
+        self.assertEqual(copy.file.name, self.extra_image.file.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, self.data, format='json')
+
+        self.assertTrue(copy.file.storage.exists(copy.file.name))
+
     def test_view_return_no_data(self):
         response = self.client.post(self.url, self.data, format='json')
         self.assert_response(response, status.HTTP_204_NO_CONTENT, expected_data=None)
@@ -77,6 +92,16 @@ class ImageMultipleCreateViewTest(MediaTestCase, BaseTestCase):
         response = self.client.post(self.url, self.data, format='multipart')
         self.assert_response(response, status.HTTP_201_CREATED)
 
+    def test_view_rejects_token_of_deactivated_user(self):
+        self.client.post(self.url, {}, format='multipart')
+        self.owner.is_active = False
+        self.owner.save()
+
+        response = self.client.post(self.url, self.data, format='multipart')
+
+        self.assert_response(response, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(Image.objects.count(), 0)
+
     def test_view_creates_images(self):
         self.assertEqual(Image.objects.count(), 0)
 
@@ -88,9 +113,68 @@ class ImageMultipleCreateViewTest(MediaTestCase, BaseTestCase):
         main_image = Image.objects.get(advert=self.advert, type=Image.Type.MAIN)
         extra_image = Image.objects.get(advert=self.advert, type=Image.Type.EXTRA)
 
-        self.assertIn(self.main_file.name, main_image.file.name)
-        self.assertIn(self.extra_file.name, extra_image.file.name)
+        self.main_file.seek(0)
+        self.extra_file.seek(0)
+        self.assertEqual(main_image.file.read(), self.main_file.read())
+        self.assertEqual(extra_image.file.read(), self.extra_file.read())
+
+    def test_view_rejects_non_image_file(self):
+        self.data['files'] = [self.main_file, SimpleUploadedFile('extra_image.png', b'not an image', 'image/png')]
 
-    def test_view_returns_no_data(self):
         response = self.client.post(self.url, self.data, format='multipart')
-        self.assert_response(response, status.HTTP_201_CREATED, expected_data=None)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('extra_image.png', response.data['errors'][0]['detail'])
+        self.assertEqual(Image.objects.count(), 0)
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=100)
+    def test_view_rejects_oversized_file(self):
+        response = self.client.post(self.url, self.data, format='multipart')
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Image.objects.count(), 0)
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=100 * 100 - 1)
+    def test_view_rejects_image_with_too_many_pixels(self):
+        response = self.client.post(self.url, self.data, format='multipart')
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('100x100', response.data['errors'][0]['detail'])
+
+    def test_view_returns_created_images(self):
+        response = self.client.post(self.url, self.data, format='multipart')
+
+        images = Image.objects.filter(advert=self.advert).order_by('pk')
+        self.assert_response(response, status.HTTP_201_CREATED)
+        self.assertEqual([image['id'] for image in response.data], [image.id for image in images])
+        self.assertEqual([image['type'] for image in response.data], [Image.Type.MAIN, Image.Type.EXTRA])
+        self.assertTrue(all(image['advert'] == self.advert.id for image in response.data))
+        self.assertTrue(response.data[0]['file'].endswith(images[0].file.url))
+
+    def test_view_creates_images_in_constant_query_count(self):
+        # The first request caches the authenticated user, later requests build it without a lookup.
+        self.client.post(self.url, {}, format='multipart')
+
+        for count in (2, 10):
+            with self.subTest(count=count):
+                Image.objects.all().delete()
+                data = dict(
+                    advert=self.advert.id,
+                    files=[self.get_image_simple_uploaded_file(f'image_{i}.png') for i in range(count)],
+                    types=[Image.Type.MAIN] + [Image.Type.EXTRA] * (count - 1),
+                )
+
+                # Advert lookup, main image check, savepoints, insert, images sync and variants job.
+                with self.assertNumQueries(7):
+                    response = self.client.post(self.url, data, format='multipart')
+
+                self.assert_response(response, status.HTTP_201_CREATED)
+                self.assertEqual(Image.objects.filter(advert=self.advert).count(), count)
+
+    def test_view_updates_advert_images(self):
+        self.client.post(self.url, self.data, format='multipart')
+
+        self.advert.refresh_from_db()
+        main_image = Image.objects.get(advert=self.advert, type=Image.Type.MAIN)
+        self.assertEqual(self.advert.main_image, str(main_image.file))
+        self.assertEqual(self.advert.extra_image_count, 1)
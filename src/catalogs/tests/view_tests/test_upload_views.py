@@ -0,0 +1,219 @@
+import io
+import os
+
+from PIL import Image as PILImage
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from catalogs.models import Image, UploadSession
+from catalogs.services.uploads import get_upload_path
+from utils.tests.cases import MediaTestCase
+from utils.tests.cases.media_case import TEMP_MEDIA_ROOT
+
+
+def get_image_content() -> bytes:
+    image_io = io.BytesIO()
+    PILImage.effect_noise((200, 100), 64).convert('RGB').save(image_io, format='JPEG')
+    return image_io.getvalue()
+
+
+@override_settings(UPLOAD_SESSION_ROOT=os.path.join(TEMP_MEDIA_ROOT.name, 'uploads'))
+class UploadSessionViewTest(MediaTestCase):
+    list_url = reverse('uploads-list')
+
+    def setUp(self):
+        self.owner = self.create_test_user()
+        self.category = self.create_test_category()
+        self.advert = self.create_test_advert(self.owner, self.category)
+        self.content = get_image_content()
+        self.data = dict(advert=self.advert.pk, type=Image.Type.MAIN, file_name='main.jpg', size=len(self.content))
+
+        self.login_user_by_token(self.owner)
+
+    def create_session(self, **data) -> UploadSession:
+        response = self.client.post(self.list_url, {**self.data, **data})
+        self.assert_response(response, status.HTTP_201_CREATED)
+        return UploadSession.objects.get(pk=response.data['id'])
+
+    def put_range(self, session: UploadSession, start: int, end: int, content: bytes = None):
+        content = self.content[start : end + 1] if content is None else content
+        return self.client.put(
+            reverse('uploads-detail', args=[session.pk]),
+            content,
+            content_type='application/octet-stream',
+            headers={'Content-Range': f'bytes {start}-{end}/{session.size}'},
+        )
+
+    def finalize(self, session: UploadSession):
+        return self.client.post(reverse('uploads-finalize', args=[session.pk]))
+
+    def test_view_isnt_available_for_unauthenticated_user(self):
+        self.logout_user_by_token(self.owner)
+        response = self.client.post(self.list_url, self.data)
+        self.assert_response(response, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_creates_session_of_owner(self):
+        session = self.create_session()
+
+        self.assert_model_instance(session, dict(owner=self.owner, advert=self.advert, offset=0))
+
+    def test_view_doesnt_create_session_for_advert_of_other_user(self):
+        other = self.create_test_user('other@test.com')
+        self.login_user_by_token(other)
+
+        response = self.client.post(self.list_url, self.data)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_doesnt_create_session_for_second_main_image(self):
+        self.create_test_image(self.advert)
+
+        response = self.client.post(self.list_url, self.data)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=100)
+    def test_view_doesnt_create_session_for_oversized_file(self):
+        response = self.client.post(self.list_url, self.data)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_writes_ranges_and_tracks_offset(self):
+        session = self.create_session()
+        middle = len(self.content) // 2
+
+        response = self.put_range(session, 0, middle - 1)
+        self.assert_response(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['offset'], middle)
+
+        response = self.put_range(session, middle, len(self.content) - 1)
+        self.assertEqual(response.data['offset'], len(self.content))
+        self.assertEqual(get_upload_path(session).read_bytes(), self.content)
+
+    def test_view_returns_offset_to_resume_from(self):
+        session = self.create_session()
+        self.put_range(session, 0, 99)
+
+        response = self.client.get(reverse('uploads-detail', args=[session.pk]))
+
+        self.assertEqual(response.data['offset'], 100)
+
+    def test_view_rejects_range_that_doesnt_start_at_offset(self):
+        session = self.create_session()
+        self.put_range(session, 0, 99)
+
+        response = self.put_range(session, 200, 299)
+
+        self.assert_response(response, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['offset'], 100)
+
+    def test_view_rejects_range_that_doesnt_match_body(self):
+        session = self.create_session()
+
+        response = self.put_range(session, 0, 99, content=self.content[:50])
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_rejects_range_without_header(self):
+        session = self.create_session()
+
+        response = self.client.put(
+            reverse('uploads-detail', args=[session.pk]), self.content, content_type='application/octet-stream'
+        )
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_isnt_available_for_session_of_other_user(self):
+        session = self.create_session()
+        self.login_user_by_token(self.create_test_user('other@test.com'))
+
+        response = self.put_range(session, 0, 99)
+
+        self.assert_response(response, status.HTTP_404_NOT_FOUND)
+
+    def test_view_finalizes_upload_into_image(self):
+        session = self.create_session()
+        self.put_range(session, 0, len(self.content) - 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_201_CREATED)
+        image = Image.objects.get(pk=response.data['id'])
+        self.assert_model_instance(image, dict(advert=self.advert, type=Image.Type.MAIN))
+        self.assertEqual(image.file.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(get_upload_path(session).exists())
+
+        self.advert.refresh_from_db()
+        self.assertEqual(self.advert.main_image, image.file.name)
+
+    def test_view_rejects_token_of_deactivated_user(self):
+        session = self.create_session()
+        self.owner.is_active = False
+        self.owner.save()
+
+        self.assert_response(self.put_range(session, 0, len(self.content) - 1), status.HTTP_401_UNAUTHORIZED)
+        self.assert_response(self.finalize(session), status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Image.objects.exists())
+
+    def test_view_doesnt_finalize_incomplete_upload(self):
+        session = self.create_session()
+        self.put_range(session, 0, 99)
+
+        response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Image.objects.exists())
+
+    def test_view_doesnt_finalize_non_image_file(self):
+        session = self.create_session(size=100)
+        self.put_range(session, 0, 99, content=b'x' * 100)
+
+        response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Image.objects.exists())
+
+    def test_view_doesnt_finalize_image_with_too_many_pixels(self):
+        session = self.create_session()
+        self.put_range(session, 0, len(self.content) - 1)
+
+        with override_settings(IMAGE_UPLOAD_MAX_PIXELS=200 * 100 - 1):
+            response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['code'], 'too_many_pixels')
+        self.assertFalse(Image.objects.exists())
+
+    def test_view_doesnt_finalize_oversized_file(self):
+        session = self.create_session()
+        self.put_range(session, 0, len(self.content) - 1)
+
+        with override_settings(IMAGE_UPLOAD_MAX_SIZE=len(self.content) - 1):
+            response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['code'], 'file_too_large')
+        self.assertFalse(Image.objects.exists())
+
+    def test_view_doesnt_finalize_second_main_image(self):
+        session = self.create_session()
+        self.put_range(session, 0, len(self.content) - 1)
+        self.create_test_image(self.advert)
+
+        response = self.finalize(session)
+
+        self.assert_response(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Image.objects.count(), 1)
+
+    def test_view_deletes_session_with_received_bytes(self):
+        session = self.create_session()
+        self.put_range(session, 0, 99)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('uploads-detail', args=[session.pk]))
+
+        self.assert_response(response, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(get_upload_path(session).exists())
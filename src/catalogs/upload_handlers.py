@@ -0,0 +1,79 @@
+import io
+
+from PIL import Image as PILImage
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.template.defaultfilters import filesizeformat
+
+from catalogs.services.variant_rendering import get_oriented_size
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploaded files to temporary files and rejects parts that are not acceptable images.
+
+    Files are written in `chunk_size` chunks and never held in memory. The image header is checked with Pillow as
+    soon as enough bytes of it are received, so non-image and oversized parts fail the request before their content
+    is read.
+    """
+
+    chunk_size = 64 * 2**10
+    # Headers of most formats fit into the first chunk, JPEG files with large EXIF or ICC data may need more.
+    max_header_size = 512 * 2**10
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.size = 0
+        self.header = bytearray()
+        self.image_format = None
+        self.image_size = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject(f'File "{self.file_name}" is larger than {filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}.')
+
+        if self.image_format is None:
+            self.header += raw_data
+            self.check_header(complete=len(self.header) >= self.max_header_size)
+
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.image_format is None:
+            self.check_header(complete=True)
+        self.header = bytearray()
+
+        file = super().file_complete(file_size)
+        file.content_type = PILImage.MIME.get(self.image_format, file.content_type)
+        file.image_format = self.image_format
+        file.image_size = self.image_size
+        return file
+
+    def check_header(self, complete: bool):
+        """
+        Reads the image format and dimensions from the received header.
+
+        An incomplete header is checked again with the next chunk, unless `complete` says no more bytes will help.
+        """
+        try:
+            with PILImage.open(io.BytesIO(self.header)) as image:
+                self.image_format, self.image_size = image.format, get_oriented_size(image)
+        except Exception:
+            # Pillow raises different errors for truncated headers of different formats.
+            if complete:
+                self.reject(f'File "{self.file_name}" is not a valid image.')
+            return
+
+        width, height = self.image_size
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self.reject(
+                f'Image "{self.file_name}" has {width}x{height} pixels, '
+                f'more than {settings.IMAGE_UPLOAD_MAX_PIXELS} pixels are not allowed.'
+            )
+
+    def reject(self, message: str):
+        # The parser doesn't clean up after errors other than `StopUpload`, so the temporary file is removed here.
+        self.upload_interrupted()
+        raise MultiPartParserError(message)
@@ -6,6 +6,7 @@ router = DefaultRouter()
 router.register('category', views.CategoryViewSet)
 router.register('adverts', views.AdvertViewSet)
 router.register('images', views.ImageViewSet, 'images')
+router.register('uploads', views.UploadSessionViewSet, 'uploads')
 
 urlpatterns: list = []
 urlpatterns += router.urls
@@ -1,14 +1,39 @@
-from django.shortcuts import get_object_or_404
+import hashlib
+import re
+from collections.abc import Sequence
+from datetime import datetime
+from functools import partial
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, urlencode
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse, OpenApiExample, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
 
+from catalogs.filters import AdvertFilter
 from catalogs.models import Category
-from catalogs.models.models import Advert
+from catalogs.models.models import Advert, UploadSession
+from catalogs.pagination import AdvertPagination
 from catalogs.permissions import IsOwner
-from catalogs.serializers import CategoryListSerializer
+from catalogs.serializers import AdvertListValuesSerializer, CategoryListSerializer, CategoryValuesSerializer
+from catalogs.services.advert_cache import cache_advert, get_advert_version, get_cached_advert
+from catalogs.services.categories import (
+    CATEGORY_TREE_CACHE_TIMEOUT,
+    get_category_children_index,
+    get_category_tree_cache_key,
+    get_category_tree_version,
+)
 from catalogs.serializers.serializers import (
     CategorySerializer,
     AdvertListSerializer,
@@ -17,7 +42,12 @@ from catalogs.serializers.serializers import (
     AdvertUpdateSerializer,
     ImageMultipleCreateSerializer,
     ImageMultipleDeleteSerializer,
+    ImageSerializer,
+    UploadSessionSerializer,
 )
+from catalogs.services.uploads import finalize_upload, write_upload_range
+from catalogs.upload_handlers import ImageUploadHandler
+from utils.services.media import get_media_window_start
 
 
 @extend_schema(tags=['Catalog'])
@@ -27,7 +57,10 @@ from catalogs.serializers.serializers import (
         description='Create multiple images. Main image can be only single and extra images can be several for a '
         'advert.',
         responses={
-            status.HTTP_201_CREATED: OpenApiResponse(description='Created images successfully.'),
+            status.HTTP_201_CREATED: OpenApiResponse(
+                description='Created images successfully.',
+                response=ImageSerializer(many=True),
+            ),
         },
     ),
     multiple_delete=extend_schema(
@@ -44,6 +77,11 @@ class ImageViewSet(viewsets.GenericViewSet):
         multiple_delete=ImageMultipleDeleteSerializer,
     )
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Uploads are streamed to temporary files and checked on the fly instead of being buffered in memory.
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def get_serializer_class(self):
         return self.serializer_classes[self.action]
 
@@ -62,8 +100,11 @@ class ImageViewSet(viewsets.GenericViewSet):
         data = {key: data[key] if len(data.getlist(key)) == 1 else data.getlist(key) for key in data.keys()}
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(status=status.HTTP_201_CREATED)
+        images = serializer.save()
+        return Response(
+            ImageSerializer(images, many=True, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED,
+        )
 
     @action(['post'], detail=False)
     def multiple_delete(self, request):
@@ -75,6 +116,87 @@ class ImageViewSet(viewsets.GenericViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@extend_schema(tags=['Catalog'])
+@extend_schema_view(
+    create=extend_schema(
+        summary='Start a resumable image upload.',
+        description='Start a resumable upload of an advert image. The file is sent in byte ranges by PUT requests and '
+        'turned into an image by the finalize request.',
+    ),
+    retrieve=extend_schema(summary='Get a resumable upload by ID to find the offset to resume from.'),
+    update=extend_schema(
+        summary='Upload a byte range of the file.',
+        description='The raw body is written at the range start of the `Content-Range: bytes start-end/size` header. '
+        'The start should be equal to the session offset, otherwise the session is returned with 409 status.',
+        request={'application/octet-stream': bytes},
+        responses={
+            status.HTTP_200_OK: UploadSessionSerializer,
+            status.HTTP_409_CONFLICT: UploadSessionSerializer,
+        },
+    ),
+    finalize=extend_schema(
+        summary='Create an image from the completely uploaded file.',
+        request=None,
+        responses={status.HTTP_201_CREATED: ImageSerializer},
+    ),
+    destroy=extend_schema(summary='Cancel a resumable upload and delete the received bytes.'),
+)
+class UploadSessionViewSet(
+    viewsets.mixins.CreateModelMixin,
+    viewsets.mixins.RetrieveModelMixin,
+    viewsets.mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = UploadSessionSerializer
+    queryset = UploadSession.objects.all()
+    permission_classes = (IsOwner,)
+    content_range_pattern = re.compile(r'^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<size>\d+)$')
+
+    def get_queryset(self):
+        return super().get_queryset().filter(owner_id=self.request.user.id)
+
+    def update(self, request, *args, **kwargs):
+        session = self.get_object()
+        start, length = self.get_content_range(request, session)
+        if start != session.offset:
+            return Response(self.get_serializer(session).data, status=status.HTTP_409_CONFLICT)
+
+        if write_upload_range(session, start, request.stream, length) is None:
+            session.refresh_from_db()
+            return Response(self.get_serializer(session).data, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(session).data)
+
+    @action(['post'], detail=True)
+    def finalize(self, request, *args, **kwargs):
+        session = self.get_object()
+        if not session.is_complete:
+            raise ValidationError(
+                f'Only {session.offset} of {session.size} bytes are uploaded.',
+                'incomplete_upload',
+            )
+
+        try:
+            image = finalize_upload(session)
+        except DjangoValidationError as error:
+            raise ValidationError(as_serializer_error(error))
+        return Response(ImageSerializer(image, context=self.get_serializer_context()).data, status.HTTP_201_CREATED)
+
+    def get_content_range(self, request, session: UploadSession) -> tuple[int, int]:
+        """Returns the start and the length of the byte range sent in the request."""
+        match = self.content_range_pattern.match(request.headers.get('Content-Range', ''))
+        if match is None:
+            raise ValidationError('Content-Range header should be like "bytes 0-1023/4096".', 'invalid_range')
+
+        start, end, size = (int(value) for value in match.group('start', 'end', 'size'))
+        length = end - start + 1
+        if size != session.size or start > end or end >= size or length != int(request.META.get('CONTENT_LENGTH') or 0):
+            raise ValidationError(
+                'Content-Range header should match the session size and the request body.',
+                'invalid_range',
+            )
+        return start, length
+
+
 @extend_schema(tags=['Catalog'])
 @extend_schema_view(
     list=extend_schema(summary='Get an advert list.'),
@@ -85,7 +207,10 @@ class ImageViewSet(viewsets.GenericViewSet):
     destroy=extend_schema(summary='Delete an advert by ID with a related address.'),
 )
 class AdvertViewSet(viewsets.ModelViewSet):
-    queryset = Advert.objects.prefetch_related('address').order_by('-created_at')
+    queryset = Advert.objects.order_by('-created_at', '-id')
+    pagination_class = AdvertPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = AdvertFilter
     serializer_classes = dict(
         list=AdvertListSerializer,
         retrieve=AdvertRetrieveSerializer,
@@ -98,6 +223,87 @@ class AdvertViewSet(viewsets.ModelViewSet):
             return self.serializer_classes['update']
         return self.serializer_classes[self.action]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset
+        return queryset.prefetch_related('address')
+
+    def list(self, request, *args, **kwargs):
+        # Pages are fetched as rows of values and serialized without model instances, `AdvertListSerializer`
+        # describes the same representation in the schema.
+        queryset = AdvertListValuesSerializer.get_values(
+            self.filter_queryset(self.get_queryset()), 'created_at', 'updated_at'
+        )
+        page = self.paginate_queryset(queryset)
+        etag = self.get_page_etag(page)
+        if (response := get_conditional_response(request, etag=etag)) is not None:
+            response['ETag'] = etag
+            return response
+
+        response = self.get_paginated_response(AdvertListValuesSerializer.to_representation_many(page))
+        response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # Filtered requests bypass the cache, as the filters may hide the advert.
+        pk = self.kwargs['pk']
+        cacheable = pk.isdigit() and not request.query_params
+        version = get_advert_version(int(pk)) if cacheable else ''
+        if cacheable and (entry := get_cached_advert(int(pk), version)) is not None:
+            updated_at, data = entry
+        else:
+            # Validators are checked after a single primary key lookup of the advert, before its address and images
+            # are loaded.
+            advert = get_object_or_404(self.filter_queryset(Advert.objects.all()), pk=pk)
+            updated_at, data = advert.updated_at, None
+
+        etag, last_modified = self.get_advert_validators(updated_at)
+        if (response := get_conditional_response(request, etag=etag, last_modified=last_modified)) is not None:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            return response
+
+        if data is None:
+            build = partial(self.get_advert_entry, advert)
+            updated_at, data = cache_advert(advert.pk, version, build) if cacheable else build()
+            # The entry may be cached by another worker from a different state of the advert.
+            etag, last_modified = self.get_advert_validators(updated_at)
+
+        response = Response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_advert_entry(self, advert: Advert) -> tuple[datetime, dict]:
+        prefetch_related_objects([advert], 'address')
+        return advert.updated_at, dict(self.get_serializer(advert).data)
+
+    @staticmethod
+    def get_advert_validators(updated_at) -> tuple[str, int]:
+        """
+        Returns the ETag and the Last-Modified timestamp of the advert representation.
+
+        The representation has signed media URLs that change with the media URL window, so it is modified when the
+        advert is updated, including its images, or when a new window starts.
+        """
+        window_start = get_media_window_start()
+        etag = quote_etag(f'{updated_at.timestamp():.6f}-{window_start}')
+        return etag, max(int(updated_at.timestamp()), window_start)
+
+    def get_page_etag(self, page: Sequence[dict]) -> str:
+        """
+        Returns a weak ETag of the advert list page.
+
+        The page is validated by the latest `updated_at` of its adverts together with their IDs, that change when
+        adverts are added to or removed from the page window, and the total count shown with the page.
+        """
+        latest = max((row['updated_at'].timestamp() for row in page), default=0)
+        ids = ','.join(str(row['id']) for row in page)
+        count = getattr(self.paginator, 'count', None)
+        digest = hashlib.md5(f'{latest:.6f}:{get_media_window_start()}:{count}:{ids}'.encode()).hexdigest()
+        return f'W/{quote_etag(digest)}'
+
     def get_permissions(self):
         match self.action:
             case 'create':
@@ -168,6 +374,55 @@ class CategoryViewSet(viewsets.mixins.ListModelMixin, viewsets.GenericViewSet):
         else:
             return super().get_queryset()
 
+    def list(self, request, *args, **kwargs):
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return self.get_list_response(request, *args, **kwargs)
+
+        # The rendered bytes are cached under the category tree version, which changes on every category change.
+        version = get_category_tree_version()
+        etag = quote_etag(version)
+        if (response := get_conditional_response(request, etag=etag)) is not None:
+            response['ETag'] = etag
+            return response
+
+        cache_key = get_category_tree_cache_key(
+            version, self.action, request.accepted_media_type, self.get_cache_query(request)
+        )
+        if (content := cache.get(cache_key)) is None:
+            response = self.get_list_response(request, *args, **kwargs)
+            content = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            cache.set(cache_key, content, CATEGORY_TREE_CACHE_TIMEOUT)
+
+        return HttpResponse(content, content_type=request.accepted_media_type, headers={'ETag': etag})
+
+    def get_cache_query(self, request) -> str:
+        """Returns the query params the response depends on, so other params don't create new cache entries."""
+        if self.paginator is None:
+            return ''
+        names = {param['name'] for param in self.paginator.get_schema_operation_parameters(self)}
+        return urlencode(sorted((name, value) for name, value in request.query_params.items() if name in names))
+
+    def get_list_response(self, request, *args, **kwargs):
+        if self.action == 'select_list':
+            queryset = CategoryValuesSerializer.get_values(self.filter_queryset(self.get_queryset()))
+            page = self.paginate_queryset(queryset)
+            data = CategoryValuesSerializer.to_representation_many(queryset if page is None else page)
+            return Response(data) if page is None else self.get_paginated_response(data)
+
+        children_index = get_category_children_index()
+        roots = children_index.get(None, [])
+        page = self.paginate_queryset(roots)
+        serializer = self.get_serializer(
+            roots if page is None else page,
+            many=True,
+            context={**self.get_serializer_context(), 'category_children': children_index},
+        )
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
     @action(methods=['get'], detail=False)
     def select_list(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -11,6 +11,7 @@ _settings = (
     'components/cors_headers.py',
     'components/rest_framework.py',
     'components/drf_spectacular.py',
+    'components/caches.py',
     'components/simple_jwt.py',
     'components/drf_standardized_errors.py',
     'components/baton.py',  # not touch
@@ -86,6 +86,29 @@ STATIC_ROOT = BASE_DIR / 'static'
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Media files are served by signed URLs that expire after this number of seconds, and are stable for as long.
+MEDIA_URL_MAX_AGE = int(env.get('MEDIA_URL_MAX_AGE', 5 * 60))
+# Internal nginx location of the media root, like "/protected-media/". Signed media requests are redirected there
+# with X-Accel-Redirect. When it is empty, media files are served by Django.
+MEDIA_ACCEL_REDIRECT_PREFIX = env.get('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+# Number of processes rendering resized copies of uploaded images. With 0 they are rendered in the calling process.
+IMAGE_VARIANT_WORKERS = int(env.get('IMAGE_VARIANT_WORKERS', 2))
+# Limits of every uploaded image, checked while the upload is streamed.
+IMAGE_UPLOAD_MAX_SIZE = int(env.get('IMAGE_UPLOAD_MAX_SIZE', 10 * 2**20))
+IMAGE_UPLOAD_MAX_PIXELS = int(env.get('IMAGE_UPLOAD_MAX_PIXELS', 40_000_000))
+
+# Directory of partially received files of resumable uploads. It must be shared by all API instances.
+UPLOAD_SESSION_ROOT = env.get('UPLOAD_SESSION_ROOT', BASE_DIR / 'uploads')
+# Seconds after the last received byte range when an unfinished upload is considered abandoned.
+UPLOAD_SESSION_MAX_AGE = int(env.get('UPLOAD_SESSION_MAX_AGE', 24 * 60 * 60))
+
+# Seconds an idle `runworker` waits before polling for jobs again.
+JOB_POLL_INTERVAL = float(env.get('JOB_POLL_INTERVAL', 1))
+# Seconds after which a running job is considered abandoned by a crashed worker and is run again.
+JOB_LEASE_TIMEOUT = int(env.get('JOB_LEASE_TIMEOUT', 600))
+# Seconds finished jobs are kept before `prune_jobs` deletes them.
+JOB_RETENTION = int(env.get('JOB_RETENTION', 7 * 24 * 60 * 60))
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
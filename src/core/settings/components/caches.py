@@ -0,0 +1,16 @@
+"""
+Cache settings
+Docs: https://docs.djangoproject.com/en/5.0/topics/cache/
+"""
+
+from core.settings.components import env
+
+# The cache must be shared by all gunicorn workers and by the job worker, which invalidates cached adverts and
+# categories. The default backend keeps entries on the file system, so every container that runs them has to mount the
+# same volume at the location, or a shared backend such as Redis or Memcached has to be configured.
+CACHES = {
+    'default': {
+        'BACKEND': env.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': env.get('DJANGO_CACHE_LOCATION', '/var/tmp/food_marketplace_cache'),
+    }
+}
@@ -30,3 +30,9 @@ else:
             'NAME': str(BASE_DIR / '../db.sqlite3'),
         }
     }
+    CACHES = {
+        'default': {
+            'BACKEND': env.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': env.get('DJANGO_CACHE_LOCATION', ''),
+        }
+    }
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from core.settings.components import env
 from core.settings.components.base import INSTALLED_APPS, SECRET_KEY
 
 INSTALLED_APPS += [
@@ -12,7 +13,8 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    # Logins update `last_login` by `accounts.services.last_login`, that coalesces the writes.
+    'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'VERIFYING_KEY': '',
@@ -33,10 +35,16 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
-    'TOKEN_OBTAIN_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenObtainPairSerializer',
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.UserTokenObtainPairSerializer',
     'TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSerializer',
     'TOKEN_VERIFY_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenVerifySerializer',
     'TOKEN_BLACKLIST_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenBlacklistSerializer',
     'SLIDING_TOKEN_OBTAIN_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer',
     'SLIDING_TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSlidingSerializer',
 }
+
+# Seconds `last_login` is truncated to, repeated logins of a user within that time write nothing.
+LAST_LOGIN_PRECISION = int(env.get('LAST_LOGIN_PRECISION', 60))
+# Login times are buffered per process and written in bulk after that many seconds or users.
+LAST_LOGIN_FLUSH_INTERVAL = int(env.get('LAST_LOGIN_FLUSH_INTERVAL', 10))
+LAST_LOGIN_FLUSH_SIZE = int(env.get('LAST_LOGIN_FLUSH_SIZE', 100))
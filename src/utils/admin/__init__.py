@@ -0,0 +1,3 @@
+from .admin import JobAdmin
+
+__all__ = ['JobAdmin']
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from utils.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('type', 'status', 'attempts', 'run_at', 'locked_by', 'updated_at')
+    readonly_fields = ('attempts', 'locked_at', 'locked_by', 'last_error', 'updated_at', 'created_at')
+    list_filter = ('status', 'type')
+    ordering = ('-run_at',)
+    actions = ('retry_jobs',)
+
+    @admin.action(description='Retry selected jobs')
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.PENDING, run_at=timezone.now(), attempts=0, last_error=''
+        )
+        self.message_user(request, f'{updated} jobs are scheduled to run again.')
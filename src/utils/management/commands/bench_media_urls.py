@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+
+from utils.services.media import check_media_signature, sign_media_url
+from utils.views import serve_media
+
+NAME = 'images/0f/3a/0f3a5e6c1d2b4a8f9e7c6b5a4d3c2b1a0f9e8d7c6b5a4f3e2d1c0b9a8f7e6d5c.jpg'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks signing and checking of media URLs and the media view with X-Accel-Redirect. '
+        'Fails if the view returns any file bytes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100_000, help='Number of timed calls of every step.')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        url = sign_media_url(NAME)
+        query = dict(pair.split('=') for pair in url.split('?')[1].split('&'))
+
+        self.report('sign', iterations, lambda: sign_media_url(NAME))
+        self.report('check', iterations, lambda: check_media_signature(NAME, query['expires'], query['signature']))
+
+        request = RequestFactory().get(url)
+        with override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = serve_media(request, NAME)
+            if response.status_code != 200 or response.content or 'X-Accel-Redirect' not in response:
+                raise CommandError('The media view returned file bytes instead of an X-Accel-Redirect header.')
+            self.report('view', iterations // 10, lambda: serve_media(request, NAME))
+
+    def report(self, step: str, iterations: int, call):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - started) * 1_000_000)
+
+        timings.sort()
+        self.stdout.write(
+            f'{step}: {iterations} calls, p50 {statistics.median(timings):.1f} us, '
+            f'p95 {timings[int(len(timings) * 0.95) - 1]:.1f} us'
+        )
@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes jobs that finished successfully longer than the retention ago, in bounded batches. '
+        'Failed jobs are kept for inspection.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=settings.JOB_RETENTION,
+            help='Seconds a finished job is kept.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1_000,
+            help='Number of jobs deleted per query.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to wait between batches to leave room for other writes.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        finished_before = timezone.now() - timedelta(seconds=options['max_age'])
+        done = Job.objects.filter(status=Job.Status.DONE, updated_at__lt=finished_before).order_by('pk')
+
+        count = 0
+        while pks := list(done.values_list('pk', flat=True)[: options['batch_size']]):
+            count += Job.objects.filter(pk__in=pks).delete()[0]
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} jobs in {time.perf_counter() - started:.1f} s.'))
@@ -0,0 +1,46 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from utils.services.jobs import claim_job, get_worker_name, run_job
+
+
+class Command(BaseCommand):
+    help = 'Runs background jobs from the database queue until stopped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', nargs='+', help='Run only jobs of these types.')
+        parser.add_argument('--burst', action='store_true', help='Exit once there are no ready jobs.')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help='Seconds to wait before polling again when there are no ready jobs.',
+        )
+        parser.add_argument('--worker-id', default=get_worker_name(), help='Name of the worker stored on claimed jobs.')
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        run, failed = 0, 0
+        while not self.stopping:
+            close_old_connections()
+            if (job_ := claim_job(options['worker_id'], options['types'])) is None:
+                if options['burst']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            run += 1
+            failed += not run_job(job_)
+
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {run} jobs, {failed} failed.'))
+
+    def stop(self, signum, frame):
+        # The running job is finished before the worker exits.
+        self.stopping = True
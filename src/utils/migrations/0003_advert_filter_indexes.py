@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('utils', '0002_remove_address_region_remove_address_village'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['content_type', 'object_id'], name='address_content_obj_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(
+                django.db.models.functions.text.Upper('city'),
+                models.F('content_type'),
+                models.F('object_id'),
+                name='address_city_content_obj_idx',
+            ),
+        ),
+    ]
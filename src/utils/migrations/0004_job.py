@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('utils', '0003_advert_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='last update')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='creation')),
+                ('type', models.CharField(max_length=100, verbose_name='type')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='payload')),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'pending'),
+                            ('running', 'running'),
+                            ('done', 'done'),
+                            ('failed', 'failed'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                        verbose_name='status',
+                    ),
+                ),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run at')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='locked at')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100, verbose_name='locked by')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'job',
+                'verbose_name_plural': 'jobs',
+                'indexes': [
+                    models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+                    models.Index(fields=['type', 'status'], name='job_type_status_idx'),
+                ],
+            },
+        ),
+    ]
@@ -1,3 +1,3 @@
-from .models import Address
+from .models import Address, Job
 
-__all__ = ['Address']
+__all__ = ['Address', 'Job']
@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from utils.models.mixins import CreatedUpdatedMixin
@@ -29,3 +31,66 @@ class Address(CreatedUpdatedMixin):
     class Meta:
         verbose_name = _('address')
         verbose_name_plural = _('addresses')
+        indexes = [
+            models.Index(fields=['content_type', 'object_id'], name='address_content_obj_idx'),
+            models.Index(Upper('city'), 'content_type', 'object_id', name='address_city_content_obj_idx'),
+        ]
+
+
+class Job(CreatedUpdatedMixin):
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('pending')
+        RUNNING = 'running', _('running')
+        DONE = 'done', _('done')
+        FAILED = 'failed', _('failed')
+
+    type = models.CharField(
+        verbose_name=_('type'),
+        max_length=100,
+    )
+    payload = models.JSONField(
+        verbose_name=_('payload'),
+        default=dict,
+        blank=True,
+    )
+    status = models.CharField(
+        verbose_name=_('status'),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    run_at = models.DateTimeField(
+        verbose_name=_('run at'),
+        default=timezone.now,
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name=_('attempts'),
+        default=0,
+    )
+    locked_at = models.DateTimeField(
+        verbose_name=_('locked at'),
+        null=True,
+        blank=True,
+    )
+    locked_by = models.CharField(
+        verbose_name=_('locked by'),
+        max_length=100,
+        blank=True,
+        default='',
+    )
+    last_error = models.TextField(
+        verbose_name=_('last error'),
+        blank=True,
+        default='',
+    )
+
+    class Meta:
+        verbose_name = _('job')
+        verbose_name_plural = _('jobs')
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            models.Index(fields=['type', 'status'], name='job_type_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.type} #{self.pk} ({self.status})'
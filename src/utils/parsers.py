@@ -0,0 +1,39 @@
+import codecs
+import re
+from io import BytesIO
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from utils.renderers import ORJSONRenderer
+
+# orjson decodes integers beyond 64 bits as floats and loses their digits, any run of 20 digits might be one of them.
+BIG_INTEGER_PATTERN = re.compile(rb'\d{20}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSON parser that decodes by orjson.
+
+    orjson reads UTF-8 only and always rejects NaN and Infinity, so other encodings and non-strict settings are parsed
+    by `JSONParser`. So is content that might hold integers beyond 64 bits, which orjson would decode as floats.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        if BIG_INTEGER_PATTERN.search(content):
+            return super().parse(BytesIO(content), media_type, parser_context)
+
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
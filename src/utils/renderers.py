@@ -0,0 +1,46 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes by orjson and renders the same bytes as `JSONRenderer`.
+
+    Types orjson does not encode like DRF, such as decimals, datetimes and lazy translation strings, are passed to the
+    DRF encoder. Indented output, non-compact or ASCII-only settings and data orjson cannot encode at all, like too big
+    integers, are rendered by `JSONRenderer`. So is all data when `STRICT_JSON` is off, as `JSONRenderer` renders NaN
+    and infinity as `NaN` and `Infinity` then.
+
+    With the default `STRICT_JSON`, NaN and infinity are rendered as `null` on purpose. `JSONRenderer` raises
+    `ValueError` for them, which fails the response with 500, and searching every response for them would cost more
+    than orjson saves.
+
+    Floats are written in the shortest form that reads back as the same value, but not always in the same notation as
+    `JSONRenderer`: `1e16` and `0.00001` instead of `1e+16` and `1e-05`. Any JSON reader decodes both to the same
+    float, and telling floats apart in the data would cost as much as searching for NaN.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # U+2028 and U+2029 are escaped like by `JSONRenderer`, so the output is a strict JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
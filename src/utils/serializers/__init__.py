@@ -1,3 +1,11 @@
-from .serializers import AddressFieldSerializer
+from .serializers import AddressFieldSerializer, address_column
+from .values import Column, ValuesSerializer, convert_datetime, decimal_converter
 
-__all__ = ['AddressFieldSerializer']
+__all__ = [
+    'AddressFieldSerializer',
+    'address_column',
+    'Column',
+    'ValuesSerializer',
+    'convert_datetime',
+    'decimal_converter',
+]
@@ -2,6 +2,7 @@ from django.db.models import Manager
 from rest_framework import serializers
 
 from utils import models
+from utils.serializers.values import Column
 
 
 class AddressFieldSerializer(serializers.ModelSerializer):
@@ -21,3 +22,13 @@ class AddressFieldSerializer(serializers.ModelSerializer):
             if (instance := instance.first()) is None:
                 return {}
         return super().to_representation(instance)
+
+
+def address_column(source: str = 'address') -> Column:
+    """Returns the `ValuesSerializer` column of the address relation, like `AddressFieldSerializer`."""
+    fields = AddressFieldSerializer.Meta.fields
+
+    def convert(pk, *values):
+        return {} if pk is None else dict(zip(fields, values))
+
+    return Column((f'{source}__id', *(f'{source}__{field}' for field in fields)), convert)
@@ -0,0 +1,201 @@
+import logging
+import os
+import socket
+import traceback
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+
+from utils.models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = timedelta(hours=1)
+CLAIM_CANDIDATES = 10
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    handler: Callable[..., None]
+    max_attempts: int
+    retry_delay: timedelta
+    concurrency: int | None
+
+    def get_retry_delay(self, attempts: int) -> timedelta:
+        """Returns the delay before the next attempt, doubled after every failed attempt."""
+        return min(self.retry_delay * 2 ** min(attempts - 1, 32), MAX_RETRY_DELAY)
+
+
+_registry: dict[str, JobType] = {}
+
+
+def job(name: str, *, max_attempts=5, retry_delay=timedelta(seconds=10), concurrency: int | None = None):
+    """
+    Registers the decorated function as the handler of jobs of the type.
+
+    The handler is called with the job payload as keyword arguments. A raised exception schedules a retry with an
+    exponential backoff until `max_attempts` attempts are made. `concurrency` limits the number of jobs of the type
+    that run at the same time across all workers.
+    """
+
+    def decorator(handler):
+        if name in _registry:
+            raise ImproperlyConfigured(f'Job type "{name}" is already registered.')
+        _registry[name] = JobType(name, handler, max_attempts, retry_delay, concurrency)
+        return handler
+
+    return decorator
+
+
+def get_job_type(name: str) -> JobType:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'Job type "{name}" is not registered.')
+
+
+def enqueue(name: str, *, run_at: datetime | None = None, **payload) -> Job:
+    """
+    Stores a job to be run by a worker.
+
+    The job is created in the current transaction, so it runs only after the data it needs is committed and never
+    runs if the transaction is rolled back. The payload must be JSON serializable.
+    """
+    get_job_type(name)
+    return Job.objects.create(type=name, payload=payload, run_at=run_at or timezone.now())
+
+
+def get_worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def get_lease_expiration(now: datetime) -> datetime:
+    """Returns the time before which running jobs are considered abandoned by crashed workers."""
+    return now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT)
+
+
+def get_saturated_types(now: datetime) -> list[str]:
+    """Returns job types that run as many jobs as their concurrency limit allows."""
+    limits = {name: job_type.concurrency for name, job_type in _registry.items() if job_type.concurrency}
+    if not limits:
+        return []
+
+    running = (
+        Job.objects.filter(type__in=limits, status=Job.Status.RUNNING, locked_at__gte=get_lease_expiration(now))
+        .values('type')
+        .annotate(count=Count('pk'))
+        .values_list('type', 'count')
+    )
+    return [name for name, count in running if count >= limits[name]]
+
+
+def get_ready_jobs(now: datetime, types: Iterable[str] | None = None) -> QuerySet[Job]:
+    queryset = Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_at__lt=get_lease_expiration(now))
+    )
+    if types is not None:
+        queryset = queryset.filter(type__in=list(types))
+    if saturated := get_saturated_types(now):
+        queryset = queryset.exclude(type__in=saturated)
+    return queryset.order_by('run_at', 'pk')
+
+
+def claim_job(worker: str, types: Iterable[str] | None = None) -> Job | None:
+    """
+    Locks the next ready job for the worker and returns it, or None if there is no ready job.
+
+    Databases that support `SELECT ... FOR UPDATE SKIP LOCKED` hand out jobs without waiting for each other. Other
+    databases, like SQLite, claim a job by a conditional UPDATE that only one worker can win.
+    """
+    now = timezone.now()
+    queryset = get_ready_jobs(now, types)
+    claim = dict(status=Job.Status.RUNNING, locked_at=now, locked_by=worker, attempts=F('attempts') + 1)
+
+    if connections[queryset.db].features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pk = queryset.select_for_update(skip_locked=True).values_list('pk', flat=True).first()
+            if pk is None:
+                return None
+            Job.objects.filter(pk=pk).update(**claim)
+    else:
+        for pk, status, locked_at in queryset.values_list('pk', 'status', 'locked_at')[:CLAIM_CANDIDATES]:
+            if Job.objects.filter(pk=pk, status=status, locked_at=locked_at).update(**claim):
+                break
+        else:
+            return None
+
+    job_ = Job.objects.get(pk=pk)
+    if not has_free_slot(job_):
+        release_job(job_)
+        return None
+    return job_
+
+
+def has_free_slot(job_: Job) -> bool:
+    """
+    Checks the concurrency limit of the job type again after the job is claimed.
+
+    Workers may claim jobs of the same type at the same time, so only the first claims within the limit are kept.
+    """
+    if not (limit := get_job_type(job_.type).concurrency):
+        return True
+
+    running = Job.objects.filter(
+        type=job_.type, status=Job.Status.RUNNING, locked_at__gte=get_lease_expiration(timezone.now())
+    ).order_by('locked_at', 'pk')
+    return job_.pk in running.values_list('pk', flat=True)[:limit]
+
+
+def release_job(job_: Job) -> None:
+    Job.objects.filter(pk=job_.pk, locked_by=job_.locked_by).update(
+        status=Job.Status.PENDING, locked_at=None, locked_by='', attempts=F('attempts') - 1
+    )
+
+
+def run_job(job_: Job) -> bool:
+    """Runs the claimed job, then marks it done or schedules a retry. Returns whether the job succeeded."""
+    claimed = Job.objects.filter(pk=job_.pk, locked_by=job_.locked_by, locked_at=job_.locked_at)
+
+    try:
+        job_type = get_job_type(job_.type)
+    except LookupError:
+        logger.exception('Job %s has an unknown type.', job_)
+        claimed.update(status=Job.Status.FAILED, locked_at=None, locked_by='', last_error=traceback.format_exc())
+        return False
+
+    try:
+        job_type.handler(**job_.payload)
+    except Exception:
+        logger.exception('Job %s failed on attempt %s.', job_, job_.attempts)
+        retry = job_.attempts < job_type.max_attempts
+        claimed.update(
+            status=Job.Status.PENDING if retry else Job.Status.FAILED,
+            run_at=timezone.now() + job_type.get_retry_delay(job_.attempts) if retry else F('run_at'),
+            locked_at=None,
+            locked_by='',
+            last_error=traceback.format_exc(),
+            updated_at=timezone.now(),
+        )
+        return False
+
+    # Bulk updates do not set `updated_at`, it is set explicitly as the finish time used to prune old jobs.
+    claimed.update(status=Job.Status.DONE, locked_at=None, locked_by='', updated_at=timezone.now())
+    return True
+
+
+def run_ready_jobs(types: Iterable[str] | None = None, worker: str | None = None) -> int:
+    """Runs jobs until none is ready and returns the number of run jobs."""
+    worker = worker or get_worker_name()
+    count = 0
+    while (job_ := claim_job(worker, types)) is not None:
+        run_job(job_)
+        count += 1
+    return count
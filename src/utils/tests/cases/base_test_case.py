@@ -1,6 +1,7 @@
 from tokenize import TokenError
 from typing import Any, Type, Literal
 
+from django.core.cache import cache
 from django.db.models import Model
 from rest_framework.fields import empty
 from rest_framework.response import Response
@@ -8,21 +9,33 @@ from rest_framework.serializers import Serializer, ModelSerializer
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.settings import api_settings as jwt_api_settings
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 from accounts.models import User
+from accounts.services.last_login import last_login_recorder
+from accounts.services.user_cache import local_user_cache
 from catalogs.models import Category
 from catalogs.models.models import Advert
 from orders.models import Order
 from utils.models import Address
+from utils.services.jobs import run_ready_jobs
 
 
 class BaseTestCase(APITestCase):
+    def _pre_setup(self):
+        super()._pre_setup()
+        cache.clear()
+        local_user_cache.clear()
+        # Login times are buffered by the process, so they are not written to the database of another test.
+        last_login_recorder.clear()
+        self.addCleanup(last_login_recorder.clear)
+
     ####################################################################################################################
     # Utils                                                                                                            #
     ####################################################################################################################
     def login_user_by_token(self, user):
-        token = user.access_token
+        # Only an access token is signed, no refresh token is stored as an outstanding token.
+        token = AccessToken.for_user(user)
         credentials = {jwt_api_settings.AUTH_HEADER_NAME: f'{jwt_api_settings.AUTH_HEADER_TYPES[0]} {token}'}
         self.client.credentials(**credentials)
 
@@ -37,6 +50,10 @@ class BaseTestCase(APITestCase):
 
         self.client.credentials()
 
+    @staticmethod
+    def run_jobs(*types: str) -> int:
+        return run_ready_jobs(types or None)
+
     ####################################################################################################################
     # Creators                                                                                                         #
     ####################################################################################################################
@@ -170,7 +187,9 @@ class BaseTestCase(APITestCase):
         )
 
         if expected_data is not empty:
-            response_data = response.data['results'] if is_paginated else response.data
+            # Responses served from a cache carry only the rendered content.
+            data = response.data if hasattr(response, 'data') else response.json()
+            response_data = data['results'] if is_paginated else data
             self.assertEqual(response_data, expected_data)
 
     def assert_http_methods_availability(
@@ -194,7 +213,6 @@ class BaseTestCase(APITestCase):
 
 
 class OrderTestCase(BaseTestCase):
-
     def setUp(self):
         self.user = self.create_test_user()
         self.address = self.create_test_address(content_obj=self.user)
@@ -204,7 +222,7 @@ class OrderTestCase(BaseTestCase):
             'payment_method': 'visa',
             'shipping_method': 'standard',
             'status': 'pending',
-            'is_paid': False
+            'is_paid': False,
         }
 
     def test_order_creation(self):
@@ -212,15 +230,17 @@ class OrderTestCase(BaseTestCase):
         order = Order.objects.create(**self.order_data)
 
         # Check if the order was created successfully
-        self.assert_model_instance(order, {
-            'customer': self.user.id,
-            'shipping_address': '123 Test St, Test City',
-            'payment_method': 'visa',
-            'shipping_method': 'standard',
-            'status': 'pending',
-            'is_paid': False,
-        })
-
+        self.assert_model_instance(
+            order,
+            {
+                'customer': self.user.id,
+                'shipping_address': '123 Test St, Test City',
+                'payment_method': 'visa',
+                'shipping_method': 'standard',
+                'status': 'pending',
+                'is_paid': False,
+            },
+        )
 
     def test_order_status_update(self):
         # Create an order
@@ -1,6 +1,7 @@
 import io
 
 from PIL import Image as PILImage
+from PIL.PngImagePlugin import PngInfo
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
@@ -23,7 +24,10 @@ class MediaTestCase(BaseTestCase):
     def get_image_simple_uploaded_file(image_name: str) -> SimpleUploadedFile:
         image = PILImage.new('RGB', (100, 100), color=(255, 255, 255))
         image_io = io.BytesIO()
-        image.save(image_io, format='PNG')
+        # Images are stored by content, so files of different names get different content like different photos.
+        info = PngInfo()
+        info.add_text('name', image_name)
+        image.save(image_io, format='PNG', pnginfo=info)
         image_io.seek(0)
         return SimpleUploadedFile(image_name, image_io.read(), 'image/png')
 
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import serializers
+
+from utils.serializers import Column, ValuesSerializer, address_column, convert_datetime, decimal_converter
+from utils.tests.cases import BaseTestCase
+
+User = get_user_model()
+
+
+class UserValuesSerializer(ValuesSerializer):
+    columns = dict(
+        email=Column('email'),
+        name=Column(('email', 'full_name'), lambda email, full_name: full_name or email),
+        address=address_column(),
+    )
+
+
+class ValuesSerializerTest(BaseTestCase):
+    def test_values_fields_are_unique_sources_of_columns(self):
+        self.assertEqual(
+            UserValuesSerializer.values_fields,
+            ('email', 'full_name', 'address__id', 'address__city', 'address__street', 'address__number'),
+        )
+
+    def test_serializer_returns_expected_data(self):
+        user = self.create_test_user()
+        address = self.create_test_address(user)
+        row = UserValuesSerializer.get_values(User.objects.filter(pk=user.pk)).get()
+
+        self.assertEqual(
+            UserValuesSerializer.to_representation(row),
+            dict(
+                email=user.email,
+                name=user.email,
+                address=dict(city=address.city, street=address.street, number=address.number),
+            ),
+        )
+
+    def test_serializer_returns_empty_address_without_address(self):
+        user = self.create_test_user(full_name='Full Name')
+        rows = UserValuesSerializer.get_values(User.objects.filter(pk=user.pk))
+
+        self.assertEqual(
+            UserValuesSerializer.to_representation_many(rows),
+            [dict(email=user.email, name='Full Name', address={})],
+        )
+
+    def test_get_values_adds_extra_fields(self):
+        user = self.create_test_user()
+        row = UserValuesSerializer.get_values(User.objects.filter(pk=user.pk), 'id', 'email').get()
+
+        self.assertEqual(row['id'], user.pk)
+        self.assertEqual(list(row).count('email'), 1)
+
+
+class ConverterTest(BaseTestCase):
+    def test_decimal_converter_matches_drf_decimal_field(self):
+        field = serializers.DecimalField(max_digits=12, decimal_places=2)
+        convert = decimal_converter(2)
+        for value in (Decimal('0'), Decimal('1.5'), Decimal('100.00'), Decimal('1234567890.12')):
+            self.assertEqual(convert(value), field.to_representation(value))
+        self.assertIsNone(convert(None))
+
+    @override_settings(USE_TZ=True, TIME_ZONE='UTC')
+    def test_convert_datetime_matches_drf_datetime_field_in_utc(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=dt_timezone.utc)
+        self.assertEqual(convert_datetime(value), serializers.DateTimeField().to_representation(value))
+        self.assertEqual(convert_datetime(value), '2024-01-02T03:04:05.000678Z')
+        self.assertIsNone(convert_datetime(None))
+
+    @override_settings(USE_TZ=True, TIME_ZONE='Europe/Kyiv')
+    def test_convert_datetime_matches_drf_datetime_field_in_local_time_zone(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        self.assertEqual(convert_datetime(value), serializers.DateTimeField().to_representation(value))
+        self.assertEqual(convert_datetime(value), '2024-01-02T05:04:05+02:00')
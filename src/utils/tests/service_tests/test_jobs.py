@@ -0,0 +1,168 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from utils.models import Job
+from utils.services import jobs
+from utils.services.jobs import claim_job, enqueue, run_job, run_ready_jobs
+from utils.tests.cases import BaseTestCase
+
+calls = []
+
+
+def record(**payload):
+    calls.append(payload)
+
+
+def fail(**payload):
+    raise ValueError('failed')
+
+
+class JobQueueTest(BaseTestCase):
+    def setUp(self):
+        calls.clear()
+        registry = {
+            'tests.record': jobs.JobType('tests.record', record, 5, timedelta(seconds=10), None),
+            'tests.fail': jobs.JobType('tests.fail', fail, 2, timedelta(seconds=10), None),
+            'tests.limited': jobs.JobType('tests.limited', record, 5, timedelta(seconds=10), 1),
+        }
+        patcher = mock.patch.dict(jobs._registry, registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_enqueue_creates_pending_job(self):
+        job_ = enqueue('tests.record', value=1)
+
+        self.assert_model_instance(job_, dict(type='tests.record', payload=dict(value=1), status=Job.Status.PENDING))
+
+    def test_enqueue_raises_error_for_unknown_type(self):
+        self.assertRaises(LookupError, enqueue, 'tests.unknown')
+
+    def test_claim_job_locks_job_for_worker(self):
+        enqueue('tests.record')
+
+        job_ = claim_job('worker')
+
+        self.assert_model_instance(job_, dict(status=Job.Status.RUNNING, locked_by='worker', attempts=1))
+        self.assertIsNone(claim_job('other worker'))
+
+    def test_claim_job_skips_jobs_scheduled_in_future(self):
+        enqueue('tests.record', run_at=timezone.now() + timedelta(minutes=1))
+
+        self.assertIsNone(claim_job('worker'))
+
+    def test_claim_job_filters_by_types(self):
+        enqueue('tests.record')
+
+        self.assertIsNone(claim_job('worker', ['tests.fail']))
+        self.assertIsNotNone(claim_job('worker', ['tests.record']))
+
+    def test_run_job_calls_handler_with_payload(self):
+        enqueue('tests.record', value=1)
+
+        self.assertTrue(run_job(claim_job('worker')))
+
+        self.assertEqual(calls, [dict(value=1)])
+        self.assertTrue(Job.objects.filter(status=Job.Status.DONE, locked_by='').exists())
+
+    def test_run_job_schedules_retry_with_backoff(self):
+        job_ = enqueue('tests.fail')
+
+        self.assertFalse(run_job(claim_job('worker')))
+
+        job_.refresh_from_db()
+        self.assertEqual(job_.status, Job.Status.PENDING)
+        self.assertGreater(job_.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertIn('ValueError', job_.last_error)
+
+    def test_retry_delay_is_doubled_after_every_attempt(self):
+        job_type = jobs.get_job_type('tests.fail')
+
+        self.assertEqual(
+            [job_type.get_retry_delay(attempts) for attempts in (1, 2, 3)],
+            [timedelta(seconds=10), timedelta(seconds=20), timedelta(seconds=40)],
+        )
+        self.assertEqual(job_type.get_retry_delay(100), jobs.MAX_RETRY_DELAY)
+
+    def test_run_job_marks_job_failed_after_max_attempts(self):
+        job_ = enqueue('tests.fail')
+
+        for _ in range(2):
+            Job.objects.filter(pk=job_.pk).update(run_at=timezone.now())
+            run_job(claim_job('worker'))
+
+        job_.refresh_from_db()
+        self.assertEqual(job_.status, Job.Status.FAILED)
+        self.assertEqual(job_.attempts, 2)
+        self.assertIsNone(claim_job('worker'))
+
+    def test_concurrency_limit_holds_back_jobs_of_type(self):
+        enqueue('tests.limited')
+        enqueue('tests.limited')
+        enqueue('tests.record')
+
+        self.assertEqual(claim_job('worker').type, 'tests.limited')
+        self.assertEqual(claim_job('other worker').type, 'tests.record')
+        self.assertIsNone(claim_job('third worker'))
+
+    @override_settings(JOB_LEASE_TIMEOUT=60)
+    def test_job_of_crashed_worker_is_claimed_again(self):
+        job_ = enqueue('tests.record')
+        claim_job('crashed worker')
+        Job.objects.filter(pk=job_.pk).update(locked_at=timezone.now() - timedelta(minutes=2))
+
+        job_ = claim_job('worker')
+
+        self.assert_model_instance(job_, dict(locked_by='worker', attempts=2))
+
+    def test_stale_worker_doesnt_overwrite_reclaimed_job(self):
+        enqueue('tests.record')
+        stale = claim_job('crashed worker')
+        Job.objects.filter(pk=stale.pk).update(locked_at=timezone.now() - timedelta(hours=1), locked_by='worker')
+
+        run_job(stale)
+
+        self.assertTrue(Job.objects.filter(pk=stale.pk, status=Job.Status.RUNNING).exists())
+
+    def test_run_ready_jobs_runs_all_ready_jobs(self):
+        enqueue('tests.record', value=1)
+        enqueue('tests.record', value=2)
+
+        self.assertEqual(run_ready_jobs(), 2)
+        self.assertEqual(calls, [dict(value=1), dict(value=2)])
+
+    def test_runworker_command_runs_jobs_in_burst_mode(self):
+        enqueue('tests.record', value=1)
+        enqueue('tests.fail')
+        stdout = StringIO()
+
+        # Closing connections would break the transaction of the test case, like the test client avoids it too.
+        with mock.patch('utils.management.commands.runworker.close_old_connections'):
+            call_command('runworker', burst=True, stdout=stdout)
+
+        self.assertEqual(calls, [dict(value=1)])
+        self.assertIn('Worker stopped after 2 jobs, 1 failed.', stdout.getvalue())
+
+    def test_prune_jobs_command_deletes_old_done_jobs(self):
+        for value in range(3):
+            enqueue('tests.record', value=value)
+        Job.objects.create(type='tests.fail', status=Job.Status.FAILED)
+        run_ready_jobs()
+        Job.objects.update(updated_at=timezone.now() - timedelta(days=8))
+        recent = enqueue('tests.record', value=3)
+        run_ready_jobs()
+        stdout = StringIO()
+
+        with override_settings(JOB_RETENTION=7 * 24 * 60 * 60):
+            call_command('prune_jobs', batch_size=2, stdout=stdout)
+
+        self.assertEqual(
+            set(Job.objects.values_list('type', 'status')),
+            {('tests.record', Job.Status.DONE), ('tests.fail', Job.Status.FAILED)},
+        )
+        self.assertTrue(Job.objects.filter(pk=recent.pk).exists())
+        self.assertIn('Deleted 3 jobs', stdout.getvalue())
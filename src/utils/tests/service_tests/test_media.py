@@ -0,0 +1,83 @@
+import time
+from io import StringIO
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from utils.services.media import (
+    check_media_signature,
+    get_media_expiration,
+    is_safe_media_name,
+    sign_media_url,
+)
+from utils.tests.cases import BaseTestCase
+
+NAME = 'images/ab/cd/abcd.png'
+
+
+def get_query(url: str) -> dict[str, str]:
+    return {key: value for key, (value,) in parse_qs(urlsplit(url).query).items()}
+
+
+@override_settings(MEDIA_URL_MAX_AGE=300)
+class MediaSignatureTest(BaseTestCase):
+    def setUp(self):
+        self.signed_with_default_key = sign_media_url(NAME, now=1000)
+
+    def test_signed_url_points_to_media_file(self):
+        url = sign_media_url(NAME, now=1000)
+
+        self.assertEqual(urlsplit(url).path, f'/media/{NAME}')
+        self.assertEqual(get_query(url)['expires'], '1500')
+
+    def test_signed_url_is_stable_within_max_age(self):
+        self.assertEqual(sign_media_url(NAME, now=900), sign_media_url(NAME, now=1199))
+        self.assertNotEqual(sign_media_url(NAME, now=1199), sign_media_url(NAME, now=1200))
+
+    def test_signed_url_is_valid_for_at_least_max_age(self):
+        for now in (900, 1000, 1199):
+            with self.subTest(now=now):
+                self.assertGreaterEqual(get_media_expiration(now) - now, 300)
+
+    def test_signature_is_checked(self):
+        query = get_query(sign_media_url(NAME, now=1000))
+
+        self.assertTrue(check_media_signature(NAME, query['expires'], query['signature'], now=1000))
+        self.assertFalse(check_media_signature('images/other.png', query['expires'], query['signature'], now=1000))
+        self.assertFalse(check_media_signature(NAME, '1800', query['signature'], now=1000))
+        self.assertFalse(check_media_signature(NAME, query['expires'], query['signature'][:-1], now=1000))
+        self.assertFalse(check_media_signature(NAME, None, None, now=1000))
+        self.assertFalse(check_media_signature(NAME, '-1', query['signature'], now=1000))
+
+    def test_expired_signature_is_rejected(self):
+        query = get_query(sign_media_url(NAME, now=1000))
+
+        self.assertFalse(check_media_signature(NAME, query['expires'], query['signature'], now=1501))
+
+    @override_settings(SECRET_KEY='other secret')
+    def test_signature_depends_on_secret_key(self):
+        self.assertNotEqual(sign_media_url(NAME, now=1000), self.signed_with_default_key)
+
+    def test_unsafe_names_are_rejected(self):
+        for name in ('', '/etc/passwd', '../secret', 'images/../../secret', 'images//a.png', 'images/./a.png'):
+            with self.subTest(name=name):
+                self.assertFalse(is_safe_media_name(name))
+        self.assertTrue(is_safe_media_name(NAME))
+
+    def test_signature_check_takes_microseconds(self):
+        query = get_query(sign_media_url(NAME))
+        count = 10_000
+
+        started = time.perf_counter()
+        for _ in range(count):
+            check_media_signature(NAME, query['expires'], query['signature'])
+        # The bound is loose for slow test machines, a check takes a few microseconds.
+        self.assertLess((time.perf_counter() - started) / count, 100e-6)
+
+    def test_bench_command_reports_timings(self):
+        stdout = StringIO()
+        call_command('bench_media_urls', iterations=100, stdout=stdout)
+
+        self.assertIn('check: 100 calls', stdout.getvalue())
+        self.assertIn('view: 10 calls', stdout.getvalue())
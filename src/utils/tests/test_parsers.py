@@ -0,0 +1,34 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from utils.parsers import ORJSONParser
+
+
+class ORJSONParserTest(SimpleTestCase):
+    parser = ORJSONParser()
+
+    def test_parser_returns_same_data_as_json_parser(self):
+        content = '{"name": "Яблука", "price": "12.50", "ids": [1, 2.5, null, true]}'.encode()
+        self.assertEqual(self.parser.parse(BytesIO(content)), JSONParser().parse(BytesIO(content)))
+
+    def test_parser_raises_parse_error_on_invalid_json(self):
+        for content in (b'{"name":', b'{"price": NaN}', b''):
+            with self.subTest(content=content), self.assertRaisesMessage(ParseError, 'JSON parse error - '):
+                self.parser.parse(BytesIO(content))
+
+    def test_parser_parses_other_encodings_by_json_parser(self):
+        content = '{"name": "Яблука"}'.encode('utf-16')
+        self.assertEqual(
+            self.parser.parse(BytesIO(content), parser_context=dict(encoding='utf-16')),
+            dict(name='Яблука'),
+        )
+
+    def test_parser_parses_big_integers_by_json_parser(self):
+        content = b'{"id": 123456789012345678901234567890, "ids": [18446744073709551616, -9223372036854775808]}'
+        self.assertEqual(
+            self.parser.parse(BytesIO(content)),
+            dict(id=123456789012345678901234567890, ids=[18446744073709551616, -9223372036854775808]),
+        )
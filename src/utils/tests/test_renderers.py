@@ -0,0 +1,74 @@
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from utils.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    renderer = ORJSONRenderer()
+
+    def assert_renders_like_json_renderer(self, data, accepted_media_type=None, renderer_context=None):
+        rendered = self.renderer.render(data, accepted_media_type, renderer_context)
+        self.assertEqual(rendered, JSONRenderer().render(data, accepted_media_type, renderer_context))
+        return rendered
+
+    def test_renderer_renders_same_bytes_as_json_renderer(self):
+        self.assert_renders_like_json_renderer(
+            ReturnDict(
+                price=Decimal('12.50'),
+                order=uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                created_at=datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+                local_created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+                day=date(2024, 1, 2),
+                time=time(3, 4, 5),
+                duration=timedelta(minutes=1),
+                label=gettext_lazy('price'),
+                name='Яблука',
+                ids=(1, 2),
+                counts={1: 2},
+                empty=None,
+                serializer=None,
+            ),
+        )
+
+    def test_renderer_escapes_line_and_paragraph_separators(self):
+        rendered = self.assert_renders_like_json_renderer(['\u2028', '\u2029'])
+        self.assertEqual(rendered, b'["\\u2028","\\u2029"]')
+
+    def test_renderer_renders_indented_output_by_json_renderer(self):
+        self.assert_renders_like_json_renderer(dict(a=[1]), 'application/json; indent=4')
+        self.assert_renders_like_json_renderer(dict(a=[1]), renderer_context=dict(indent=2))
+
+    def test_renderer_renders_data_orjson_cannot_encode_by_json_renderer(self):
+        self.assert_renders_like_json_renderer(dict(big=2**70))
+
+    def test_renderer_renders_floats_that_read_back_as_same_values(self):
+        data = [0.1, 1.5, 1e16, 1e-05, 1e-07, 1.5e300, -2.5e-300, 123456789.123]
+
+        rendered = self.renderer.render(data)
+
+        self.assertEqual(rendered, b'[0.1,1.5,1e16,0.00001,1e-7,1.5e300,-2.5e-300,123456789.123]')
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_renderer_renders_none_as_empty_bytes(self):
+        self.assertEqual(self.renderer.render(None), b'')
+
+    def test_renderer_renders_non_finite_floats_as_null_in_strict_mode(self):
+        self.assertRaises(ValueError, JSONRenderer().render, [float('nan')])
+        self.assertEqual(self.renderer.render([float('nan'), float('inf'), -float('inf')]), b'[null,null,null]')
+
+    def test_renderer_renders_non_finite_floats_by_json_renderer_in_non_strict_mode(self):
+        renderer, json_renderer = ORJSONRenderer(), JSONRenderer()
+        renderer.strict = json_renderer.strict = False
+
+        rendered = renderer.render([float('nan'), float('inf')])
+
+        self.assertEqual(rendered, json_renderer.render([float('nan'), float('inf')]))
+        self.assertEqual(rendered, b'[NaN,Infinity]')
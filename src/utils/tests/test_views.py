@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from rest_framework import status
+
+from utils.services.media import sign_media_url
+from utils.tests.cases import MediaTestCase
+
+
+class ServeMediaViewTest(MediaTestCase):
+    def setUp(self):
+        self.name = default_storage.save('images/file.txt', ContentFile(b'content'))
+        self.url = sign_media_url(self.name)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_view_redirects_to_nginx_without_reading_file(self):
+        with mock.patch('utils.views.serve') as serve, mock.patch('builtins.open') as open_:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertNotIn('Content-Type', response)
+        self.assertEqual(response.content, b'')
+        serve.assert_not_called()
+        open_.assert_not_called()
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_view_redirects_to_quoted_path(self):
+        name = default_storage.save('images/file name.txt', ContentFile(b'content'))
+
+        response = self.client.get(sign_media_url(name))
+
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/images/file%20name.txt')
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/', MEDIA_URL_MAX_AGE=300)
+    def test_view_allows_private_caching_until_expiration(self):
+        response = self.client.get(sign_media_url(self.name))
+
+        self.assertIn('private', response['Cache-Control'])
+        max_age = int(response['Cache-Control'].split('max-age=')[1].split(',')[0])
+        self.assertTrue(300 <= max_age <= 600)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='')
+    def test_view_serves_file_without_nginx(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'content')
+
+    def test_view_rejects_unsigned_url(self):
+        response = self.client.get(f'/media/{self.name}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_rejects_signature_of_other_file(self):
+        other = sign_media_url('images/other.txt')
+
+        response = self.client.get(f'/media/{self.name}?{other.split("?")[1]}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_rejects_unsafe_path(self):
+        url = sign_media_url('images/../../settings.py')
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_rejects_post(self):
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
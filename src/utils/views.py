@@ -0,0 +1,35 @@
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from django.views.static import serve
+
+from utils.services.media import check_media_signature, is_safe_media_name
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves a media file by a URL signed with `sign_media_url()`.
+
+    Only the signature is checked here. With `MEDIA_ACCEL_REDIRECT_PREFIX` set, the file is sent by nginx from its
+    internal location named in the `X-Accel-Redirect` header, so no file bytes pass through Python. Without it, like
+    in development, the file is served by Django.
+    """
+    expires = request.GET.get('expires')
+    if not is_safe_media_name(path) or not check_media_signature(path, expires, request.GET.get('signature')):
+        raise Http404('Media file not found.')
+
+    if prefix := settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = f'{prefix}{quote(path)}'
+        # nginx takes the content type of the file from its extension.
+        del response['Content-Type']
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    patch_cache_control(response, private=True, max_age=max(int(expires) - int(time.time()), 0))
+    return response